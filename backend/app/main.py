@@ -1,12 +1,24 @@
+from app.utils.logging_config import setup_logging, shutdown_logging
+
+# Route logging through the background queue before other modules log anything
+setup_logging()
+
 from fastapi import FastAPI, Depends
 from fastapi.staticfiles import StaticFiles
 from app.routes import user, image_description
-from app.routes import conversation_routes, audio_routes, message_routes, tts_routes
+from app.routes import conversation_routes, audio_routes, message_routes, tts_routes, metrics_routes, mistake_routes
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.models import SecurityScheme
 from fastapi.security import OAuth2PasswordBearer
 from typing import Dict
 from app.utils.event_handler import event_handler
+from app.utils.feedback_batcher import feedback_batcher
+from app.utils.tts_cache import tts_cache
+from app.utils.tts_client_service import close_tts_client, start_tts_client
+from app.config.database import close_async_client
+from app.utils.db_indexes import DB_ENSURE_INDEXES_ON_STARTUP, ensure_indexes
+from app.utils.identity_map import IdentityMapMiddleware
+from app.utils.json_response import MongoJSONResponse
 from app.utils.audio_processor import loaded_model
 import logging
 from pathlib import Path
@@ -29,6 +41,7 @@ app = FastAPI(
     * **admin**: Full access including user management
     """,
     version="1.0.0",
+    default_response_class=MongoJSONResponse,
     openapi_tags=[
         {
             "name": "users",
@@ -61,6 +74,10 @@ app = FastAPI(
         {
             "name": "mistakes",
             "description": "Operations for tracking and drilling language mistakes."
+        },
+        {
+            "name": "metrics",
+            "description": "Operational metrics such as LLM latency, token usage and cost. Admin only."
         }
     ]
 )
@@ -84,6 +101,9 @@ app.add_middleware(
     expose_headers=["*"],  # Expose all headers to the client
 )
 
+# Give every request its own identity map, so a document is read at most once per request
+app.add_middleware(IdentityMapMiddleware)
+
 # Include routers
 app.include_router(
     user.router,
@@ -120,6 +140,13 @@ app.include_router(
     responses={401: {"description": "Unauthorized"}}
 )
 
+app.include_router(
+    mistake_routes.router,
+    prefix="/api",
+    tags=["mistakes"],
+    responses={401: {"description": "Unauthorized"}}
+)
+
 app.include_router(
     image_description.router,
     prefix="/api",
@@ -127,6 +154,13 @@ app.include_router(
     responses={401: {"description": "Unauthorized"}}
 )
 
+app.include_router(
+    metrics_routes.router,
+    prefix="/api",
+    tags=["metrics"],
+    responses={401: {"description": "Unauthorized"}, 403: {"description": "Forbidden"}}
+)
+
 # Mount the uploads directory for serving images
 uploads_path = Path(__file__).parent / "uploads"
 app.mount("/uploads", StaticFiles(directory=str(uploads_path)), name="uploads")
@@ -149,19 +183,30 @@ async def root():
 async def startup_event():
     """
     Function that runs on application startup.
-    Starts the background task processor.
+    Creates missing database indexes and indexes the TTS cache, then starts
+    the background task processor, the feedback batcher and the shared TTS client.
     """
+    if DB_ENSURE_INDEXES_ON_STARTUP:
+        await ensure_indexes()
+    await tts_cache.load()
     # Start the event handler
     event_handler.start()
+    feedback_batcher.start()
+    await start_tts_client()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """
     Function that runs on application shutdown.
-    Stops the background task processor.
+    Stops the background task processor, flushes pending feedback, closes
+    the database connection pool and drains queued log records.
     """
     # Stop the event handler
     event_handler.stop()
+    await feedback_batcher.stop()
+    await close_tts_client()
+    await close_async_client()
+    shutdown_logging()
 
 
 
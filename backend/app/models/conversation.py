@@ -14,6 +14,10 @@ class Conversation:
         self.started_at = datetime.utcnow()
         self.ended_at = None  # Set when the conversation is ended
         self.voice_type = voice_type
+        # Denormalized for the conversation list, kept current as messages are added
+        self.message_count = 0
+        self.last_message_preview = None
+        self.last_activity_at = self.started_at
     def to_dict(self):
         return {
             "_id": self._id,
@@ -23,7 +27,10 @@ class Conversation:
             "situation": self.situation,
             "started_at": self.started_at,
             "ended_at": self.ended_at,
-            "voice_type": self.voice_type
+            "voice_type": self.voice_type,
+            "message_count": self.message_count,
+            "last_message_preview": self.last_message_preview,
+            "last_activity_at": self.last_activity_at
         }
     
     def get_context(self):
@@ -12,6 +12,8 @@ class Feedback:
         target_id: ID of the entity receiving feedback (message, audio, etc.)
         target_type: Type of entity receiving feedback ("message", "audio", etc.)
         user_feedback: User-friendly feedback in a free-form text
+        grammar_issues: Structured grammar issues used for mistake extraction
+        vocabulary_issues: Structured vocabulary issues used for mistake extraction
         timestamp: Timestamp of when the feedback was created
         user_id: ID of the user providing feedback
         transcription: Transcription of the speech being analyzed
@@ -22,7 +24,9 @@ class Feedback:
         target_type: str,  # "message", "audio", etc.
         user_feedback: str,
         user_id: Optional[ObjectId] = None,
-        transcription: Optional[str] = None
+        transcription: Optional[str] = None,
+        grammar_issues: Optional[List[Dict[str, Any]]] = None,
+        vocabulary_issues: Optional[List[Dict[str, Any]]] = None
     ):
         self._id = ObjectId()
         self.target_id = target_id
@@ -30,6 +34,8 @@ class Feedback:
         self.user_feedback = user_feedback
         self.user_id = user_id
         self.transcription = transcription
+        self.grammar_issues = grammar_issues or []
+        self.vocabulary_issues = vocabulary_issues or []
         self.timestamp = datetime.utcnow()
 
     def to_dict(self) -> Dict[str, Any]:
@@ -41,6 +47,8 @@ class Feedback:
             "user_feedback": self.user_feedback,
             "user_id": self.user_id,
             "transcription": self.transcription,
+            "grammar_issues": self.grammar_issues,
+            "vocabulary_issues": self.vocabulary_issues,
             "timestamp": self.timestamp
         }
  
\ No newline at end of file
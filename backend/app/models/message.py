@@ -3,7 +3,8 @@ from bson import ObjectId
 
 class Message:
     def __init__(self, conversation_id: ObjectId, sender: str, content: str, 
-                 audio_path: str = None, transcription: str = None, feedback_id: str = None):
+                 audio_path: str = None, transcription: str = None, feedback_id: str = None,
+                 speech_path: str = None):
         self._id = ObjectId()
         self.conversation_id = conversation_id
         self.sender = sender  # "user" or "ai"
@@ -11,6 +12,7 @@ class Message:
         self.audio_path = audio_path
         self.transcription = transcription
         self.feedback_id = feedback_id
+        self.speech_path = speech_path  # Pre-rendered TTS audio for AI messages
         self.timestamp = datetime.utcnow()
 
     def to_dict(self):
@@ -22,5 +24,6 @@ class Message:
             "audio_path": self.audio_path,
             "transcription": self.transcription,
             "feedback_id": self.feedback_id,
+            "speech_path": self.speech_path,
             "timestamp": self.timestamp
         }
\ No newline at end of file
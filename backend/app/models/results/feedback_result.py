@@ -8,14 +8,22 @@ class FeedbackResult:
     
     Attributes:
         user_feedback: User-friendly text feedback
+        grammar_issues: Machine-readable grammar issues
+            (issue, correction, explanation, severity)
+        vocabulary_issues: Machine-readable vocabulary issues
+            (original, better_alternative, reason, example_usage)
         timestamp: Timestamp when feedback was generated
     """
     def __init__(
         self,
         user_feedback: str,
+        grammar_issues: Optional[List[Dict[str, Any]]] = None,
+        vocabulary_issues: Optional[List[Dict[str, Any]]] = None,
         timestamp: Optional[datetime] = None
     ):
         self.user_feedback = user_feedback
+        self.grammar_issues = grammar_issues or []
+        self.vocabulary_issues = vocabulary_issues or []
         self.timestamp = timestamp or datetime.utcnow()
    
     
@@ -23,5 +31,7 @@ class FeedbackResult:
         """Convert to dictionary for storage"""
         return {
             "user_feedback": self.user_feedback,
+            "grammar_issues": self.grammar_issues,
+            "vocabulary_issues": self.vocabulary_issues,
             "timestamp": self.timestamp
-        } 
\ No newline at end of file
+        } 
@@ -76,7 +76,7 @@ async def turn_to_text(
         transcription, temp_file_path = audio_service.transcribe_audio(audio_file)
         
         # Step 2: Process audio for feedback and check success
-        processing_result = audio_service.process_audio_for_feedback(
+        processing_result = await audio_service.process_audio_for_feedback(
             transcription=transcription,
             user_id=user_id,
             conversation_id="",  # Not linked to conversation yet
@@ -90,7 +90,7 @@ async def turn_to_text(
                 audio_file.file.seek(0)
                 
                 # Save the audio file permanently
-                audio_id = audio_service.save_audio_file(audio_file, user_id)
+                audio_id = await audio_service.save_audio_file(audio_file, user_id, transcription)
                 
                 # Update the processing result with audio_id
                 processing_result["audio_id"] = audio_id
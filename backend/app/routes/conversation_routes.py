@@ -1,16 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse
 from bson import ObjectId
 from typing import List, Optional
+import asyncio
 import logging
 from datetime import datetime
 
 from app.config.database import db
-from app.schemas.conversation import ConversationCreate, ConversationResponse
+from app.schemas.conversation import ConversationCreate, ConversationCreateResponse, ConversationPage
 from app.models.conversation import Conversation
 from app.utils.auth import get_current_user
 from app.services.ai_service import AIService
 from app.services.conversation_service import ConversationService
+from app.services.scenario_service import ScenarioService
+from app.utils.json_response import model_response
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 import json
 
 # Set up logger
@@ -23,7 +27,7 @@ router = APIRouter()
 # CONVERSATION ENDPOINTS
 # =======================
 
-@router.post("/conversations", response_model=dict)
+@router.post("/conversations", response_model=ConversationCreateResponse)
 async def create_conversation(convo_data: ConversationCreate, current_user: dict = Depends(get_current_user)):
     """
     Create a new conversation and generate an initial AI response.
@@ -33,7 +37,7 @@ async def create_conversation(convo_data: ConversationCreate, current_user: dict
         current_user (dict): The authenticated user's information.
         
     Returns:
-        dict: A dictionary containing the conversation and initial message.
+        ConversationCreateResponse: The conversation and its initial message.
             
     Raises:
         HTTPException: If there are any errors during conversation creation.
@@ -41,6 +45,7 @@ async def create_conversation(convo_data: ConversationCreate, current_user: dict
     # Initialize services
     ai_service = AIService()
     conversation_service = ConversationService()
+    scenario_service = ScenarioService()
     
     # Get user ID from the current_user dictionary
     user_id = current_user.get("_id")
@@ -50,24 +55,58 @@ async def create_conversation(convo_data: ConversationCreate, current_user: dict
     # Validate conversation data
     conversation_service.validate_conversation_data(convo_data)
     
-    # Use AI service to refine conversation context
-    refined_context = ai_service.refine_conversation_context(
+    # Serve a precomputed scenario when the request matches the library,
+    # otherwise refine the conversation context with the AI service
+    refined_context = await scenario_service.find_scenario(
         user_role=convo_data.user_role,
         ai_role=convo_data.ai_role,
-        situation=convo_data.situation
+        situation=convo_data.situation,
+        level=convo_data.level
     )
+    if refined_context is None:
+        # Blocking Gemini call (with retries); keep it off the event loop
+        refined_context = await asyncio.to_thread(
+            ai_service.refine_conversation_context,
+            user_role=convo_data.user_role,
+            ai_role=convo_data.ai_role,
+            situation=convo_data.situation,
+            user_id=str(user_id)
+        )
     
     # Use conversation service to create conversation
-    result = conversation_service.create_conversation(
+    result = await conversation_service.create_conversation(
         user_id=user_id,
         refined_context=refined_context
     )
     
-    return result
+    return model_response(ConversationCreateResponse, result)
 
 
-# GET /conversations - List user conversations (to be implemented)
-# This endpoint will retrieve all conversations for the authenticated user
+@router.get("/conversations", response_model=ConversationPage)
+async def list_conversations(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    List the authenticated user's conversations, most recent first.
+    
+    Args:
+        limit (int): Page size.
+        cursor (Optional[str]): Continue after the previous page.
+        current_user (dict): The authenticated user's information.
+        
+    Returns:
+        ConversationPage: The conversations and the cursor of the next page
+            (null on the last page).
+    """
+    conversation_service = ConversationService()
+    page = await conversation_service.get_user_conversations(
+        user_id=str(current_user["_id"]),
+        limit=limit,
+        cursor=cursor
+    )
+    return model_response(ConversationPage, page)
 
 # GET /conversations/{conversation_id} - Get conversation details (to be implemented)  
 # This endpoint will retrieve a specific conversation with its metadata
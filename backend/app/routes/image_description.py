@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse
 from typing import List, Dict, Optional
+import asyncio
 import os
 import random
 from pathlib import Path
@@ -8,6 +9,7 @@ import json
 
 from app.utils.image_description import get_image_description
 from app.utils.gemini import generate_response
+from app.utils.llm_metrics import PROMPT_IMAGE_FEEDBACK
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -57,9 +59,13 @@ def save_feedback_data(feedback_data: List[Dict]):
 
 
 @router.get("/images/practice", response_model=List[dict])
-async def get_practice_images():
+async def get_practice_images(user_id: Optional[str] = None):
     """
     Returns a list of practice images with IDs and URLs
+
+    Args:
+        user_id: Optional ID of the requesting user; descriptions generated for
+            this request are attributed to them in LLM usage rollups
     """
     try:
         # Load existing image data
@@ -86,12 +92,12 @@ async def get_practice_images():
                 # if not saved_image.get("detail_description") or saved_image["detail_description"] == "Could not generate image description.":
                 if not saved_image.get("detail_description"):
                     # Generate a new description using the image path
-                    saved_image["detail_description"] = get_image_description(img_path)
+                    saved_image["detail_description"] = await asyncio.to_thread(get_image_description, img_path, user_id=user_id)
                     data_updated = True
                 updated_images.append(saved_image)
             else:
                 # Generate new entry for this image
-                detail_description = get_image_description(img_path)
+                detail_description = await asyncio.to_thread(get_image_description, img_path, user_id=user_id)
                 
                 new_image_data = {
                     "id": str(random.randint(1000, 9999)),
@@ -177,7 +183,12 @@ This JSON object must have the following exact structure:
 """
           # Get the improved description from Gemini
         try:
-            gemini_response = generate_response(prompt)
+            gemini_response = await asyncio.to_thread(
+                generate_response,
+                prompt,
+                prompt_type=PROMPT_IMAGE_FEEDBACK,
+                user_id=feedback_request.user_id
+            )
             cleaned_response = gemini_response.strip("```json\n").strip("\n```").strip("```")
             data = json.loads(cleaned_response)
             # Extract the better version and explanation from Gemini's response
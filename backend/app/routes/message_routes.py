@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
 from fastapi.responses import JSONResponse
 from bson import ObjectId
 from typing import List, Optional
@@ -6,13 +6,18 @@ import logging
 import asyncio
 from datetime import datetime
 
-from app.config.database import db
-from app.schemas.message import MessageCreate, MessageResponse
+from app.config.database import async_db
+from app.schemas.message import MessageCreate, MessagePage, MessageTurnResponse
 from app.models.message import Message
 from app.utils.auth import get_current_user
 from app.services.conversation_service import ConversationService
 from app.services.feedback_service import FeedbackService
 from app.services.ai_service import AIService
+from app.services.tts_service import TTSService
+from app.utils.conversation_archive import get_feedback, get_message, restore_conversation
+from app.utils.json_response import model_response
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.unit_of_work import UnitOfWork
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -21,6 +26,7 @@ logger = logging.getLogger(__name__)
 conversation_service = ConversationService()
 feedback_service = FeedbackService()
 ai_service = AIService()
+tts_service = TTSService()
 
 # Create router instance
 router = APIRouter()
@@ -29,7 +35,7 @@ router = APIRouter()
 # MESSAGE ENDPOINTS
 # ====================
 
-@router.post("/conversations/{conversation_id}/message", response_model=dict)
+@router.post("/conversations/{conversation_id}/message", response_model=MessageTurnResponse)
 async def add_message_and_get_response (
     conversation_id: str,  
     audio_id: str ,  
@@ -50,16 +56,20 @@ async def add_message_and_get_response (
                 
                 # Step 1: Fetch the audio and conversation data using services
                 async def get_audio():
-                    return db.audio.find_one({"_id": ObjectId(audio_id)})
+                    return await async_db.audio.find_one({"_id": ObjectId(audio_id)})
                     
                 # Get conversation context using conversation service
-                conversation_context = conversation_service.get_conversation_context(conversation_id)
+                conversation_context = await conversation_service.get_conversation_context(conversation_id)
                 conversation = conversation_context["conversation"]
                 
                 # Verify user owns the conversation
                 if str(conversation["user_id"]) != user_id:
                     raise HTTPException(status_code=403, detail="Access denied to this conversation")
                 
+                # A conversation continues in the hot collections
+                if conversation.get("archived"):
+                    await restore_conversation(conversation["_id"])
+                
                 # Get audio data
                 audio_data = await get_audio()
                 if not audio_data:
@@ -75,18 +85,6 @@ async def add_message_and_get_response (
                     transcription=audio_data["transcription"]
                 )
                 
-                db.messages.insert_one(user_message.to_dict())
-                # Schedule feedback processing in background using service
-                background_tasks.add_task(
-                    feedback_service.generate_speech_feedback,
-                    transcription=audio_data["transcription"],
-                    user_id=user_id,
-                    conversation_id=conversation_id,
-                    audio_id=str(audio_data["_id"]),
-                    file_path=audio_data["file_path"],
-                    user_message_id=str(user_message._id)
-                )
-                
                 # Get conversation history from the context
                 messages = conversation_context["messages"]
                 
@@ -107,30 +105,43 @@ async def add_message_and_get_response (
                 f"\nNow respond as {conversation['ai_role']}."
                 )
 
-                # Generate AI response using AI service
-                ai_text = ai_service.generate_ai_response(prompt)
+                # Generate AI response using AI service; the call blocks (with retries),
+                # so it runs in a worker thread instead of on the event loop
+                ai_text = await asyncio.to_thread(ai_service.generate_ai_response, prompt, user_id=user_id)
                 
-                # Store AI response
+                # Store the turn: both messages and the summary update are written
+                # together, so a failed AI call leaves no unanswered user message
                 ai_message =  Message(conversation_id=ObjectId(conversation_id), sender="ai", content=ai_text)
-                db.messages.insert_one(ai_message.to_dict())
+                uow = UnitOfWork()
+                conversation_service.record_messages(uow, user_message, ai_message)
+                await uow.commit()
                 
-                # Return AI response in MessageResponse format
-                ai_message_dict = ai_message.to_dict()
-                ai_message_dict["id"] = str(ai_message_dict["_id"])
-                ai_message_dict["conversation_id"] = str(ai_message_dict["conversation_id"])
-                del ai_message_dict["_id"]
-                
-                user_message_dict = user_message.to_dict()
-                user_message_dict["id"] = str(user_message_dict["_id"])
-                user_message_dict["conversation_id"] = str(user_message_dict["conversation_id"])
-                del user_message_dict["_id"]
+                # Schedule feedback processing in background using service
+                background_tasks.add_task(
+                    feedback_service.generate_speech_feedback,
+                    transcription=audio_data["transcription"],
+                    user_id=user_id,
+                    conversation_id=conversation_id,
+                    audio_id=str(audio_data["_id"]),
+                    file_path=audio_data["file_path"],
+                    user_message_id=str(user_message._id)
+                )
+
+                # Synthesize the reply's audio while the client renders the text, in the
+                # format its speech requests negotiated (unknown until the first one);
+                # audio in any other format would be a second synthesis, not a head start
+                speech_format = conversation.get("speech_format")
+                if speech_format:
+                    tts_service.presynthesize(ai_text, conversation.get("voice_type"), response_format=speech_format)
                 
-                return {
-                    "user_message": MessageResponse(**user_message_dict),
-                    "ai_message": MessageResponse(**ai_message_dict)
-                }
+                return model_response(MessageTurnResponse, {
+                    "user_message": user_message.to_dict(),
+                    "ai_message": ai_message.to_dict()
+                })
             
        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error /conversations/{conversation_id}/speechtomessage: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -153,7 +164,7 @@ async def get_message_feedback(
     try:
         user_id = str(current_user["_id"])
         # Find the message
-        message = db.messages.find_one({"_id": ObjectId(message_id)})
+        message = await get_message(ObjectId(message_id))
         if not message:
             logger.warning(f"Message not found: {message_id}")
             raise HTTPException(status_code=404, detail="Message not found")
@@ -170,9 +181,9 @@ async def get_message_feedback(
         
         # Get the feedback document
         try:
-            feedback = db.feedback.find_one({"_id": ObjectId(feedback_id)})
+            feedback = await get_feedback(ObjectId(feedback_id))
             # Log the structure of the feedback document to understand its contents
-            logger.info(f"Feedback document structure: {type(feedback).__name__}, keys: {list(feedback.keys()) if feedback else 'None'}")
+            logger.debug(f"Feedback document structure: {type(feedback).__name__}, keys: {list(feedback.keys()) if feedback else 'None'}")
         except Exception as e:
             logger.error(f"Error retrieving feedback document: {str(e)}", exc_info=True)
             return {"user_feedback": "Error retrieving feedback. Please try again later.", "is_ready": False}
@@ -192,7 +203,7 @@ async def get_message_feedback(
             }
             
             # Add detailed feedback if available
-            logger.info(f"Feedback document: {feedback_dict}")
+            logger.debug("Feedback document", extra={"payload": str(feedback_dict)})
             return {"user_feedback": feedback_dict, "is_ready": True}
         except Exception as e:
             logger.error(f"Error processing feedback document: {str(e)}", exc_info=True)
@@ -215,5 +226,27 @@ async def get_message_feedback(
 # DELETE /messages/{message_id} - Delete message (to be implemented)
 # This endpoint will handle message deletion
 
-# GET /conversations/{conversation_id}/messages - List conversation messages (to be implemented)
-# This endpoint will retrieve all messages for a specific conversation 
\ No newline at end of file
+@router.get("/conversations/{conversation_id}/messages", response_model=MessagePage)
+async def list_conversation_messages(
+    conversation_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    List a conversation's messages, newest first.
+    
+    The first page holds the latest messages; follow next_cursor to load
+    older ones. Each page costs the same however long the conversation is.
+    
+    Returns:
+        MessagePage: The messages and the cursor of the next page (null on
+            the last page)
+    """
+    page = await conversation_service.get_conversation_messages(
+        conversation_id=conversation_id,
+        user_id=str(current_user["_id"]),
+        limit=limit,
+        cursor=cursor
+    )
+    return model_response(MessagePage, page) 
\ No newline at end of file
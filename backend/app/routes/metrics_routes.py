@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+import logging
+
+from app.utils.auth import get_current_user
+from app.utils.llm_metrics import llm_metrics
+from app.utils.tts_backend_pool import tts_backend_pool
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Create router instance
+router = APIRouter()
+
+
+def _require_admin(current_user: dict):
+    """Raise 403 unless the current user is an admin."""
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can access this endpoint"
+        )
+
+
+@router.get("/metrics/llm", response_model=dict)
+async def get_llm_metrics(current_user: dict = Depends(get_current_user)):
+    """
+    Get LLM call histograms for this process. Only accessible by admin users.
+
+    Returns:
+        dict: Per prompt type (refinement, conversation_reply, dual_feedback,
+            image_description, image_feedback):
+            - calls, error_count, errors by type and retries
+            - input_tokens, output_tokens and estimated cost_usd
+            - latency_seconds, input_tokens_per_call and output_tokens_per_call
+              histograms with cumulative buckets and p50/p95/p99 estimates
+    """
+    _require_admin(current_user)
+    return llm_metrics.snapshot()
+
+
+@router.get("/metrics/llm/usage", response_model=list)
+async def get_llm_usage(
+    date: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$", description="Day in YYYY-MM-DD format (UTC), defaults to today"),
+    user_id: Optional[str] = Query(None, description="Restrict to a single user"),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get per-user daily LLM usage rollups, most expensive users first.
+    Only accessible by admin users.
+
+    Returns:
+        list: One row per user with calls, errors, retries, token totals,
+            cost_usd and a by_prompt_type breakdown
+    """
+    _require_admin(current_user)
+    try:
+        return await llm_metrics.get_daily_usage(date=date, user_id=user_id, limit=limit)
+    except Exception as e:
+        logger.error(f"Error reading LLM usage rollups: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to read LLM usage rollups"
+        )
+
+
+@router.get("/metrics/tts", response_model=list)
+async def get_tts_backend_metrics(current_user: dict = Depends(get_current_user)):
+    """
+    Get the state of every TTS backend in the pool. Only accessible by admin users.
+
+    Returns:
+        list: Per backend: url, health probe result, circuit state, outstanding
+            requests, request and error counts, last error and
+            time-to-first-byte latency percentiles
+    """
+    _require_admin(current_user)
+    return tts_backend_pool.snapshot()
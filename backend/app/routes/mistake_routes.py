@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+
+from app.schemas.mistake import MistakeStatistics
+from app.utils.auth import get_current_user
+from app.utils.mistake_service import MistakeService
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Initialize services
+mistake_service = MistakeService()
+
+# Create router instance
+router = APIRouter()
+
+# ====================
+# MISTAKE ENDPOINTS
+# ====================
+
+@router.get("/mistakes/statistics", response_model=MistakeStatistics)
+async def get_mistake_statistics(current_user: dict = Depends(get_current_user)):
+    """
+    Get the current user's mistake statistics.
+
+    Served from the user's materialized statistics document plus one indexed
+    count of the mistakes due for practice.
+
+    Returns:
+        MistakeStatistics: Counts by status and type, due count and mastery percentage
+    """
+    try:
+        statistics = await mistake_service.get_mistake_statistics(str(current_user["_id"]))
+    except Exception as e:
+        logger.error(f"Error getting mistake statistics: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get mistake statistics: {str(e)}"
+        )
+
+    return MistakeStatistics(
+        total_count=statistics.total_count,
+        mastered_count=statistics.mastered_count,
+        learning_count=statistics.learning_count,
+        new_count=statistics.new_count,
+        grammar_count=statistics.type_distribution.get("GRAMMAR", 0),
+        vocabulary_count=statistics.type_distribution.get("VOCABULARY", 0),
+        due_for_practice=statistics.due_for_practice,
+        mastery_percentage=statistics.mastery_percentage
+    )
@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import StreamingResponse
 from bson import ObjectId
 from typing import List, Optional
 import logging
 import time
+from pathlib import Path
 from datetime import datetime
 
-from app.config.database import db
 from app.utils.auth import get_current_user
-from app.utils.tts_client_service import get_speech_from_tts_service
+from app.utils.conversation_archive import get_message
+from app.utils.identity_map import get_document, projection
+from app.utils.audio_response import PUBLIC_AUDIO_CACHE_CONTROL, audio_file_response
+from app.utils.tts_client_service import (
+    DEFAULT_LANG_CODE,
+    DEFAULT_RESPONSE_FORMAT,
+    DEFAULT_SPEECH_SPEED,
+    get_audio_headers,
+    get_speech_from_tts_service,
+    negotiate_audio_format
+)
 from app.services.tts_service import TTSService
 from app.services.conversation_service import ConversationService
 
@@ -33,16 +43,18 @@ router = APIRouter()
 )
 async def get_ai_message_as_speech_stream( 
     message_id: str,
+    request: Request,
+    audio_format: Optional[str] = Query(None, alias="format", description="opus, aac, mp3, flac, wav or pcm; overrides the Accept header"),
     current_user: dict = Depends(get_current_user)
 ):
     try:
         start = time.time()
+        response_format = negotiate_audio_format(request.headers.get("accept"), audio_format)
         
         logger.info(f"Getting AI message audio stream for message_id: {message_id}")
         
         # Get message data
-        message_object_id = ObjectId(message_id)
-        message = db.messages.find_one({"_id": message_object_id})
+        message = await get_message(ObjectId(message_id))
         if not message:
             raise HTTPException(status_code=404, detail="Message not found")
 
@@ -54,27 +66,44 @@ async def get_ai_message_as_speech_stream(
         if not ai_text:
             raise HTTPException(status_code=400, detail="AI Message has no text content to synthesize")
 
-        # Get conversation context to retrieve voice type
-        conversation_id = str(message["conversation_id"])
-        conversation_context = conversation_service.get_conversation_context(conversation_id)
-        conversation_voice_type = conversation_context["conversation"]["voice_type"]
+        # Only the conversation's voice and speech format are needed, not its message history
+        conversation = await get_document(
+            "conversations", message["conversation_id"], projection("voice_type", "speech_format")
+        )
+        if not conversation:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        conversation_voice_type = conversation["voice_type"]
+
+        # Later replies are presynthesized in the format this client asks for
+        if conversation.get("speech_format") != response_format:
+            await conversation_service.set_speech_format(conversation["_id"], response_format)
+
+        # Opening lines from the scenario library come with pre-rendered audio
+        speech_path = message.get("speech_path")
+        if response_format == DEFAULT_RESPONSE_FORMAT and speech_path and Path(speech_path).exists():
+            response = audio_file_response(Path(speech_path), "audio/mpeg", request.headers)
+            response.headers.update(get_audio_headers(response_format))
+            return response
         
         end = time.time()
         logger.info(f"Time taken to fetch message and conversation: {end - start} seconds")
 
-        default_lang_code = "en-US"     # Example: set to your primary language
+        default_lang_code = DEFAULT_LANG_CODE
         default_model_name = "kokoro"   # From your TTS API example
-        default_response_format = "mp3"
-        default_speed = 1.3
+        default_speed = DEFAULT_SPEECH_SPEED
 
-        return await get_speech_from_tts_service(
-            text_to_speak=ai_text,
+        # AI messages never change, so replays are served from the TTS cache (one entry per format)
+        response = await tts_service.get_speech(
+            text=ai_text,
             voice_name=conversation_voice_type,
             model_name=default_model_name,
-            response_format=default_response_format,
+            response_format=response_format,
             speed=default_speed,
-            lang_code=default_lang_code
+            lang_code=default_lang_code,
+            request_headers=request.headers
         )
+        response.headers.update(get_audio_headers(response_format))
+        return response
 
     except HTTPException as e:
         raise e
@@ -88,23 +117,27 @@ async def get_ai_message_as_speech_stream(
     description="Retrieves an AI message's text, converts it to speech via an external TTS service, and streams the audio."
 )
 async def get_ai_message_as_speech_stream_demo( 
-    message: str = "Hello, how are you?"
+    request: Request,
+    message: str = "Hello, how are you?",
+    audio_format: Optional[str] = Query(None, alias="format", description="opus, aac, mp3, flac, wav or pcm; overrides the Accept header")
 ):
     try:
         conversation_voice_type = "hm_omega"
         default_lang_code = "en-US"     # Example: set to your primary language
         default_model_name = "kokoro"   # From your TTS API example
-        default_response_format = "mp3"
+        response_format = negotiate_audio_format(request.headers.get("accept"), audio_format)
         default_speed = 1.3
 
         # 4. Call the TTS Service via your client function
-        #    This function is expected to return a StreamingResponse
+        #    This function is expected to return a StreamingResponse.
+        #    The endpoint is unauthenticated, so its arbitrary text bypasses the
+        #    TTS cache and cannot evict AI message audio; HTTP caches may keep it.
         start = time.time()
         stream_response = await get_speech_from_tts_service(
             text_to_speak=message,
             voice_name=conversation_voice_type,
             model_name=default_model_name,
-            response_format=default_response_format,
+            response_format=response_format,
             speed=default_speed,
             lang_code=default_lang_code
         )
@@ -112,6 +145,8 @@ async def get_ai_message_as_speech_stream_demo(
         
         # Add timing information as a header instead of trying to return it with the stream
         stream_response.headers["X-Processing-Time"] = str(end - start)
+        stream_response.headers["Cache-Control"] = PUBLIC_AUDIO_CACHE_CONTROL
+        stream_response.headers.update(get_audio_headers(response_format))
         
         return stream_response
     except HTTPException as e:
@@ -137,15 +172,14 @@ async def get_voice_context(
     """
     try:
         # Get message and validate
-        message_object_id = ObjectId(message_id)
-        message = db.messages.find_one({"_id": message_object_id})
+        message = await get_message(ObjectId(message_id))
         if not message:
             logger.warning(f"Message not found: {message_id}")
             raise HTTPException(status_code=404, detail="Message not found")
         
         # Get conversation context using service
         conversation_id = str(message["conversation_id"])
-        conversation_context = conversation_service.get_conversation_context(conversation_id)
+        conversation_context = await conversation_service.get_conversation_context(conversation_id)
         conversation = conversation_context["conversation"]
         messages = conversation_context["messages"]
         
@@ -1,11 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from app.config.database import db
+from app.config.database import async_db
 from app.schemas.user import UserCreate, UserResponse, UserLogin, UserUpdate, UserRegisterResponse, Token
 from app.utils.security import hash_password, verify_password
 from app.models.user import User
 from app.utils.auth import create_access_token, get_current_user
+from app.utils.identity_map import forget, get_document, remember
+from app.utils.user_cache import user_cache
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from typing import List, Optional
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
@@ -59,7 +63,7 @@ async def register_user(user: UserCreate):
     """
     try:
         # Check if email already exists
-        existing_user = db.users.find_one({"email": user.email})
+        existing_user = await async_db.users.find_one({"email": user.email})
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -80,8 +84,15 @@ async def register_user(user: UserCreate):
             "updated_at": datetime.utcnow()
         }
         
-        # Insert user and get the inserted ID
-        result = db.users.insert_one(user_data)
+        # Insert user and get the inserted ID; the unique email index catches
+        # a concurrent registration that passed the check above
+        try:
+            result = await async_db.users.insert_one(user_data)
+        except DuplicateKeyError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
         user_data["_id"] = result.inserted_id
         
         # Create access token
@@ -125,7 +136,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
             - scope: User permissions ("admin" or "user")
     """
     try:
-        user = db.users.find_one({"email": form_data.username})
+        user = await async_db.users.find_one({"email": form_data.username})
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -191,7 +202,7 @@ async def get_user_profile(current_user: dict = Depends(get_current_user)):
             - avatar_url: URL to user's profile image (optional)
     """
     try:
-        user = db.users.find_one({"_id": ObjectId(current_user["_id"])})
+        user = await get_document("users", current_user["_id"])
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -247,7 +258,7 @@ async def update_user_profile(
     """
     try:
         # Get current user
-        user = db.users.find_one({"_id": ObjectId(current_user["_id"])})
+        user = await get_document("users", current_user["_id"])
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -270,20 +281,20 @@ async def update_user_profile(
         # Add updated_at timestamp
         update_data["updated_at"] = datetime.utcnow()
         
-        # Update user in database
-        result = db.users.update_one(
+        # Update user in database and get the updated document in the same round trip
+        updated_user = await async_db.users.find_one_and_update(
             {"_id": user["_id"]},
-            {"$set": update_data}
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.modified_count == 0:
+        if updated_user is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
-        
-        # Get updated user data
-        updated_user = db.users.find_one({"_id": user["_id"]})
+        remember("users", updated_user)
+        user_cache.invalidate(updated_user["email"])
         
         return UserResponse(
             _id=str(updated_user["_id"]),
@@ -319,7 +330,7 @@ async def delete_user_profile(current_user: dict = Depends(get_current_user)):
     """
     try:
         # Soft delete by marking user as deleted
-        result = db.users.update_one(
+        result = await async_db.users.update_one(
             {"_id": ObjectId(current_user["_id"])},
             {
                 "$set": {
@@ -329,6 +340,8 @@ async def delete_user_profile(current_user: dict = Depends(get_current_user)):
                 }
             }
         )
+        forget("users", current_user["_id"])
+        user_cache.invalidate(current_user["email"])
         
         if result.modified_count == 0:
             raise HTTPException(
@@ -379,7 +392,7 @@ async def get_users(current_user: dict = Depends(get_current_user)):
             )
         
         # Fetch all non-deleted users from the database
-        users = list(db.users.find({"deleted": {"$ne": True}}))
+        users = await async_db.users.find({"deleted": {"$ne": True}}).to_list()
         
         # Convert users to response model format
         user_responses = []
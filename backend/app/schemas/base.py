@@ -0,0 +1,23 @@
+from pydantic import AliasChoices, BaseModel, BeforeValidator, ConfigDict, Field
+from typing import Annotated, Any
+from bson import ObjectId
+
+
+def _objectid_to_str(value: Any) -> Any:
+    return str(value) if isinstance(value, ObjectId) else value
+
+
+# A string field that also accepts the ObjectId stored in MongoDB
+ObjectIdStr = Annotated[str, BeforeValidator(_objectid_to_str)]
+
+
+class MongoModel(BaseModel):
+    """
+    Response schema validated straight from a MongoDB document.
+
+    The document's _id is read into `id` and ObjectId fields declared as
+    ObjectIdStr become strings, so documents need no conversion by hand.
+    """
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: ObjectIdStr = Field(validation_alias=AliasChoices("id", "_id"))
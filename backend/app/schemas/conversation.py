@@ -1,25 +1,43 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
-from bson import ObjectId
+
+from app.schemas.base import MongoModel, ObjectIdStr
+from app.schemas.message import MessageResponse
 
 class ConversationCreate(BaseModel):
     user_role: str
     ai_role: str
     situation: str
+    level: Optional[str] = None  # Optional learner level used to match library scenarios
     
 
-class ConversationResponse(BaseModel):
-    id: str
-    user_id: str
+class ConversationResponse(MongoModel):
+    user_id: ObjectIdStr
     user_role: str
     ai_role: str
     situation: str
     started_at: datetime
     ended_at: Optional[datetime] = None
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            ObjectId: lambda v: str(v)
-        }
+
+class ConversationSummary(MongoModel):
+    user_role: str
+    ai_role: str
+    situation: str
+    started_at: datetime
+    ended_at: Optional[datetime] = None
+    voice_type: Optional[str] = None
+    message_count: int = 0
+    last_message_preview: Optional[str] = None
+    last_activity_at: Optional[datetime] = None
+
+
+class ConversationPage(BaseModel):
+    items: List[ConversationSummary]
+    next_cursor: Optional[str] = None  # Pass as `cursor` to get the next (older) page
+
+
+class ConversationCreateResponse(BaseModel):
+    conversation: ConversationResponse
+    initial_message: MessageResponse
@@ -1,7 +1,8 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from bson import ObjectId
+
+from app.schemas.base import MongoModel, ObjectIdStr
 
 class MessageCreate(BaseModel):
     content: str
@@ -9,19 +10,21 @@ class MessageCreate(BaseModel):
     transcription: Optional[str] = None
     feedback_id: Optional[str] = None
 
-class MessageResponse(BaseModel):
-    id: str
-    conversation_id: str
+class MessageResponse(MongoModel):
+    conversation_id: ObjectIdStr
     sender: str
     content: str
     timestamp: datetime
     audio_path: Optional[str] = None
     transcription: Optional[str] = None
-    feedback_id: Optional[str] = None
+    feedback_id: Optional[ObjectIdStr] = None
+
+
+class MessagePage(BaseModel):
+    items: List[MessageResponse]
+    next_cursor: Optional[str] = None  # Pass as `cursor` to get the next (older) page
+
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            ObjectId: lambda v: str(v)
-        }
-        
+class MessageTurnResponse(BaseModel):
+    user_message: MessageResponse
+    ai_message: MessageResponse
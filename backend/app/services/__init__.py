@@ -10,11 +10,13 @@ from .conversation_service import ConversationService
 from .audio_service import AudioService
 from .feedback_service import FeedbackService
 from .tts_service import TTSService
+from .scenario_service import ScenarioService
 
 __all__ = [
     "AIService",
     "ConversationService", 
     "AudioService",
     "FeedbackService",
-    "TTSService"
+    "TTSService",
+    "ScenarioService"
 ] 
\ No newline at end of file
@@ -11,6 +11,8 @@ from typing import Dict, Any, Optional
 from fastapi import HTTPException
 
 from app.utils.gemini import generate_response
+from app.utils.llm_metrics import PROMPT_CONVERSATION_REPLY, PROMPT_REFINEMENT
+from app.utils.resilience import CircuitOpenError, DeadlineExceededError
 from app.utils.tts_client_service import pick_suitable_voice_name
 
 logger = logging.getLogger(__name__)
@@ -32,7 +34,8 @@ class AIService:
         self, 
         user_role: str, 
         ai_role: str, 
-        situation: str
+        situation: str,
+        user_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Refine conversation context using AI to create coherent scenarios.
@@ -41,6 +44,7 @@ class AIService:
             user_role (str): The role of the user in the conversation
             ai_role (str): The role of the AI in the conversation  
             situation (str): The conversation situation/context
+            user_id (Optional[str]): ID of the requesting user, for usage tracking
             
         Returns:
             Dict[str, Any]: Refined conversation context with all required fields
@@ -50,7 +54,9 @@ class AIService:
         """
         try:
             prompt = self._build_refinement_prompt(user_role, ai_role, situation)
-            refined_response = self.generate_ai_response(prompt)
+            refined_response = self.generate_ai_response(
+                prompt, prompt_type=PROMPT_REFINEMENT, user_id=user_id
+            )
             
             # Clean the response format
             cleaned_response = refined_response.strip("```json\n").strip("\n```")
@@ -65,7 +71,9 @@ class AIService:
             
             self.logger.info(f"Successfully refined conversation context for roles: {user_role} -> {ai_role}")
             return data_json
-            
+
+        except HTTPException:
+            raise
         except json.JSONDecodeError as e:
             self.logger.error(f"Failed to parse JSON response: {e}\nResponse text: {cleaned_response}")
             raise HTTPException(
@@ -85,12 +93,19 @@ class AIService:
                 detail="An unexpected error occurred while processing the AI response"
             )
     
-    def generate_ai_response(self, prompt: str) -> str:
+    def generate_ai_response(
+        self,
+        prompt: str,
+        prompt_type: str = PROMPT_CONVERSATION_REPLY,
+        user_id: Optional[str] = None
+    ) -> str:
         """
         Generate AI response for the given prompt.
         
         Args:
             prompt (str): The prompt to send to the AI
+            prompt_type (str): Prompt type tag used for LLM call instrumentation
+            user_id (Optional[str]): ID of the user the call is made for
             
         Returns:
             str: The AI-generated response
@@ -99,13 +114,25 @@ class AIService:
             HTTPException: If AI generation fails
         """
         try:
-            response = generate_response(prompt)
+            response = generate_response(prompt, prompt_type=prompt_type, user_id=user_id)
             if not response or not response.strip():
                 raise ValueError("Empty response from AI service")
             
             self.logger.debug(f"Generated AI response with length: {len(response)}")
             return response
-            
+
+        except CircuitOpenError as e:
+            self.logger.error(f"AI service unavailable: {str(e)}")
+            raise HTTPException(
+                status_code=503,
+                detail="AI service is temporarily unavailable. Please try again shortly."
+            )
+        except DeadlineExceededError as e:
+            self.logger.error(f"AI response timed out: {str(e)}")
+            raise HTTPException(
+                status_code=504,
+                detail="AI response generation timed out"
+            )
         except Exception as e:
             self.logger.error(f"Failed to generate AI response: {str(e)}")
             raise HTTPException(
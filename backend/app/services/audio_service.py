@@ -13,7 +13,7 @@ from pathlib import Path
 from fastapi import HTTPException, UploadFile
 from bson import ObjectId
 
-from app.config.database import db
+from app.config.database import async_db
 from app.models.audio import Audio
 from app.utils.speech_service import SpeechService
 from app.utils.transcription_error_message import TranscriptionErrorMessages
@@ -40,13 +40,14 @@ class AudioService:
         self.upload_dir = Path("app/uploads")
         self.upload_dir.mkdir(parents=True, exist_ok=True)
     
-    def save_audio_file(self, file: UploadFile, user_id: str) -> str:
+    async def save_audio_file(self, file: UploadFile, user_id: str, transcription: Optional[str] = None) -> str:
         """
         Save an audio file to storage and create database record.
         
         Args:
             file (UploadFile): The audio file to save
             user_id (str): The ID of the user uploading the file
+            transcription (Optional[str]): Transcription to store with the record
             
         Returns:
             str: The ID of the saved audio record
@@ -59,7 +60,7 @@ class AudioService:
             self.validate_audio_file(file)
             
             # Save the file using speech service
-            file_path, audio_model = self.speech_service.save_audio_file(file, user_id)
+            file_path, audio_model = await self.speech_service.save_audio_file(file, user_id, transcription)
             audio_id = str(audio_model._id)
             
             self.logger.info(f"Successfully saved audio file for user {user_id}: {audio_id}")
@@ -159,7 +160,7 @@ class AudioService:
                 detail=f"File validation failed: {str(e)}"
             )
     
-    def process_audio_for_feedback(
+    async def process_audio_for_feedback(
         self, 
         transcription: str, 
         user_id: str, 
@@ -195,7 +196,8 @@ class AudioService:
                     detail="Invalid user ID format"
                 )
             
-            if not ObjectId.is_valid(conversation_id):
+            # Audio is transcribed before it is linked to a conversation
+            if conversation_id and not ObjectId.is_valid(conversation_id):
                 raise HTTPException(
                     status_code=400,
                     detail="Invalid conversation ID format"
@@ -217,7 +219,7 @@ class AudioService:
             
             # Update audio record with transcription if audio_id is provided
             if audio_id and ObjectId.is_valid(audio_id):
-                db.audio.update_one(
+                await async_db.audio.update_one(
                     {"_id": ObjectId(audio_id)},
                     {"$set": {"transcription": transcription, "has_error": False}}
                 )
@@ -255,7 +257,7 @@ class AudioService:
             except Exception as e:
                 self.logger.warning(f"Failed to clean up temporary file {file_path}: {str(e)}")
     
-    def get_audio_metadata(self, audio_id: str) -> Dict[str, Any]:
+    async def get_audio_metadata(self, audio_id: str) -> Dict[str, Any]:
         """
         Retrieve audio file metadata.
         
@@ -275,7 +277,7 @@ class AudioService:
                     detail="Invalid audio ID format"
                 )
             
-            audio_record = db.audio.find_one({"_id": ObjectId(audio_id)})
+            audio_record = await async_db.audio.find_one({"_id": ObjectId(audio_id)})
             if not audio_record:
                 raise HTTPException(
                     status_code=404,
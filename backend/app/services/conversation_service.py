@@ -11,14 +11,62 @@ from datetime import datetime
 from bson import ObjectId
 from fastapi import HTTPException
 
-from app.config.database import db
+from app.config.database import async_db
 from app.models.conversation import Conversation
 from app.models.message import Message
-from app.schemas.conversation import ConversationCreate, ConversationResponse
-from app.schemas.message import MessageResponse
+from app.schemas.conversation import ConversationCreate
+from app.utils.identity_map import forget, get_document
+from app.utils.conversation_archive import get_archived_messages
+from app.utils.pagination import DEFAULT_PAGE_SIZE, keyset_filter, keyset_page, keyset_sort, next_page
+from app.utils.unit_of_work import UnitOfWork
 
 logger = logging.getLogger(__name__)
 
+# Length of the last-message preview stored on conversations
+MESSAGE_PREVIEW_CHARS = 120
+
+# Fields returned by the listing endpoints
+CONVERSATION_LIST_PROJECTION = {
+    "user_role": 1,
+    "ai_role": 1,
+    "situation": 1,
+    "started_at": 1,
+    "ended_at": 1,
+    "voice_type": 1,
+    "message_count": 1,
+    "last_message_preview": 1,
+    "last_activity_at": 1
+}
+MESSAGE_LIST_PROJECTION = {
+    "conversation_id": 1,
+    "sender": 1,
+    "content": 1,
+    "timestamp": 1,
+    "audio_path": 1,
+    "transcription": 1,
+    "feedback_id": 1
+}
+
+
+def message_preview(content: Optional[str]) -> Optional[str]:
+    """
+    Shorten a message for the conversation list.
+    
+    Args:
+        content (Optional[str]): The message text
+        
+    Returns:
+        Optional[str]: At most MESSAGE_PREVIEW_CHARS characters, cut at a word
+            boundary and ending in an ellipsis when shortened
+    """
+    if content is None:
+        return None
+    content = " ".join(content.split())
+    if len(content) <= MESSAGE_PREVIEW_CHARS:
+        return content
+    cut = content[:MESSAGE_PREVIEW_CHARS - 1].rsplit(" ", 1)[0]
+    return cut + "…"
+
 
 class ConversationService:
     """
@@ -32,7 +80,7 @@ class ConversationService:
         """Initialize the conversation service."""
         self.logger = logging.getLogger(self.__class__.__name__)
     
-    def create_conversation(
+    async def create_conversation(
         self, 
         user_id: str, 
         refined_context: Dict[str, Any]
@@ -43,9 +91,10 @@ class ConversationService:
         Args:
             user_id (str): The ID of the user creating the conversation
             refined_context (Dict[str, Any]): Refined conversation context from AI service
+                or the scenario library
             
         Returns:
-            Dict[str, Any]: Created conversation and initial message data
+            Dict[str, Any]: Documents of the created conversation and its initial message
             
         Raises:
             HTTPException: If conversation creation fails
@@ -60,27 +109,34 @@ class ConversationService:
                 voice_type=refined_context["voice_type"]
             )
             
-            # Insert conversation into database
-            result = db.conversations.insert_one(new_conversation.to_dict())
-            conversation_id = result.inserted_id
+            conversation_id = new_conversation._id
             
             # Create initial AI message
             initial_message = Message(
                 conversation_id=conversation_id,
                 sender="ai",
-                content=refined_context["response"]
+                content=refined_context["response"],
+                speech_path=refined_context.get("speech_path")
             )
-            db.messages.insert_one(initial_message.to_dict())
             
-            # Prepare response data
-            conversation_data = self._format_conversation_response(conversation_id)
-            message_data = self._format_message_response(initial_message, conversation_id)
+            # Store the conversation, its summary already counting the opening line, and the
+            # opening message together; the response is built from the stored document
+            conversation_doc = new_conversation.to_dict()
+            conversation_doc.update({
+                "message_count": 1,
+                "last_message_preview": message_preview(initial_message.content),
+                "last_activity_at": initial_message.timestamp
+            })
+            uow = UnitOfWork()
+            uow.insert("conversations", conversation_doc)
+            uow.insert("messages", initial_message.to_dict())
+            await uow.commit()
             
             self.logger.info(f"Successfully created conversation {conversation_id} for user {user_id}")
             
             return {
-                "conversation": ConversationResponse(**conversation_data),
-                "initial_message": MessageResponse(**message_data)
+                "conversation": conversation_doc,
+                "initial_message": initial_message.to_dict()
             }
             
         except Exception as e:
@@ -90,7 +146,109 @@ class ConversationService:
                 detail=f"Failed to create conversation: {str(e)}"
             )
     
-    def get_conversation_context(self, conversation_id: str) -> Dict[str, Any]:
+    async def add_message(self, message: Message) -> None:
+        """
+        Store a message and update its conversation's summary.
+        
+        Args:
+            message (Message): The message to store
+        """
+        uow = UnitOfWork()
+        self.record_messages(uow, message)
+        await uow.commit()
+    
+    def record_messages(self, uow: UnitOfWork, *messages: Message) -> None:
+        """
+        Queue the insert of messages of one conversation and its summary update.
+        
+        The summary (message_count, last_message_preview, last_activity_at) is
+        updated by two ordered writes: the count is incremented and the last
+        activity raised with $max, then the preview is set only if the newest
+        of these messages is now the conversation's last activity, so a
+        concurrent newer message keeps its preview. Conversations from before
+        summaries existed are left alone; listing them fills the summary in.
+        
+        Args:
+            uow (UnitOfWork): The unit of work the writes are added to
+            *messages (Message): Messages of the same conversation
+        """
+        if not messages:
+            return
+        latest = max(messages, key=lambda message: message.timestamp)
+        for message in messages:
+            uow.insert("messages", message.to_dict())
+        uow.update(
+            "conversations",
+            {"_id": latest.conversation_id, "message_count": {"$exists": True}},
+            {
+                "$inc": {"message_count": len(messages)},
+                "$max": {"last_activity_at": latest.timestamp}
+            }
+        )
+        uow.update(
+            "conversations",
+            {"_id": latest.conversation_id, "last_activity_at": latest.timestamp},
+            {"$set": {"last_message_preview": message_preview(latest.content)}}
+        )
+    
+    async def set_speech_format(self, conversation_id: ObjectId, response_format: str) -> None:
+        """
+        Store the audio format the client's speech requests negotiated.
+        
+        AI replies are presynthesized in this format, so the client's next
+        speech request attaches to that synthesis or hits the TTS cache.
+        
+        Args:
+            conversation_id (ObjectId): The conversation's ID
+            response_format (str): Audio format, e.g. "opus"
+        """
+        await async_db.conversations.update_one(
+            {"_id": conversation_id},
+            {"$set": {"speech_format": response_format}}
+        )
+        forget("conversations", conversation_id)
+    
+    async def _fill_missing_summaries(self, conversations: List[Dict[str, Any]]) -> None:
+        """
+        Compute and store summaries of conversations created before they existed.
+        
+        One aggregation over the messages of all listed conversations that lack
+        a summary, so an old page costs two queries instead of one per item.
+        
+        Args:
+            conversations (List[Dict[str, Any]]): Listed conversations, updated in place
+        """
+        missing = {conv["_id"]: conv for conv in conversations if "message_count" not in conv}
+        if not missing:
+            return
+        
+        cursor = await async_db.messages.aggregate([
+            {"$match": {"conversation_id": {"$in": list(missing)}}},
+            {"$sort": {"timestamp": 1}},
+            {"$group": {
+                "_id": "$conversation_id",
+                "message_count": {"$sum": 1},
+                "last_content": {"$last": "$content"},
+                "last_activity_at": {"$last": "$timestamp"}
+            }}
+        ])
+        rows = {row["_id"]: row async for row in cursor}
+        
+        for conversation_id, conv in missing.items():
+            row = rows.get(conversation_id, {})
+            summary = {
+                "message_count": row.get("message_count", 0),
+                "last_message_preview": message_preview(row.get("last_content")),
+                "last_activity_at": row.get("last_activity_at", conv.get("started_at"))
+            }
+            conv.update(summary)
+            # Only fill in: a message added meanwhile already wrote a newer summary
+            await async_db.conversations.update_one(
+                {"_id": conversation_id, "message_count": {"$exists": False}},
+                {"$set": summary}
+            )
+    
+    async def get_conversation_context(self, conversation_id: str) -> Dict[str, Any]:
         """
         Retrieve conversation context and message history.
         
@@ -112,7 +270,7 @@ class ConversationService:
                 )
             
             # Fetch conversation
-            conversation = db.conversations.find_one({"_id": ObjectId(conversation_id)})
+            conversation = await get_document("conversations", ObjectId(conversation_id))
             if not conversation:
                 raise HTTPException(
                     status_code=404,
@@ -120,10 +278,14 @@ class ConversationService:
                 )
             
             # Fetch messages for the conversation
-            messages = list(
-                db.messages.find({"conversation_id": ObjectId(conversation_id)})
-                .sort("timestamp", 1)
-            )
+            if conversation.get("archived"):
+                messages = await get_archived_messages(conversation["_id"])
+            else:
+                messages = await (
+                    async_db.messages.find({"conversation_id": ObjectId(conversation_id)})
+                    .sort("timestamp", 1)
+                    .to_list()
+                )
             
             # Format message history for AI context
             history = [
@@ -185,19 +347,19 @@ class ConversationService:
                 )
             
             # Validate length constraints
-            if len(conversation_data.user_role) > 5:
+            if len(conversation_data.user_role) > 100:
                 raise HTTPException(
                     status_code=400,
                     detail="User role must be 100 characters or less"
                 )
             
-            if len(conversation_data.ai_role) > 5:
+            if len(conversation_data.ai_role) > 100:
                 raise HTTPException(
                     status_code=400,
                     detail="AI role must be 100 characters or less"
                 )
             
-            if len(conversation_data.situation) > 10:
+            if len(conversation_data.situation) > 500:
                 raise HTTPException(
                     status_code=400,
                     detail="Situation must be 500 characters or less"
@@ -215,19 +377,26 @@ class ConversationService:
                 detail=f"Validation failed: {str(e)}"
             )
     
-    def get_user_conversations(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+    async def get_user_conversations(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Retrieve conversations for a specific user.
+        Retrieve one page of a user's conversations, most recent first.
         
         Args:
             user_id (str): The ID of the user
             limit (int): Maximum number of conversations to return
+            cursor (Optional[str]): next_cursor of the previous page
             
         Returns:
-            List[Dict[str, Any]]: List of user conversations
+            Dict[str, Any]: items (conversations without their messages) and
+                next_cursor (None on the last page)
             
         Raises:
-            HTTPException: If retrieval fails
+            HTTPException: If the cursor is invalid or retrieval fails
         """
         try:
             if not ObjectId.is_valid(user_id):
@@ -236,22 +405,18 @@ class ConversationService:
                     detail="Invalid user ID format"
                 )
             
-            conversations = list(
-                db.conversations.find({"user_id": ObjectId(user_id)})
-                .sort("created_at", -1)
-                .limit(limit)
+            query = {"user_id": ObjectId(user_id), **keyset_filter("started_at", cursor)}
+            conversations = await (
+                async_db.conversations.find(query, CONVERSATION_LIST_PROJECTION)
+                .sort(keyset_sort("started_at"))
+                .limit(limit + 1)
+                .to_list()
             )
+            conversations, next_cursor = next_page(conversations, "started_at", limit)
+            await self._fill_missing_summaries(conversations)
             
-            # Format conversations for response
-            formatted_conversations = []
-            for conv in conversations:
-                conv["id"] = str(conv["_id"])
-                conv["user_id"] = str(conv["user_id"])
-                del conv["_id"]
-                formatted_conversations.append(conv)
-            
-            self.logger.debug(f"Retrieved {len(formatted_conversations)} conversations for user {user_id}")
-            return formatted_conversations
+            self.logger.debug(f"Retrieved {len(conversations)} conversations for user {user_id}")
+            return {"items": conversations, "next_cursor": next_cursor}
             
         except HTTPException:
             raise
@@ -262,39 +427,72 @@ class ConversationService:
                 detail=f"Failed to retrieve conversations: {str(e)}"
             )
     
-    def _format_conversation_response(self, conversation_id: ObjectId) -> Dict[str, Any]:
-        """
-        Format conversation data for API response.
-        
-        Args:
-            conversation_id (ObjectId): The conversation ID
-            
-        Returns:
-            Dict[str, Any]: Formatted conversation data
-        """
-        conversation = db.conversations.find_one({"_id": conversation_id})
-        conversation["id"] = str(conversation["_id"])
-        conversation["user_id"] = str(conversation["user_id"])
-        del conversation["_id"]
-        return conversation
-    
-    def _format_message_response(
-        self, 
-        message: Message, 
-        conversation_id: ObjectId
+    async def get_conversation_messages(
+        self,
+        conversation_id: str,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Format message data for API response.
+        Retrieve one page of a conversation's messages, newest first.
+        
+        Pages are keyed by (timestamp, _id), so each one is a bounded index
+        scan however long the conversation is.
         
         Args:
-            message (Message): The message object
-            conversation_id (ObjectId): The conversation ID
+            conversation_id (str): The ID of the conversation
+            user_id (str): The ID of the requesting user, who must own it
+            limit (int): Maximum number of messages to return
+            cursor (Optional[str]): next_cursor of the previous page
             
         Returns:
-            Dict[str, Any]: Formatted message data
+            Dict[str, Any]: items (messages) and next_cursor (None on the last page)
+            
+        Raises:
+            HTTPException: If the conversation is not found or not owned by the
+                user, the cursor is invalid, or retrieval fails
         """
-        message_dict = message.to_dict()
-        message_dict["id"] = str(message_dict["_id"])
-        message_dict["conversation_id"] = str(conversation_id)
-        del message_dict["_id"]
-        return message_dict 
\ No newline at end of file
+        try:
+            if not ObjectId.is_valid(conversation_id):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid conversation ID format"
+                )
+            
+            conversation_object_id = ObjectId(conversation_id)
+            conversation = await async_db.conversations.find_one(
+                {"_id": conversation_object_id},
+                {"user_id": 1, "archived": 1}
+            )
+            if not conversation:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Conversation not found"
+                )
+            if str(conversation["user_id"]) != user_id:
+                raise HTTPException(status_code=403, detail="Access denied to this conversation")
+            
+            if conversation.get("archived"):
+                archived = await get_archived_messages(conversation_object_id)
+                messages, next_cursor = keyset_page(archived, "timestamp", cursor, limit)
+                return {"items": messages, "next_cursor": next_cursor}
+            
+            query = {"conversation_id": conversation_object_id, **keyset_filter("timestamp", cursor)}
+            messages = await (
+                async_db.messages.find(query, MESSAGE_LIST_PROJECTION)
+                .sort(keyset_sort("timestamp"))
+                .limit(limit + 1)
+                .to_list()
+            )
+            messages, next_cursor = next_page(messages, "timestamp", limit)
+            return {"items": messages, "next_cursor": next_cursor}
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve messages for conversation {conversation_id}: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to retrieve messages: {str(e)}"
+            )
@@ -5,12 +5,16 @@ This service manages feedback generation, processing, and analysis
 for the SpeakAI application.
 """
 
+import asyncio
 import logging
 from typing import Dict, Any, Optional
 from fastapi import HTTPException
+from bson import ObjectId
 
+from app.config.database import async_db
 from app.utils.feedback_service import FeedbackService as UtilsFeedbackService
 from app.utils.mistake_service import MistakeService as UtilsMistakeService
+from app.utils.feedback_batcher import FeedbackJob, feedback_batcher
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +33,7 @@ class FeedbackService:
         self.feedback_utils = UtilsFeedbackService()
         self.mistake_utils = UtilsMistakeService()
     
-    def generate_speech_feedback(
+    async def generate_speech_feedback(
         self,
         transcription: str,
         user_id: str,
@@ -37,9 +41,12 @@ class FeedbackService:
         audio_id: str,
         file_path: str,
         user_message_id: str
-    ) -> Dict[str, Any]:
+    ) -> None:
         """
-        Generate feedback for speech transcription.
+        Queue feedback generation for speech transcription.
+        
+        The job is handed to the feedback batcher, which coalesces pending jobs
+        into batched Gemini calls and stores the feedback when it is ready.
         
         Args:
             transcription (str): The transcribed text
@@ -49,34 +56,27 @@ class FeedbackService:
             file_path (str): Path to the audio file
             user_message_id (str): The ID of the user message
             
-        Returns:
-            Dict[str, Any]: Feedback generation results
-            
         Raises:
-            HTTPException: If feedback generation fails
+            HTTPException: If the feedback job cannot be queued
         """
         try:
-            # Use existing feedback service
-            result = self.feedback_utils.process_speech_feedback(
-                transcription=transcription,
+            await feedback_batcher.submit(FeedbackJob(
                 user_id=user_id,
                 conversation_id=conversation_id,
-                audio_id=audio_id,
-                file_path=file_path,
+                transcription=transcription,
                 user_message_id=user_message_id
-            )
+            ))
             
-            self.logger.info(f"Successfully generated feedback for user {user_id}")
-            return result
+            self.logger.info(f"Queued feedback generation for user {user_id}")
             
         except Exception as e:
-            self.logger.error(f"Failed to generate speech feedback: {str(e)}")
+            self.logger.error(f"Failed to queue speech feedback: {str(e)}")
             raise HTTPException(
                 status_code=500,
                 detail=f"Feedback generation failed: {str(e)}"
             )
     
-    def process_mistakes(
+    async def process_mistakes(
         self,
         feedback_id: str,
         user_id: str
@@ -95,15 +95,24 @@ class FeedbackService:
             HTTPException: If mistake processing fails
         """
         try:
-            # Use existing mistake service
-            result = self.mistake_utils.process_feedback_for_mistakes(
-                feedback_id=feedback_id,
-                user_id=user_id
+            # Mistakes come from the structured issues stored with the feedback
+            feedback = await async_db.feedback.find_one({"_id": ObjectId(feedback_id)})
+            if not feedback:
+                raise HTTPException(status_code=404, detail="Feedback not found")
+
+            # Mistake tracking uses the blocking client, like the feedback batcher
+            result = await asyncio.to_thread(
+                self.mistake_utils.process_feedback_for_mistakes,
+                user_id=user_id,
+                transcription=feedback.get("transcription") or "",
+                feedback=feedback
             )
             
             self.logger.info(f"Successfully processed mistakes for feedback {feedback_id}")
-            return result
+            return {"feedback_id": feedback_id, "mistakes_processed": result}
             
+        except HTTPException:
+            raise
         except Exception as e:
             self.logger.error(f"Failed to process mistakes: {str(e)}")
             raise HTTPException(
@@ -0,0 +1,175 @@
+"""
+Scenario Service for the precomputed scenario library.
+
+The library holds refined scenarios and opening lines generated offline
+(see app/utils/build_scenario_library.py), each tagged by level and topic and
+stored with pre-rendered opening audio. Conversation creation can then skip
+the Gemini refinement call whenever a request matches a known scenario.
+"""
+
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from app.config.database import async_db
+
+logger = logging.getLogger(__name__)
+
+# Where pre-rendered opening audio is stored; kept outside app/uploads, which is
+# served publicly, since the speech endpoint serves these files itself
+SCENARIO_AUDIO_DIR = Path(os.getenv("SCENARIO_AUDIO_DIR", "app/data/scenarios"))
+
+
+def normalize_scenario_text(text: str) -> str:
+    """
+    Normalize free-text scenario input for matching.
+
+    Args:
+        text (str): Role or situation text as typed by the user
+
+    Returns:
+        str: Lowercased text with punctuation removed and whitespace collapsed
+    """
+    text = re.sub(r"[^\w\s]", " ", (text or "").lower())
+    return " ".join(text.split())
+
+
+def build_scenario_key(user_role: str, ai_role: str, situation: str) -> str:
+    """
+    Build the lookup key for a scenario request.
+
+    Args:
+        user_role (str): The user's role
+        ai_role (str): The AI's role
+        situation (str): The conversation situation
+
+    Returns:
+        str: Key shared by all library entries generated from the same inputs
+    """
+    return "|".join(normalize_scenario_text(part) for part in (user_role, ai_role, situation))
+
+
+class ScenarioService:
+    """
+    Service class for reading and writing the scenario library.
+
+    Library entries use the same fields as AIService.refine_conversation_context
+    output, so they can be passed directly to ConversationService.create_conversation.
+    """
+
+    def __init__(self):
+        """Initialize the scenario service."""
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def find_scenario(
+        self,
+        user_role: str,
+        ai_role: str,
+        situation: str,
+        level: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Pick a library scenario matching the request, if there is one.
+
+        Args:
+            user_role (str): The requested user role
+            ai_role (str): The requested AI role
+            situation (str): The requested situation
+            level (Optional[str]): Learner level to restrict the match to
+
+        Returns:
+            Optional[Dict[str, Any]]: A randomly chosen matching scenario in refined
+            context format, or None if the library has no match
+        """
+        query = {"scenario_key": build_scenario_key(user_role, ai_role, situation)}
+        if level:
+            query["level"] = level.lower()
+
+        try:
+            cursor = await async_db.scenarios.aggregate([
+                {"$match": query},
+                {"$sample": {"size": 1}}
+            ])
+            matches = await cursor.to_list()
+        except Exception as e:
+            # The library is an optimization; never fail conversation creation over it
+            self.logger.error(f"Scenario library lookup failed: {str(e)}")
+            return None
+
+        if not matches:
+            return None
+
+        scenario = matches[0]
+        speech_path = scenario.get("speech_path")
+        if speech_path and not Path(speech_path).exists():
+            speech_path = None
+
+        self.logger.info(f"Serving conversation from scenario library entry {scenario['_id']}")
+        return {
+            "refined_user_role": scenario["refined_user_role"],
+            "refined_ai_role": scenario["refined_ai_role"],
+            "refined_situation": scenario["refined_situation"],
+            "response": scenario["response"],
+            "ai_gender": scenario["ai_gender"],
+            "voice_type": scenario["voice_type"],
+            "speech_path": speech_path,
+            "scenario_id": str(scenario["_id"])
+        }
+
+    async def save_scenario(
+        self,
+        seed: Dict[str, Any],
+        refined_context: Dict[str, Any],
+        speech_path: Optional[str] = None
+    ) -> str:
+        """
+        Store a refined scenario in the library.
+
+        Args:
+            seed (Dict[str, Any]): Seed the scenario was generated from
+                (user_role, ai_role, situation, level, topic)
+            refined_context (Dict[str, Any]): Output of AIService.refine_conversation_context
+            speech_path (Optional[str]): Path to the pre-rendered opening audio
+
+        Returns:
+            str: The ID of the stored scenario
+        """
+        document = {
+            "scenario_key": build_scenario_key(seed["user_role"], seed["ai_role"], seed["situation"]),
+            "level": (seed.get("level") or "").lower() or None,
+            "topic": (seed.get("topic") or "").lower() or None,
+            "source": {
+                "user_role": seed["user_role"],
+                "ai_role": seed["ai_role"],
+                "situation": seed["situation"]
+            },
+            "refined_user_role": refined_context["refined_user_role"],
+            "refined_ai_role": refined_context["refined_ai_role"],
+            "refined_situation": refined_context["refined_situation"],
+            "response": refined_context["response"],
+            "ai_gender": refined_context["ai_gender"],
+            "voice_type": refined_context["voice_type"],
+            "speech_path": speech_path,
+            "created_at": datetime.utcnow()
+        }
+        result = await async_db.scenarios.insert_one(document)
+        return str(result.inserted_id)
+
+    async def count_scenarios(self, user_role: str, ai_role: str, situation: str) -> int:
+        """
+        Count library entries generated for the given inputs.
+
+        Args:
+            user_role (str): The user's role
+            ai_role (str): The AI's role
+            situation (str): The conversation situation
+
+        Returns:
+            int: Number of stored variants
+        """
+        return await async_db.scenarios.count_documents(
+            {"scenario_key": build_scenario_key(user_role, ai_role, situation)}
+        )
@@ -5,18 +5,67 @@ This service manages text-to-speech conversion, voice selection,
 and speech generation for the SpeakAI application.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import os
+import re
+from contextlib import aclosing
+from typing import Dict, Any, List, Mapping, Optional
 from fastapi import HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
+from app.utils.audio_response import PRIVATE_AUDIO_CACHE_CONTROL, audio_file_response
+from app.utils.speech_synthesis import speech_synthesis
+from app.utils.tts_cache import build_tts_cache_key, tts_cache
 from app.utils.tts_client_service import (
+    DEFAULT_LANG_CODE,
+    DEFAULT_RESPONSE_FORMAT,
+    DEFAULT_SPEECH_SPEED,
+    TTS_MODEL_NAME,
+    get_audio_media_type,
     get_speech_from_tts_service,
     pick_suitable_voice_name
 )
 
 logger = logging.getLogger(__name__)
 
+# Start synthesizing AI replies as soon as they are stored
+TTS_PRESYNTHESIS_ENABLED = os.getenv("TTS_PRESYNTHESIS_ENABLED", "true").lower() == "true"
+# Sentence requests in flight per text; 0 sends the whole text as one request
+TTS_SENTENCE_CONCURRENCY = int(os.getenv("TTS_SENTENCE_CONCURRENCY", "4"))
+# Shorter sentences are merged with the next one to save round trips
+TTS_SENTENCE_MIN_CHARS = int(os.getenv("TTS_SENTENCE_MIN_CHARS", "40"))
+# Formats whose streams can be played back to back as one file
+CONCATENABLE_FORMATS = {"mp3", "aac", "pcm"}
+
+_SENTENCE_END = re.compile(r"(?:(?<=[.!?…])|(?<=[.!?…][\"')\]]))\s+")
+
+
+def split_into_sentences(text: str, min_chars: int = TTS_SENTENCE_MIN_CHARS) -> List[str]:
+    """
+    Split text into sentence chunks for parallel synthesis.
+    
+    Args:
+        text (str): Text to split
+        min_chars (int): Chunks shorter than this are merged with the next sentence
+        
+    Returns:
+        List[str]: Non-empty chunks that join back into the text
+    """
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text.strip()):
+        current = f"{current} {sentence}".strip()
+        if len(current) >= min_chars:
+            chunks.append(current)
+            current = ""
+    if current:
+        if chunks and len(current) < min_chars:
+            chunks[-1] = f"{chunks[-1]} {current}"
+        else:
+            chunks.append(current)
+    return chunks
+
 
 class TTSService:
     """
@@ -30,6 +79,207 @@ class TTSService:
         """Initialize the TTS service."""
         self.logger = logging.getLogger(self.__class__.__name__)
     
+    async def get_speech(
+        self,
+        text: str,
+        voice_name: str,
+        model_name: str = TTS_MODEL_NAME,
+        response_format: str = DEFAULT_RESPONSE_FORMAT,
+        speed: float = DEFAULT_SPEECH_SPEED,
+        lang_code: str = DEFAULT_LANG_CODE,
+        request_headers: Optional[Mapping[str, str]] = None,
+        cache_control: str = PRIVATE_AUDIO_CACHE_CONTROL
+    ) -> Response:
+        """
+        Get speech audio, served from the TTS cache when it was synthesized before.
+        
+        Cached audio is served with ETag/Last-Modified and Cache-Control headers
+        and answers Range and conditional requests. On a miss the request
+        attaches to the running synthesis of the same audio (e.g. one started by
+        presynthesize) or starts one, and streams it while it is written into the
+        cache. Range requests on a miss wait for the audio to be materialized,
+        so seeking never starts another synthesis.
+        
+        Args:
+            text (str): The text to convert to speech
+            voice_name (str): The voice name to use
+            model_name (str): The TTS model
+            response_format (str): Audio format, e.g. "mp3"
+            speed (float): Playback speed
+            lang_code (str): The language code for speech generation
+            request_headers (Optional[Mapping[str, str]]): Incoming request headers
+            cache_control (str): Cache-Control header for materialized audio
+            
+        Returns:
+            Response: 304 or FileResponse for cached audio, otherwise a StreamingResponse
+            
+        Raises:
+            HTTPException: If speech generation fails
+        """
+        cache_key = build_tts_cache_key(text, voice_name, speed, response_format, model_name, lang_code)
+        media_type = get_audio_media_type(response_format)
+        cached_path = await asyncio.to_thread(tts_cache.get, cache_key)
+        if cached_path is not None:
+            self.logger.debug(f"TTS cache hit for {cache_key}")
+            return audio_file_response(cached_path, media_type, request_headers, f'"{cache_key}"', cache_control)
+
+        job = speech_synthesis.get_or_start(
+            cache_key,
+            response_format,
+            self.synthesize_speech,
+            text_to_speak=text,
+            voice_name=voice_name,
+            model_name=model_name,
+            speed=speed,
+            lang_code=lang_code
+        )
+        if request_headers is not None and "range" in request_headers:
+            await job.wait_finished()
+        else:
+            await job.wait_started()
+        if job.done and job.error is not None:
+            if isinstance(job.error, HTTPException):
+                raise job.error
+            raise HTTPException(status_code=500, detail=f"Speech generation failed: {str(job.error)}")
+
+        cached_path = await asyncio.to_thread(tts_cache.get, cache_key) if job.done else None
+        if cached_path is not None:
+            return audio_file_response(cached_path, media_type, request_headers, f'"{cache_key}"', cache_control)
+        return StreamingResponse(job.listen(), media_type=job.media_type)
+
+    def presynthesize(
+        self,
+        text: str,
+        voice_name: str,
+        model_name: str = TTS_MODEL_NAME,
+        response_format: str = DEFAULT_RESPONSE_FORMAT,
+        speed: float = DEFAULT_SPEECH_SPEED,
+        lang_code: str = DEFAULT_LANG_CODE
+    ) -> None:
+        """
+        Start synthesizing speech in the background without waiting for it.
+        
+        Used right after an AI message is stored: by the time the client asks
+        for the audio, get_speech attaches to the running job or hits the cache.
+        That only works if every parameter matches the client's request, so
+        pass the format it negotiates. Must be called from the event loop.
+        
+        Args:
+            text (str): The text to convert to speech
+            voice_name (str): The voice name to use
+            model_name (str): The TTS model
+            response_format (str): Audio format, e.g. "mp3"
+            speed (float): Playback speed
+            lang_code (str): The language code for speech generation
+        """
+        if not TTS_PRESYNTHESIS_ENABLED or not voice_name or not text or not text.strip():
+            return
+
+        cache_key = build_tts_cache_key(text, voice_name, speed, response_format, model_name, lang_code)
+        # Index lookup only: this runs on the event loop
+        if tts_cache.contains(cache_key):
+            return
+
+        speech_synthesis.get_or_start(
+            cache_key,
+            response_format,
+            self.synthesize_speech,
+            text_to_speak=text,
+            voice_name=voice_name,
+            model_name=model_name,
+            speed=speed,
+            lang_code=lang_code
+        )
+        self.logger.debug(f"Started background synthesis {cache_key}")
+
+    async def synthesize_speech(
+        self,
+        text_to_speak: str,
+        voice_name: str,
+        model_name: str = TTS_MODEL_NAME,
+        response_format: str = DEFAULT_RESPONSE_FORMAT,
+        speed: float = DEFAULT_SPEECH_SPEED,
+        lang_code: str = DEFAULT_LANG_CODE
+    ) -> StreamingResponse:
+        """
+        Synthesize text sentence by sentence, with sentences requested concurrently.
+        
+        Up to TTS_SENTENCE_CONCURRENCY sentence requests run at once. Their audio
+        is streamed back in text order: the first sentence plays as soon as its
+        audio arrives, later ones are buffered until every sentence before them
+        has been sent. Single-sentence texts and formats that cannot be
+        concatenated go to the TTS service as one request.
+        
+        Args:
+            text_to_speak (str): The text to convert to speech
+            voice_name (str): The voice name to use
+            model_name (str): The TTS model
+            response_format (str): Audio format, e.g. "mp3"
+            speed (float): Playback speed
+            lang_code (str): The language code for speech generation
+            
+        Returns:
+            StreamingResponse: The assembled audio stream
+            
+        Raises:
+            HTTPException: If the first sentence cannot be synthesized
+        """
+        options = dict(voice_name=voice_name, model_name=model_name,
+                       response_format=response_format, speed=speed, lang_code=lang_code)
+        sentences = split_into_sentences(text_to_speak, TTS_SENTENCE_MIN_CHARS)
+        if (
+            TTS_SENTENCE_CONCURRENCY <= 0
+            or response_format not in CONCATENABLE_FORMATS
+            or len(sentences) <= 1
+        ):
+            return await get_speech_from_tts_service(text_to_speak=text_to_speak, **options)
+
+        semaphore = asyncio.Semaphore(TTS_SENTENCE_CONCURRENCY)
+        queues = [asyncio.Queue() for _ in sentences]
+        first_response = asyncio.get_running_loop().create_future()
+
+        async def fetch(index: int, sentence: str):
+            # Each queue receives the sentence's chunks, then None or the error
+            queue = queues[index]
+            try:
+                async with semaphore:
+                    response = await get_speech_from_tts_service(text_to_speak=sentence, **options)
+                    if index == 0:
+                        first_response.set_result(response.media_type)
+                    async with aclosing(response.body_iterator) as chunks:
+                        async for chunk in chunks:
+                            queue.put_nowait(chunk)
+                queue.put_nowait(None)
+            except Exception as e:
+                if index == 0 and not first_response.done():
+                    first_response.set_exception(e)
+                queue.put_nowait(e)
+
+        tasks = [asyncio.create_task(fetch(index, sentence)) for index, sentence in enumerate(sentences)]
+        try:
+            media_type = await first_response
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        self.logger.debug(f"Synthesizing {len(sentences)} sentences with fan-out {TTS_SENTENCE_CONCURRENCY}")
+
+        async def assemble():
+            try:
+                for queue in queues:
+                    while True:
+                        item = await queue.get()
+                        if item is None:
+                            break
+                        if isinstance(item, Exception):
+                            raise item
+                        yield item
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(assemble(), media_type=media_type)
+    
     async def generate_speech_streaming(
         self,
         text: str,
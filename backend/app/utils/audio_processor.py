@@ -24,7 +24,6 @@ import torch
 from threading import Lock
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Load environment variables
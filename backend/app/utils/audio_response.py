@@ -0,0 +1,96 @@
+"""
+HTTP responses for materialized audio files.
+
+Synthesized speech never changes once written, so it is served with strong
+validators and long-lived caching headers. Players can seek with Range requests
+(206 Partial Content) and revalidate with If-None-Match / If-Modified-Since
+(304 Not Modified) without the audio being synthesized again.
+"""
+
+import hashlib
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Mapping, Optional
+
+from fastapi.responses import FileResponse, Response
+
+# Audio of authenticated endpoints must not be stored by shared caches
+PRIVATE_AUDIO_CACHE_CONTROL = os.getenv("PRIVATE_AUDIO_CACHE_CONTROL", "private, max-age=31536000, immutable")
+PUBLIC_AUDIO_CACHE_CONTROL = os.getenv("PUBLIC_AUDIO_CACHE_CONTROL", "public, max-age=31536000, immutable")
+
+
+def file_etag(path: Path) -> str:
+    """
+    Build a strong ETag from a file's modification time and size.
+
+    Args:
+        path: Audio file
+
+    Returns:
+        str: Quoted ETag value
+    """
+    stat_result = os.stat(path)
+    etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}"
+    return f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def is_not_modified(request_headers: Mapping[str, str], etag: str, last_modified: float) -> bool:
+    """
+    Evaluate conditional GET headers (RFC 9110, section 13.2.2).
+
+    If-None-Match takes precedence; If-Modified-Since is only used without it.
+
+    Args:
+        request_headers: Incoming request headers
+        etag: Current ETag of the audio
+        last_modified: Modification time of the audio as a Unix timestamp
+
+    Returns:
+        bool: True if the client's copy is current and a 304 can be sent
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
+
+
+def audio_file_response(
+    path: Path,
+    media_type: str,
+    request_headers: Optional[Mapping[str, str]] = None,
+    etag: Optional[str] = None,
+    cache_control: str = PRIVATE_AUDIO_CACHE_CONTROL
+) -> Response:
+    """
+    Serve an audio file with caching headers, range and conditional support.
+
+    Args:
+        path: Audio file
+        media_type: Content-Type of the audio
+        request_headers: Incoming request headers, for conditional requests
+        etag: ETag to send; defaults to one derived from the file's stat
+        cache_control: Cache-Control header value
+
+    Returns:
+        Response: 304 if the client's copy is current, otherwise a FileResponse
+            that answers Range requests with 206 Partial Content
+    """
+    last_modified = os.stat(path).st_mtime
+    headers = {
+        "etag": etag or file_etag(path),
+        "last-modified": formatdate(last_modified, usegmt=True),
+        "cache-control": cache_control
+    }
+    if request_headers is not None and is_not_modified(request_headers, headers["etag"], last_modified):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
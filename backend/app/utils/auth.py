@@ -3,7 +3,9 @@ from fastapi import Depends, HTTPException, status, Security
 from fastapi.security import OAuth2PasswordBearer, SecurityScopes
 from jose import jwt, JWTError
 from typing import Optional
-from app.config.database import db
+from app.config.database import async_db
+from app.utils.identity_map import remember
+from app.utils.user_cache import user_cache
 from bson import ObjectId
 import os
 from dotenv import load_dotenv
@@ -97,10 +99,15 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    # Find the user in the database
-    user = db.users.find_one({"email": email})
+    # Find the user, reusing a recently loaded one
+    user = user_cache.get(email)
     if user is None:
-        raise credentials_exception
+        user = await async_db.users.find_one({"email": email})
+        if user is None:
+            raise credentials_exception
+        user_cache.put(email, user)
+    # Later reads of the user in this request are served from the identity map
+    remember("users", user)
         
     # Check for required scopes
     for scope in security_scopes.scopes:
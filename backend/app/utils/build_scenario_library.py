@@ -0,0 +1,126 @@
+"""
+Offline batch job that fills the scenario library.
+
+For every seed it asks Gemini for refined scenarios (via
+AIService.refine_conversation_context, which uses _build_refinement_prompt),
+pre-renders the opening line with the TTS service and stores the result so
+POST /api/conversations can serve matching requests without an LLM call.
+
+Usage (from the backend directory):
+    python -m app.utils.build_scenario_library --variants 3
+    python -m app.utils.build_scenario_library --seeds my_seeds.json --skip-audio
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+
+from app.config.database import close_async_client
+from app.services.ai_service import AIService
+from app.services.scenario_service import SCENARIO_AUDIO_DIR, ScenarioService
+from app.utils.llm_metrics import llm_metrics
+from app.utils.tts_client_service import DEFAULT_RESPONSE_FORMAT, close_tts_client, synthesize_speech_bytes
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEEDS_FILE = Path(__file__).parent / "scenario_seeds.json"
+
+
+def load_seeds(path: Path) -> List[Dict[str, Any]]:
+    """Load scenario seeds (user_role, ai_role, situation, level, topic) from a JSON file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def render_opening_audio(text: str, voice_type: str) -> Optional[str]:
+    """
+    Pre-render the opening line and store it on disk.
+
+    Args:
+        text: The AI's opening line
+        voice_type: The voice the conversation will use
+
+    Returns:
+        Path to the stored audio, or None if rendering failed
+    """
+    try:
+        audio = await synthesize_speech_bytes(text_to_speak=text, voice_name=voice_type)
+    except Exception as e:
+        logger.warning(f"Could not pre-render opening audio: {e}")
+        return None
+
+    SCENARIO_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+    path = SCENARIO_AUDIO_DIR / f"{ObjectId()}.{DEFAULT_RESPONSE_FORMAT}"
+    path.write_bytes(audio)
+    return str(path)
+
+
+async def build_library(seeds: List[Dict[str, Any]], variants: int, skip_audio: bool = False) -> int:
+    """
+    Generate library entries until every seed has `variants` stored scenarios.
+
+    Args:
+        seeds: Scenario seeds to generate from
+        variants: Target number of variants per seed
+        skip_audio: Store scenarios without pre-rendered audio
+
+    Returns:
+        Number of scenarios created
+    """
+    ai_service = AIService()
+    scenario_service = ScenarioService()
+    created = 0
+
+    for seed in seeds:
+        existing = await scenario_service.count_scenarios(seed["user_role"], seed["ai_role"], seed["situation"])
+        for _ in range(max(0, variants - existing)):
+            try:
+                refined_context = await asyncio.to_thread(
+                    ai_service.refine_conversation_context,
+                    user_role=seed["user_role"],
+                    ai_role=seed["ai_role"],
+                    situation=seed["situation"]
+                )
+            except Exception as e:
+                logger.error(f"Refinement failed for seed {seed}: {e}")
+                continue
+
+            speech_path = None
+            if not skip_audio:
+                speech_path = await render_opening_audio(refined_context["response"], refined_context["voice_type"])
+
+            scenario_id = await scenario_service.save_scenario(seed, refined_context, speech_path)
+            created += 1
+            logger.info(f"Stored scenario {scenario_id} for {seed['user_role']} / {seed['ai_role']} / {seed['situation']}")
+
+    return created
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate scenarios for the scenario library.")
+    parser.add_argument("--seeds", type=Path, default=DEFAULT_SEEDS_FILE, help="JSON file with scenario seeds")
+    parser.add_argument("--variants", type=int, default=3, help="Scenarios to keep per seed")
+    parser.add_argument("--skip-audio", action="store_true", help="Do not pre-render opening audio")
+    args = parser.parse_args()
+
+    async def run():
+        try:
+            return await build_library(load_seeds(args.seeds), args.variants, args.skip_audio)
+        finally:
+            # The event handler that normally writes usage rollups is not running here
+            await asyncio.to_thread(llm_metrics.flush_rollups)
+            await close_tts_client()
+            await close_async_client()
+
+    created = asyncio.run(run())
+    logger.info(f"Scenario library build finished: {created} scenarios created")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Archival of cold conversations.
+
+Conversations without activity for CONVERSATION_ARCHIVE_AFTER_DAYS are moved
+out of the hot collections: their messages and feedback are bundled into one
+document per conversation in the conversation_archive collection, which is
+created with zstd block compression, and removed from `messages` and
+`feedback`. The conversation document stays as a stub marked `archived`, so
+listings and summaries keep working from the hot collection.
+
+Reads go through this module and fall back to the archive transparently:
+get_message(), get_feedback() and get_archived_messages(). A conversation that
+receives a new message is restored to the hot collections first.
+
+The background event handler runs archive_cold_conversations() periodically;
+it can also be run by hand (from the backend directory):
+    python -m app.utils.conversation_archive [--days N]
+"""
+
+import argparse
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import bson
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from app.config.database import async_db, db
+from app.utils.identity_map import forget, get_document
+
+logger = logging.getLogger(__name__)
+
+# Conversations without activity for this long are archived
+CONVERSATION_ARCHIVE_AFTER_DAYS = int(os.getenv("CONVERSATION_ARCHIVE_AFTER_DAYS", "90"))
+# How often the background worker archives cold conversations (0 disables)
+CONVERSATION_ARCHIVE_INTERVAL_SECONDS = int(os.getenv("CONVERSATION_ARCHIVE_INTERVAL_SECONDS", "86400"))
+# Conversations archived per run
+CONVERSATION_ARCHIVE_BATCH_SIZE = int(os.getenv("CONVERSATION_ARCHIVE_BATCH_SIZE", "100"))
+# WiredTiger block compressor of the archive collection (zstd, zlib or snappy)
+CONVERSATION_ARCHIVE_COMPRESSOR = os.getenv("CONVERSATION_ARCHIVE_COMPRESSOR", "zstd")
+
+ARCHIVE_COLLECTION = "conversation_archive"
+# Bundles must stay below MongoDB's 16 MiB document limit
+MAX_ARCHIVE_BYTES = 15 * 1024 * 1024
+
+
+def ensure_archive_collection() -> None:
+    """Create the archive collection with block compression if it does not exist."""
+    if ARCHIVE_COLLECTION in db.list_collection_names():
+        return
+    try:
+        db.create_collection(
+            ARCHIVE_COLLECTION,
+            storageEngine={"wiredTiger": {"configString": f"block_compressor={CONVERSATION_ARCHIVE_COMPRESSOR}"}}
+        )
+    except Exception as e:
+        # Archiving still works, with the server's default compression
+        logger.warning(f"Could not create compressed {ARCHIVE_COLLECTION} collection: {str(e)}")
+
+
+def archive_conversation(conversation: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+    """
+    Move one conversation's messages and feedback into the archive.
+
+    The bundle is written first, then the conversation is marked archived only
+    if it had no activity meanwhile, then the hot documents are deleted. A
+    conversation that became active again is left in place. That includes a
+    message stored after the messages were read but before its conversation
+    update: it is found by re-checking before the purge, and archiving is
+    undone.
+
+    Args:
+        conversation: The conversation document (needs _id, user_id and last_activity_at)
+        now: Archive time (defaults to the current time)
+
+    Returns:
+        bool: True if the conversation was archived
+    """
+    now = now or datetime.utcnow()
+    conversation_id = conversation["_id"]
+
+    messages = list(db.messages.find({"conversation_id": conversation_id}).sort([("timestamp", 1), ("_id", 1)]))
+    feedback = list(db.feedback.find({"target_id": {"$in": [message["_id"] for message in messages]}}))
+    bundle = {
+        "_id": conversation_id,
+        "user_id": conversation.get("user_id"),
+        "archived_at": now,
+        "last_activity_at": conversation.get("last_activity_at"),
+        "messages": messages,
+        "feedback": feedback
+    }
+    if len(bson.encode(bundle)) > MAX_ARCHIVE_BYTES:
+        logger.warning(f"Conversation {conversation_id} is too large to archive as one document")
+        return False
+
+    db[ARCHIVE_COLLECTION].replace_one({"_id": conversation_id}, bundle, upsert=True)
+
+    # Archive only if no message arrived since the conversation was read
+    result = db.conversations.update_one(
+        {
+            "_id": conversation_id,
+            "archived": {"$ne": True},
+            "last_activity_at": conversation.get("last_activity_at")
+        },
+        {"$set": {"archived": True, "archived_at": now, "archive_purge_pending": True}}
+    )
+    if result.modified_count == 0:
+        db[ARCHIVE_COLLECTION].delete_one({"_id": conversation_id})
+        return False
+
+    # A turn writes its messages before updating the conversation, so the
+    # guard above misses messages whose conversation update is still pending
+    messages, feedback = _find_unarchived_documents(bundle)
+    if messages or feedback:
+        logger.info(f"Conversation {conversation_id} became active while archiving; leaving it in place")
+        db.conversations.update_one(
+            {"_id": conversation_id},
+            {"$unset": {"archived": "", "archived_at": "", "archive_purge_pending": ""}}
+        )
+        db[ARCHIVE_COLLECTION].delete_one({"_id": conversation_id})
+        return False
+
+    _purge_hot_documents(bundle)
+    return True
+
+
+def _find_unarchived_documents(bundle: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Find hot messages and feedback of an archived conversation that are missing from its bundle.
+
+    Args:
+        bundle: The archive bundle (needs _id and the _ids of its messages and feedback)
+
+    Returns:
+        Tuple of the missing messages and feedback
+    """
+    message_ids = [message["_id"] for message in bundle["messages"]]
+    feedback_ids = [feedback["_id"] for feedback in bundle["feedback"]]
+    messages = list(db.messages.find({"conversation_id": bundle["_id"], "_id": {"$nin": message_ids}}))
+    feedback = list(db.feedback.find({
+        "target_id": {"$in": message_ids + [message["_id"] for message in messages]},
+        "_id": {"$nin": feedback_ids}
+    }))
+    return messages, feedback
+
+
+def _purge_hot_documents(bundle: Dict[str, Any]) -> None:
+    """Delete the archived messages and feedback from the hot collections."""
+    message_ids = [message["_id"] for message in bundle["messages"]]
+    feedback_ids = [feedback["_id"] for feedback in bundle["feedback"]]
+    if message_ids:
+        db.messages.delete_many({"_id": {"$in": message_ids}})
+    if feedback_ids:
+        db.feedback.delete_many({"_id": {"$in": feedback_ids}})
+    db.conversations.update_one({"_id": bundle["_id"]}, {"$unset": {"archive_purge_pending": ""}})
+
+
+def archive_cold_conversations(
+    older_than_days: int = CONVERSATION_ARCHIVE_AFTER_DAYS,
+    batch_size: int = CONVERSATION_ARCHIVE_BATCH_SIZE,
+    now: Optional[datetime] = None
+) -> int:
+    """
+    Archive conversations without activity for older_than_days.
+
+    Purges left unfinished by an interrupted run are completed first.
+    Conversations created before summaries existed have no last_activity_at
+    and are archived once listing them has filled it in.
+
+    Args:
+        older_than_days: Inactivity after which a conversation is archived
+        batch_size: Maximum number of conversations to archive
+        now: Current time (defaults to the current time)
+
+    Returns:
+        int: Number of conversations archived
+    """
+    now = now or datetime.utcnow()
+    ensure_archive_collection()
+
+    for stub in db.conversations.find({"archive_purge_pending": True}, {"_id": 1}):
+        bundle = db[ARCHIVE_COLLECTION].find_one({"_id": stub["_id"]}, {"messages._id": 1, "feedback._id": 1})
+        if not bundle:
+            continue
+        # The run may have stopped before the re-check, and part of the purge
+        # may be done, so late documents are moved into the bundle instead
+        messages, feedback = _find_unarchived_documents(bundle)
+        if messages or feedback:
+            db[ARCHIVE_COLLECTION].update_one(
+                {"_id": stub["_id"]},
+                {"$push": {"messages": {"$each": messages}, "feedback": {"$each": feedback}}}
+            )
+            bundle["messages"] += messages
+            bundle["feedback"] += feedback
+        _purge_hot_documents(bundle)
+
+    cutoff = now - timedelta(days=older_than_days)
+    cold = db.conversations.find(
+        {"last_activity_at": {"$lt": cutoff}, "archived": {"$ne": True}},
+        {"user_id": 1, "last_activity_at": 1}
+    ).sort("last_activity_at", 1).limit(batch_size)
+
+    archived = 0
+    for conversation in cold:
+        try:
+            if archive_conversation(conversation, now):
+                archived += 1
+        except Exception as e:
+            logger.error(f"Error archiving conversation {conversation['_id']}: {str(e)}")
+    return archived
+
+
+async def get_message(message_id: Union[str, ObjectId]) -> Optional[Dict[str, Any]]:
+    """
+    Read a message by _id from the hot collection or, failing that, the archive.
+
+    Args:
+        message_id: The message's _id
+
+    Returns:
+        Optional[Dict[str, Any]]: The message, or None if it does not exist
+    """
+    message = await get_document("messages", message_id)
+    if message is not None:
+        return message
+    return await _find_archived("messages", ObjectId(message_id))
+
+
+async def get_feedback(feedback_id: Union[str, ObjectId]) -> Optional[Dict[str, Any]]:
+    """
+    Read a feedback document by _id from the hot collection or, failing that, the archive.
+
+    Args:
+        feedback_id: The feedback's _id
+
+    Returns:
+        Optional[Dict[str, Any]]: The feedback, or None if it does not exist
+    """
+    feedback = await get_document("feedback", feedback_id)
+    if feedback is not None:
+        return feedback
+    return await _find_archived("feedback", ObjectId(feedback_id))
+
+
+async def _find_archived(field: str, document_id: ObjectId) -> Optional[Dict[str, Any]]:
+    """Find one archived message or feedback document by _id, reading only that element."""
+    bundle = await async_db[ARCHIVE_COLLECTION].find_one(
+        {f"{field}._id": document_id},
+        {field: {"$elemMatch": {"_id": document_id}}}
+    )
+    if not bundle or not bundle.get(field):
+        return None
+    return bundle[field][0]
+
+
+async def get_archived_messages(conversation_id: ObjectId) -> List[Dict[str, Any]]:
+    """
+    Read an archived conversation's messages.
+
+    Args:
+        conversation_id: The conversation's _id
+
+    Returns:
+        List[Dict[str, Any]]: Messages in chronological order (empty if not archived)
+    """
+    bundle = await async_db[ARCHIVE_COLLECTION].find_one({"_id": conversation_id}, {"messages": 1})
+    return bundle["messages"] if bundle else []
+
+
+async def restore_conversation(conversation_id: ObjectId) -> None:
+    """
+    Move an archived conversation back to the hot collections.
+
+    Called before a new message is added to an archived conversation. Safe to
+    repeat after an interruption: documents already restored are skipped.
+
+    Args:
+        conversation_id: The conversation's _id
+    """
+    bundle = await async_db[ARCHIVE_COLLECTION].find_one({"_id": conversation_id})
+    if bundle:
+        for collection in ("messages", "feedback"):
+            if not bundle[collection]:
+                continue
+            try:
+                await async_db[collection].insert_many(bundle[collection], ordered=False)
+            except BulkWriteError as e:
+                if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                    raise
+    await async_db.conversations.update_one(
+        {"_id": conversation_id},
+        {"$unset": {"archived": "", "archived_at": "", "archive_purge_pending": ""}}
+    )
+    forget("conversations", conversation_id)
+    if bundle:
+        await async_db[ARCHIVE_COLLECTION].delete_one({"_id": conversation_id})
+    logger.info(f"Restored archived conversation {conversation_id}")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Archive conversations without recent activity.")
+    parser.add_argument("--days", type=int, default=CONVERSATION_ARCHIVE_AFTER_DAYS, help="Inactivity in days")
+    parser.add_argument("--batch-size", type=int, default=CONVERSATION_ARCHIVE_BATCH_SIZE, help="Conversations per run")
+    args = parser.parse_args()
+
+    archived = archive_cold_conversations(args.days, args.batch_size)
+    logger.info(f"Archived {archived} conversations")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import logging
 from typing import Dict, Any, Optional, List
 
 from app.utils.gemini import generate_response
+from app.utils.llm_metrics import PROMPT_CONVERSATION_REPLY, PROMPT_REFINEMENT
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +38,7 @@ class ConversationGenerator:
             prompt = self._build_response_prompt(context)
             
             # Generate response
-            response = generate_response(prompt)
+            response = generate_response(prompt, prompt_type=PROMPT_CONVERSATION_REPLY)
             
             # Clean up response if needed
             response = response.strip()
@@ -90,7 +91,7 @@ class ConversationGenerator:
             """
             
             # Generate enhanced scenario
-            response = generate_response(prompt)
+            response = generate_response(prompt, prompt_type=PROMPT_REFINEMENT)
             
             # Parse JSON response
             import json
@@ -0,0 +1,234 @@
+"""
+Registry of the MongoDB indexes the application relies on.
+
+INDEXES declares the indexes of every collection and HOT_QUERIES the query
+shapes they exist for. ensure_indexes() creates missing indexes (creating an
+existing one is a no-op) and runs on startup; verify_indexes() explains each
+hot query and flags the ones MongoDB answers with a collection scan.
+
+Usage (from the backend directory):
+    python -m app.utils.db_indexes            # create indexes, then verify
+    python -m app.utils.db_indexes --verify   # only verify
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import ConnectionFailure, PyMongoError
+
+from app.config.database import async_db, close_async_client
+
+logger = logging.getLogger(__name__)
+
+# Create the indexes when the API starts
+DB_ENSURE_INDEXES_ON_STARTUP = os.getenv("DB_ENSURE_INDEXES_ON_STARTUP", "true").lower() == "true"
+# Finished background tasks are removed this long after completion
+SCHEDULED_TASK_RETENTION_DAYS = int(os.getenv("SCHEDULED_TASK_RETENTION_DAYS", "7"))
+# LLM usage rollups are removed this long after their last update
+LLM_USAGE_RETENTION_DAYS = int(os.getenv("LLM_USAGE_RETENTION_DAYS", "400"))
+
+DAY_SECONDS = 24 * 60 * 60
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True)
+    ],
+    "conversations": [
+        IndexModel(
+            [("user_id", ASCENDING), ("started_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_started"
+        ),
+        IndexModel([("last_activity_at", ASCENDING)], name="last_activity_at"),
+        IndexModel([("archive_purge_pending", ASCENDING)], name="archive_purge_pending", sparse=True)
+    ],
+    "conversation_archive": [
+        IndexModel([("messages._id", ASCENDING)], name="message_id"),
+        IndexModel([("feedback._id", ASCENDING)], name="feedback_id")
+    ],
+    "messages": [
+        IndexModel(
+            [("conversation_id", ASCENDING), ("timestamp", ASCENDING), ("_id", ASCENDING)],
+            name="conversation_timestamp_id"
+        )
+    ],
+    "feedback": [
+        IndexModel([("target_id", ASCENDING)], name="target")
+    ],
+    "mistakes": [
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("next_practice_date", ASCENDING)],
+            name="user_status_next_practice"
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("in_drill_queue", ASCENDING), ("next_practice_date", ASCENDING)],
+            name="user_drill_queue_next_practice"
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("type", ASCENDING), ("normalized_text", ASCENDING)],
+            name="user_type_normalized_text_active",
+            unique=True,
+            partialFilterExpression={"active": True}
+        )
+    ],
+    "mistake_stats": [
+        IndexModel([("reconciled_at", ASCENDING)], name="reconciled_at")
+    ],
+    "scheduled_tasks": [
+        IndexModel([("status", ASCENDING), ("scheduled_time", ASCENDING)], name="status_scheduled_time"),
+        IndexModel(
+            [("completed_at", ASCENDING)],
+            name="completed_ttl",
+            expireAfterSeconds=SCHEDULED_TASK_RETENTION_DAYS * DAY_SECONDS
+        )
+    ],
+    "scenarios": [
+        IndexModel([("scenario_key", ASCENDING), ("level", ASCENDING)], name="scenario_key_level")
+    ],
+    "llm_usage_daily": [
+        IndexModel(
+            [("user_id", ASCENDING), ("date", ASCENDING), ("prompt_type", ASCENDING)],
+            name="user_date_prompt_type",
+            unique=True
+        ),
+        IndexModel([("date", ASCENDING), ("cost_usd", DESCENDING)], name="date_cost"),
+        IndexModel(
+            [("updated_at", ASCENDING)],
+            name="updated_ttl",
+            expireAfterSeconds=LLM_USAGE_RETENTION_DAYS * DAY_SECONDS
+        )
+    ]
+}
+
+
+class QueryShape(NamedTuple):
+    """A query the application runs on a hot path, with sample values."""
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[List[Any]] = None
+
+
+HOT_QUERIES: List[QueryShape] = [
+    QueryShape("users", {"email": "user@example.com"}),
+    QueryShape("conversations", {"user_id": ObjectId()}, [("started_at", DESCENDING), ("_id", DESCENDING)]),
+    QueryShape(
+        "conversations",
+        {"last_activity_at": {"$lt": datetime(2000, 1, 1)}, "archived": {"$ne": True}},
+        [("last_activity_at", ASCENDING)]
+    ),
+    QueryShape("conversation_archive", {"messages._id": ObjectId()}),
+    QueryShape("conversation_archive", {"feedback._id": ObjectId()}),
+    QueryShape("messages", {"conversation_id": ObjectId()}, [("timestamp", ASCENDING)]),
+    QueryShape("messages", {"conversation_id": ObjectId()}, [("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    QueryShape("feedback", {"target_id": ObjectId()}),
+    QueryShape("mistakes", {"user_id": ObjectId(), "status": {"$ne": "MASTERED"}}, [("next_practice_date", ASCENDING)]),
+    QueryShape(
+        "mistakes",
+        {"user_id": ObjectId(), "in_drill_queue": True, "next_practice_date": {"$lte": datetime(2000, 1, 1)}},
+        [("next_practice_date", ASCENDING)]
+    ),
+    QueryShape("mistakes", {"user_id": ObjectId(), "type": "GRAMMAR", "normalized_text": "", "active": True}),
+    QueryShape("mistake_stats", {"reconciled_at": {"$lt": datetime(2000, 1, 1)}}, [("reconciled_at", ASCENDING)]),
+    QueryShape("scheduled_tasks", {"scheduled_time": {"$lte": datetime(2000, 1, 1)}, "status": "pending"}),
+    QueryShape("scenarios", {"scenario_key": "", "level": "beginner"}),
+    QueryShape("llm_usage_daily", {"date": "2000-01-01"})
+]
+
+
+def plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """
+    List every stage of an explained query plan.
+
+    Args:
+        plan: A winning plan from explain output (classic or slot-based engine)
+
+    Returns:
+        List[str]: Stage names, outermost first
+    """
+    stages = [plan["stage"]] if "stage" in plan else []
+    for key in ("queryPlan", "inputStage"):
+        if isinstance(plan.get(key), dict):
+            stages.extend(plan_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(plan_stages(child))
+    return stages
+
+
+async def ensure_indexes() -> Dict[str, List[str]]:
+    """
+    Create every declared index that does not exist yet.
+
+    Creating an index that already exists with the same options is a no-op, so
+    this is safe to run on every startup. A collection whose indexes cannot be
+    created (e.g. duplicate emails blocking the unique index) is logged and
+    skipped.
+
+    Returns:
+        Dict[str, List[str]]: Index names per collection that are in place
+    """
+    created: Dict[str, List[str]] = {}
+    for collection, indexes in INDEXES.items():
+        try:
+            created[collection] = await async_db[collection].create_indexes(indexes)
+        except ConnectionFailure as e:
+            logger.error(f"Could not reach the database to create indexes: {str(e)}")
+            break
+        except PyMongoError as e:
+            logger.error(f"Could not create indexes on {collection}: {str(e)}")
+    logger.info(f"Database indexes ensured on {len(created)}/{len(INDEXES)} collections")
+    return created
+
+
+async def verify_indexes() -> List[QueryShape]:
+    """
+    Explain every hot query and flag the ones that scan a whole collection.
+
+    Returns:
+        List[QueryShape]: Queries whose winning plan is a COLLSCAN
+    """
+    unindexed = []
+    for query in HOT_QUERIES:
+        cursor = async_db[query.collection].find(query.filter)
+        if query.sort:
+            cursor = cursor.sort(query.sort)
+        try:
+            explained = await cursor.explain()
+        except PyMongoError as e:
+            logger.warning(f"Could not explain query on {query.collection}: {str(e)}")
+            continue
+        stages = plan_stages(explained.get("queryPlanner", {}).get("winningPlan", {}))
+        if "COLLSCAN" in stages:
+            logger.warning(f"Query on {query.collection} uses no index: filter={query.filter} sort={query.sort}")
+            unindexed.append(query)
+    return unindexed
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Create and verify the application's MongoDB indexes.")
+    parser.add_argument("--verify", action="store_true", help="Only check that hot queries use an index")
+    args = parser.parse_args()
+
+    async def run():
+        try:
+            if not args.verify:
+                await ensure_indexes()
+            return await verify_indexes()
+        finally:
+            await close_async_client()
+
+    unindexed = asyncio.run(run())
+    if unindexed:
+        logger.error(f"{len(unindexed)} hot queries use no index")
+        sys.exit(1)
+    logger.info("All hot queries use an index")
+
+
+if __name__ == "__main__":
+    main()
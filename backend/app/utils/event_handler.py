@@ -1,4 +1,5 @@
 import logging
+import os
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List, Callable
@@ -8,9 +9,16 @@ import queue
 
 from app.config.database import db
 from app.utils.mistake_service import MistakeService
+from app.utils.conversation_archive import CONVERSATION_ARCHIVE_INTERVAL_SECONDS, archive_cold_conversations
+from app.utils.llm_metrics import LLM_USAGE_FLUSH_INTERVAL_SECONDS, llm_metrics
 
 logger = logging.getLogger(__name__)
 
+# How often the worker recounts materialized mistake statistics, and how old
+# a statistics document may get before it is recounted (0 disables)
+MISTAKE_STATS_RECONCILE_INTERVAL_SECONDS = int(os.getenv("MISTAKE_STATS_RECONCILE_INTERVAL_SECONDS", "3600"))
+MISTAKE_STATS_MAX_AGE_SECONDS = int(os.getenv("MISTAKE_STATS_MAX_AGE_SECONDS", "86400"))
+
 # Task queue for background processing
 task_queue = queue.Queue()
 
@@ -28,6 +36,9 @@ class EventHandler:
         self.mistake_service = MistakeService()
         self.running = False
         self.worker_thread = None
+        self.last_stats_reconcile = 0.0
+        self.last_archive_run = 0.0
+        self.last_llm_usage_flush = 0.0
     
     def start(self):
         """Start the background event processing thread."""
@@ -44,6 +55,8 @@ class EventHandler:
         self.running = False
         if self.worker_thread:
             self.worker_thread.join(timeout=5)
+        # Write the LLM usage recorded since the last flush
+        llm_metrics.flush_rollups()
         logger.info("Background event handler stopped")
     
     def on_new_feedback(self, feedback_id: str, user_id: Optional[str] = None, transcription: Optional[str] = None):
@@ -170,12 +183,52 @@ class EventHandler:
         except Exception as e:
             logger.error(f"Error processing queued tasks: {str(e)}")
     
+    def reconcile_mistake_statistics(self):
+        """Recount stale mistake statistics, at most once per reconcile interval."""
+        if MISTAKE_STATS_RECONCILE_INTERVAL_SECONDS <= 0:
+            return
+        if time.monotonic() - self.last_stats_reconcile < MISTAKE_STATS_RECONCILE_INTERVAL_SECONDS:
+            return
+        self.last_stats_reconcile = time.monotonic()
+        
+        try:
+            reconciled = self.mistake_service.reconcile_stale_statistics(MISTAKE_STATS_MAX_AGE_SECONDS)
+            if reconciled:
+                logger.info(f"Reconciled mistake statistics for {reconciled} users")
+        except Exception as e:
+            logger.error(f"Error reconciling mistake statistics: {str(e)}")
+    
+    def archive_cold_conversations(self):
+        """Archive inactive conversations, at most once per archive interval."""
+        if CONVERSATION_ARCHIVE_INTERVAL_SECONDS <= 0:
+            return
+        if time.monotonic() - self.last_archive_run < CONVERSATION_ARCHIVE_INTERVAL_SECONDS:
+            return
+        self.last_archive_run = time.monotonic()
+        
+        try:
+            archived = archive_cold_conversations()
+            if archived:
+                logger.info(f"Archived {archived} inactive conversations")
+        except Exception as e:
+            logger.error(f"Error archiving conversations: {str(e)}")
+    
+    def flush_llm_usage(self):
+        """Write buffered LLM usage rollups, at most once per flush interval."""
+        if time.monotonic() - self.last_llm_usage_flush < LLM_USAGE_FLUSH_INTERVAL_SECONDS:
+            return
+        self.last_llm_usage_flush = time.monotonic()
+        llm_metrics.flush_rollups()
+    
     def _process_queue(self):
         """Worker thread function to process the task queue."""
         while self.running:
             try:
                 # Process database tasks
                 self.process_queued_tasks()
+                self.reconcile_mistake_statistics()
+                self.archive_cold_conversations()
+                self.flush_llm_usage()
                 
                 # Process in-memory queue
                 now = datetime.utcnow()
@@ -0,0 +1,215 @@
+"""
+Batching of background speech feedback generation.
+
+Pending feedback jobs are collected for a short window and sent to Gemini as a
+single multi-item prompt, so the long shared instruction block is paid once per
+batch instead of once per message. Items that cannot be parsed from the batch
+response fall back to individual calls. When the batch call itself fails
+(Gemini errors, deadline, open circuit breaker) the items get fallback feedback
+instead, so an outage is not multiplied into one doomed call per item.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional
+
+from app.models.results.feedback_result import FeedbackResult
+from app.utils.feedback_service import FeedbackService
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_BATCH_MAX_SIZE = int(os.getenv("FEEDBACK_BATCH_MAX_SIZE", "8"))
+FEEDBACK_BATCH_MAX_WAIT_SECONDS = float(os.getenv("FEEDBACK_BATCH_MAX_WAIT_SECONDS", "1.5"))
+FEEDBACK_BATCH_CONCURRENCY = int(os.getenv("FEEDBACK_BATCH_CONCURRENCY", "4"))
+
+
+class FeedbackJob:
+    """
+    A pending request to generate feedback for one user message.
+
+    Attributes:
+        user_id: ID of the user who spoke
+        conversation_id: ID of the conversation, used to build prompt context
+        transcription: Transcribed speech to analyze
+        user_message_id: ID of the message the feedback will be linked to
+    """
+    def __init__(self, user_id: str, conversation_id: str, transcription: str, user_message_id: str):
+        self.user_id = user_id
+        self.conversation_id = conversation_id
+        self.transcription = transcription
+        self.user_message_id = user_message_id
+
+
+class FeedbackBatcher:
+    """
+    Coalesces pending feedback jobs into batched Gemini calls.
+
+    Jobs are queued by the request path and drained by a worker task running on
+    the application's event loop. Blocking work (database access and Gemini
+    calls) runs in worker threads so the loop is never stalled.
+    """
+
+    def __init__(
+        self,
+        feedback_service: Optional[FeedbackService] = None,
+        max_batch_size: int = FEEDBACK_BATCH_MAX_SIZE,
+        max_wait_seconds: float = FEEDBACK_BATCH_MAX_WAIT_SECONDS,
+        concurrency: int = FEEDBACK_BATCH_CONCURRENCY
+    ):
+        self.feedback_service = feedback_service or FeedbackService()
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_seconds
+        self.concurrency = max(1, concurrency)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._in_flight = set()
+        # Jobs taken off the queue for the batch being collected
+        self._pending: List[FeedbackJob] = []
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker task is active."""
+        return self._worker is not None and not self._worker.done()
+
+    def start(self):
+        """Start the batching worker on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Feedback batcher started (max_batch_size={self.max_batch_size}, "
+            f"max_wait={self.max_wait_seconds}s)"
+        )
+
+    async def stop(self):
+        """Stop the worker after flushing jobs that are already queued."""
+        if not self.running:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        # Flush the batch being collected and anything still queued so accepted jobs are not lost
+        remaining, self._pending = self._pending, []
+        while not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        for start in range(0, len(remaining), self.max_batch_size):
+            await asyncio.to_thread(self._process_batch, remaining[start:start + self.max_batch_size])
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        logger.info("Feedback batcher stopped")
+
+    async def submit(self, job: FeedbackJob):
+        """
+        Queue a feedback job.
+
+        If the batcher is not running (e.g. outside the application lifespan),
+        the job is processed immediately on its own.
+
+        Args:
+            job: The feedback job to process
+        """
+        if not self.running:
+            await asyncio.to_thread(self._process_batch, [job])
+            return
+        await self._queue.put(job)
+
+    async def _run(self):
+        """Worker loop: collect jobs into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        while True:
+            # Collected jobs live on self._pending until dispatched, so stop()
+            # can flush them if the worker is cancelled while waiting
+            self._pending.append(await self._queue.get())
+            deadline = loop.time() + self.max_wait_seconds
+
+            while len(self._pending) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await semaphore.acquire()
+            batch, self._pending = self._pending, []
+            task = asyncio.create_task(self._dispatch(batch, semaphore))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: List[FeedbackJob], semaphore: asyncio.Semaphore):
+        """Process one batch in a worker thread and release its concurrency slot."""
+        try:
+            await asyncio.to_thread(self._process_batch, batch)
+        except Exception as e:
+            logger.error(f"Error processing feedback batch: {str(e)}", exc_info=True)
+        finally:
+            semaphore.release()
+
+    def _process_batch(self, batch: List[FeedbackJob]):
+        """
+        Generate and store feedback for a batch of jobs.
+
+        Args:
+            batch: Jobs to process together
+        """
+        contexts: Dict[int, Dict] = {}
+        for index, job in enumerate(batch):
+            try:
+                contexts[index] = self.feedback_service.build_feedback_context(job.conversation_id)
+            except Exception as e:
+                logger.error(f"Error building feedback context for {job.conversation_id}: {str(e)}")
+                contexts[index] = {}
+
+        results: Dict[str, FeedbackResult] = {}
+        if len(batch) > 1:
+            items = [(str(index), job.transcription, contexts[index]) for index, job in enumerate(batch)]
+            # Attribute the batch to a user only when it is not shared between users
+            user_ids = {job.user_id for job in batch}
+            batch_user_id = user_ids.pop() if len(user_ids) == 1 else None
+            try:
+                results = self.feedback_service.generate_batch_feedback(items, user_id=batch_user_id)
+            except ValueError as e:
+                logger.warning(f"Batch feedback for {len(batch)} items could not be parsed, falling back to single calls: {str(e)}")
+            except Exception as e:
+                # Single calls would hit the same failing upstream (or open breaker)
+                logger.error(f"Batch feedback for {len(batch)} items failed, storing fallback feedback: {str(e)}")
+                results = {
+                    str(index): self.feedback_service.generate_fallback_feedback(job.transcription)
+                    for index, job in enumerate(batch)
+                }
+
+            if len(results) < len(batch):
+                logger.info(f"Batch feedback returned {len(results)}/{len(batch)} items")
+
+        for index, job in enumerate(batch):
+            feedback_result = results.get(str(index))
+            if feedback_result is None:
+                # Fall back to an individual call (generate_dual_feedback never raises)
+                feedback_result = self.feedback_service.generate_dual_feedback(
+                    job.transcription, contexts[index], user_id=job.user_id
+                )
+
+            try:
+                self.feedback_service.save_feedback_for_message(
+                    job.user_id,
+                    feedback_result,
+                    job.user_message_id,
+                    transcription=job.transcription,
+                    context=contexts[index]
+                )
+            except Exception as e:
+                logger.error(f"Error storing feedback for message {job.user_message_id}: {str(e)}", exc_info=True)
+
+
+# Create a singleton instance
+feedback_batcher = FeedbackBatcher()
@@ -3,17 +3,18 @@ import logging
 from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
 from bson import ObjectId
-import logging
-from logging.handlers import RotatingFileHandler
 import os
 from pathlib import Path
 import shutil
 from fastapi import UploadFile, File
 # Import Gemini client
 from app.utils.gemini import generate_response
+from app.utils.llm_metrics import PROMPT_DUAL_FEEDBACK
 from app.config.database import db
 from app.models.feedback import Feedback
 from app.models.results.feedback_result import FeedbackResult
+from app.utils.mistake_service import MistakeService
+from app.utils.unit_of_work import UnitOfWork
 
 logger = logging.getLogger(__name__)
 
@@ -22,37 +23,79 @@ UPLOAD_DIR = Path("app/uploads")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 VALID_AUDIO_EXTENSIONS = ['.mp3', '.wav', '.m4a', '.aac', '.ogg', '.flac']
 
-# Only configure if not already configured
-if not logger.handlers:
-    # Create formatter
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
-    # Ensure logs directory exists
-    os.makedirs("app/logs", exist_ok=True)
-    
-    # Create rotating file handler (limits log file size)
-    file_handler = RotatingFileHandler(
-        "app/logs/feedback_service.log", 
-        maxBytes=10485760,  # 10MB
-        backupCount=5
-    )
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(formatter)
-    
-    # Optional: Add console handler for development
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
-    console_handler.setFormatter(formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    # Set logger level
-    logger.setLevel(logging.DEBUG)
+# Deadline for one batched feedback call; batches produce much longer responses
+FEEDBACK_BATCH_TIMEOUT_SECONDS = float(os.getenv("FEEDBACK_BATCH_TIMEOUT_SECONDS", "90"))
+
+# Instruction block shared by single and batched feedback prompts
+FEEDBACK_INSTRUCTIONS = """
+        you are an expert English teacher providing feedback on a student's speech. this feedback will be showned when user click feedback button, dont greet the user or say anything else.
+        Note: because user speech is transcribed from audio, it may not contain punctuation. you do not need comment on this. 
+        Generate  feedback in string format:
+        Hãy đưa ra nhận xét và hướng dẫn như một người bản xứ nói tiếng Anh có thể sử dụng tiếng Việt để giải thích:
+                -Phân tích câu trả lời của người học và chỉ ra các lỗi về ngữ pháp và từ vựng.
+                -Cung cấp gợi ý hoặc ví dụ về cách dùng từ/cụm từ tốt hơn để diễn đạt tự nhiên hơn
+                -Đưa ra 2-3 phiên bản câu hoàn chỉnh hơn, sát với câu gốc nhưng đúng hơn, phù hợp với trình độ người học.
+                -Phân tích cấu trúc ngữ pháp (mental model) của câu ví dụ bạn đưa ra: chỉ ra chủ ngữ, động từ, bổ ngữ, cách dùng mệnh đề phụ (nếu có), và chức năng giao tiếp của từng phần trong câu. ( nhớ so sánh  với câu gốc của người học)
+                -Nếu câu trả lời của người học ngắn, chưa rõ ý, hoặc sai lệch hoàn toàn, hãy đưa ra một câu trả lời mẫu đơn giản hơn để họ có thể hình dung cách diễn đạt đúng, nhưng không nâng cấp quá xa so với trình độ hiện tại của họ.
+"""
+
+# Structured output requested from Gemini: learner-facing text plus the issues
+# MistakeService turns into practice items, so one call serves both.
+_GRAMMAR_ISSUE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "issue": {"type": "string"},
+        "correction": {"type": "string"},
+        "explanation": {"type": "string"},
+        "severity": {"type": "integer"}
+    },
+    "required": ["issue", "correction", "explanation", "severity"]
+}
+
+_VOCABULARY_ISSUE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "original": {"type": "string"},
+        "better_alternative": {"type": "string"},
+        "reason": {"type": "string"},
+        "example_usage": {"type": "string"}
+    },
+    "required": ["original", "better_alternative", "reason"]
+}
+
+FEEDBACK_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "user_feedback": {"type": "string"},
+        "grammar_issues": {"type": "array", "items": _GRAMMAR_ISSUE_SCHEMA},
+        "vocabulary_issues": {"type": "array", "items": _VOCABULARY_ISSUE_SCHEMA}
+    },
+    "required": ["user_feedback", "grammar_issues", "vocabulary_issues"]
+}
 
+BATCH_FEEDBACK_RESPONSE_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "id": {"type": "string"},
+            **FEEDBACK_RESPONSE_SCHEMA["properties"]
+        },
+        "required": ["id"] + FEEDBACK_RESPONSE_SCHEMA["required"]
+    }
+}
+
+# Describes the structured fields; paired with FEEDBACK_RESPONSE_SCHEMA
+FEEDBACK_OUTPUT_INSTRUCTIONS = """
+        Put the feedback described above in "user_feedback".
+        Also list the grammar and vocabulary mistakes in the student's speech, written in English:
+        - "grammar_issues": "issue" is the exact wrong phrase from the speech, "correction" the corrected phrase,
+          "explanation" a short reason, "severity" from 1 (minor) to 5 (serious).
+        - "vocabulary_issues": "original" is the exact word or phrase from the speech, "better_alternative" a more
+          natural choice, "reason" why it is better, "example_usage" a short example sentence.
+        Use empty lists when there are no issues.
+"""
 
-# Add the handler to the logger
 
 class FeedbackService:
     """
@@ -64,6 +107,10 @@ class FeedbackService:
     3. Parse and validate the response from Gemini
     4. Store feedback in the database
     """
+
+    def __init__(self):
+        """Initialize the feedback service."""
+        self.mistake_service = MistakeService()
         
     async def process_speech_feedback(
         self,
@@ -103,63 +150,107 @@ class FeedbackService:
             - Triggers mistake extraction for learning purposes
         """
         try:
-            # Initialize services
-            from app.utils.feedback_service import FeedbackService
-            from app.utils.event_handler import event_handler
-            from app.models.results.feedback_result import FeedbackResult
-            
-            
-            # Fetch conversation context
-            context = {}
-            conversation = db.conversations.find_one({"_id": ObjectId(conversation_id)})
-            if conversation:
-                # Fetch messages to build context
-                messages = list(db.messages.find({"conversation_id": ObjectId(conversation_id)})
-                            .sort("timestamp", 1)
-                            .limit(10))
-                
-                # Format previous exchanges
-                previous_exchanges = []
-                for msg in messages:
-                    sender = "User" if msg.get("sender") == "user" else "AI"
-                    previous_exchanges.append(f"{sender}: {msg.get('content', '')}")
-                
-               
-                context = {
-                    "user_role": conversation.get("user_role", "Student"),
-                    "ai_role": conversation.get("ai_role", "Teacher"),
-                    "situation": conversation.get("situation", "General conversation"),
-                    "previous_exchanges": "\n".join(previous_exchanges)
-                }
+            context = self.build_feedback_context(conversation_id)
+
             # Generate feedback
             try:
-                feedback_result = self.generate_dual_feedback(transcription, context)
+                feedback_result = self.generate_dual_feedback(transcription, context, user_id=user_id)
             except Exception as e:
                 logger.error(f"Error generating feedback: {str(e)}", exc_info=True)
                 # Create a fallback feedback result
                 feedback_result = FeedbackResult(
                     user_feedback="Unable to generate detailed feedback at this time."
                 )
+
+            self.save_feedback_for_message(user_id, feedback_result, user_message_id, transcription, context)
+
+        except Exception as e:
+            logger.error(f"Error processing speech feedback in background: {str(e)}", exc_info=True)
+
+    def build_feedback_context(self, conversation_id: str) -> Dict[str, Any]:
+        """
+        Build the conversation context used in feedback prompts.
+        
+        Args:
+            conversation_id: ID of the conversation the speech belongs to
             
-            # Store feedback
-            feedback_id = self.store_feedback(
-                user_id, 
-                feedback_result, 
-                user_message_id,
-                transcription=transcription
-            )
+        Returns:
+            Dictionary with user_role, ai_role, situation and previous_exchanges,
+            or an empty dictionary if the conversation does not exist
+        """
+        conversation = db.conversations.find_one({"_id": ObjectId(conversation_id)})
+        if not conversation:
+            return {}
+
+        # Fetch messages to build context
+        messages = list(db.messages.find({"conversation_id": ObjectId(conversation_id)})
+                    .sort("timestamp", 1)
+                    .limit(10))
+
+        # Format previous exchanges
+        previous_exchanges = []
+        for msg in messages:
+            sender = "User" if msg.get("sender") == "user" else "AI"
+            previous_exchanges.append(f"{sender}: {msg.get('content', '')}")
+
+        return {
+            "user_role": conversation.get("user_role", "Student"),
+            "ai_role": conversation.get("ai_role", "Teacher"),
+            "situation": conversation.get("situation", "General conversation"),
+            "previous_exchanges": "\n".join(previous_exchanges)
+        }
+
+    def save_feedback_for_message(
+        self,
+        user_id: str,
+        feedback_result: FeedbackResult,
+        user_message_id: str,
+        transcription: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Store feedback, link it to the user's message and record its mistakes.
+        
+        The structured issues returned with the feedback are passed straight to
+        the mistake service, so no second LLM call is needed for extraction.
+        
+        Args:
+            user_id: ID of the user who received the feedback
+            feedback_result: Generated feedback
+            user_message_id: ID of the message the feedback belongs to
+            transcription: Optional transcription text
+            context: Optional conversation context, stored with each mistake
             
-            # Link feedback to message
-            if feedback_id:
-                db.messages.update_one(
-                    {"_id": ObjectId(user_message_id)},
-                    {"$set": {"feedback_id": feedback_id}}
+        Returns:
+            ID of the stored feedback, or None if nothing was stored
+        """
+        # Store the feedback and link it to the message together
+        uow = UnitOfWork()
+        feedback_id = self.store_feedback(
+            user_id,
+            feedback_result,
+            user_message_id,
+            transcription=transcription,
+            uow=uow
+        )
+        uow.update(
+            "messages",
+            {"_id": ObjectId(user_message_id)},
+            {"$set": {"feedback_id": feedback_id}}
+        )
+        uow.commit_blocking()
+
+        if feedback_result.grammar_issues or feedback_result.vocabulary_issues:
+            try:
+                self.mistake_service.process_feedback_for_mistakes(
+                    user_id=user_id,
+                    transcription=transcription or "",
+                    feedback=feedback_result.to_dict(),
+                    context=context
                 )
-                
-            
-                
-        except Exception as e:
-            logger.error(f"Error processing speech feedback in background: {str(e)}", exc_info=True)
+            except Exception as e:
+                logger.error(f"Error storing mistakes for feedback {feedback_id}: {str(e)}", exc_info=True)
+        return feedback_id
 
     async def save_audio_file(self,file: UploadFile, user_id: str) -> str:
         """
@@ -197,7 +288,8 @@ class FeedbackService:
     def generate_dual_feedback(
         self, 
         transcription: str, 
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None
     ) -> FeedbackResult:
         """
         Generate user-friendly feedback for speech using Gemini.
@@ -205,55 +297,137 @@ class FeedbackService:
         Args:
             transcription: Transcribed text from the user's speech
             context: Optional conversation context information
+            user_id: ID of the user who spoke, for usage tracking
             
         Returns:
-            FeedbackResult containing user_feedback
+            FeedbackResult containing user_feedback and the structured
+            grammar_issues / vocabulary_issues used for mistake extraction
         """
         try:
             
             # Build prompt for dual feedback
             prompt = self._build_dual_feedback_prompt(transcription, context)
 
-
-            # Call Gemini API   
-            gemini_response = generate_response(prompt)
-                        # Clean the response text by removing markdown formatting
-            cleaned_text = gemini_response.strip()
-            if cleaned_text.startswith("```json"):
-                cleaned_text = cleaned_text[7:]  # Remove ```json prefix
-            if cleaned_text.endswith("```"):
-                cleaned_text = cleaned_text[:-3]  # Remove ``` suffix
-            cleaned_text = cleaned_text.strip()
-            # parse the json
-            
+            # Call Gemini API with a structured response schema
+            gemini_response = generate_response(
+                prompt,
+                response_schema=FEEDBACK_RESPONSE_SCHEMA,
+                prompt_type=PROMPT_DUAL_FEEDBACK,
+                user_id=user_id
+            )
+            cleaned_text = self._strip_code_fence(gemini_response)
 
             # Parse JSON response
-            
             try:
-               
+                data = json.loads(cleaned_text)
+                result = self._feedback_result_from_dict(data)
+                if result is None:
+                    raise ValueError("Response has no user_feedback")
+                return result
                 
-            
-                # Create and return FeedbackResult
-                return FeedbackResult(
-                    user_feedback=cleaned_text
-                )
-                
-            except json.JSONDecodeError as e:
+            except (json.JSONDecodeError, ValueError) as e:
                 logger.error(f"Failed to parse Gemini response as JSON: {e}")
-                logger.debug(f"Raw response: {cleaned_text}")
+                logger.debug("Unparsed feedback response", extra={"payload": cleaned_text})
+                if cleaned_text and not cleaned_text.startswith(("{", "[")):
+                    # Plain-text answer: still usable for the learner, just without issues
+                    return FeedbackResult(user_feedback=cleaned_text)
                 # Fall back to basic feedback
-                return self._generate_fallback_feedback(transcription)
+                return self.generate_fallback_feedback(transcription)
                 
         except Exception as e:
             logger.error(f"Error generating feedback: {str(e)}")
-            return self._generate_fallback_feedback(transcription)
+            return self.generate_fallback_feedback(transcription)
+
+    def generate_batch_feedback(
+        self,
+        items: List[Tuple[str, str, Optional[Dict[str, Any]]]],
+        user_id: Optional[str] = None
+    ) -> Dict[str, FeedbackResult]:
+        """
+        Generate feedback for several speeches with a single Gemini call.
+        
+        The shared instruction block is sent once for the whole batch; each item
+        carries only its own context and transcription.
+        
+        Args:
+            items: List of (item_id, transcription, context) tuples
+            user_id: ID of the user the batch is attributed to for usage tracking,
+                or None when it mixes several users
+            
+        Returns:
+            Mapping of item_id to FeedbackResult for every item Gemini answered.
+            Items missing from the response are left out so the caller can retry them.
+            
+        Raises:
+            ValueError: If the response cannot be parsed as a JSON list of items
+        """
+        prompt = self._build_batch_feedback_prompt(items)
+        gemini_response = generate_response(
+            prompt,
+            timeout=FEEDBACK_BATCH_TIMEOUT_SECONDS,
+            response_schema=BATCH_FEEDBACK_RESPONSE_SCHEMA,
+            prompt_type=PROMPT_DUAL_FEEDBACK,
+            user_id=user_id
+        )
+
+        try:
+            parsed = json.loads(self._strip_code_fence(gemini_response))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Batch feedback response is not valid JSON: {e}")
+        if not isinstance(parsed, list):
+            raise ValueError("Batch feedback response is not a JSON list")
+
+        expected_ids = {item_id for item_id, _, _ in items}
+        results = {}
+        for entry in parsed:
+            if not isinstance(entry, dict):
+                continue
+            item_id = str(entry.get("id", ""))
+            result = self._feedback_result_from_dict(entry)
+            if item_id in expected_ids and result is not None:
+                results[item_id] = result
+        return results
+
+    def _strip_code_fence(self, text: str) -> str:
+        """Remove a surrounding ```json markdown fence from a Gemini response."""
+        cleaned_text = text.strip()
+        if cleaned_text.startswith("```json"):
+            cleaned_text = cleaned_text[7:]  # Remove ```json prefix
+        if cleaned_text.endswith("```"):
+            cleaned_text = cleaned_text[:-3]  # Remove ``` suffix
+        return cleaned_text.strip()
+
+    def _feedback_result_from_dict(self, data: Any) -> Optional[FeedbackResult]:
+        """
+        Build a FeedbackResult from one structured feedback object.
+        
+        Args:
+            data: Parsed JSON object following FEEDBACK_RESPONSE_SCHEMA
+            
+        Returns:
+            FeedbackResult, or None if the object has no usable user_feedback
+        """
+        if not isinstance(data, dict):
+            return None
+        user_feedback = data.get("user_feedback")
+        if not isinstance(user_feedback, str) or not user_feedback.strip():
+            return None
+
+        grammar_issues = [i for i in data.get("grammar_issues") or [] if isinstance(i, dict)]
+        vocabulary_issues = [i for i in data.get("vocabulary_issues") or [] if isinstance(i, dict)]
+        return FeedbackResult(
+            user_feedback=user_feedback.strip(),
+            grammar_issues=grammar_issues,
+            vocabulary_issues=vocabulary_issues
+        )
 
     def store_feedback(
         self, 
         user_id: str, 
         feedback_data: Union[FeedbackResult, Dict[str, Any]], 
         user_message_id: Optional[str] = None, 
-        transcription: Optional[str] = None
+        transcription: Optional[str] = None,
+        uow: Optional[UnitOfWork] = None
     ) -> str:
         """
         Store feedback in the database.
@@ -263,6 +437,7 @@ class FeedbackService:
             feedback_data: Feedback data to store (FeedbackResult or dict)
             conversation_id: Optional ID of the associated conversation
             transcription: Optional transcription text
+            uow: Optional unit of work to queue the insert on; the caller commits it
             
         Returns:
             ID of the stored feedback
@@ -284,10 +459,9 @@ class FeedbackService:
             
             # Process feedback data based on type
             if isinstance(feedback_data, FeedbackResult):
-                user_feedback = feedback_data.user_feedback
-            else:
-                user_feedback = feedback_data.get("user_feedback", "")
-                
+                feedback_data = feedback_data.to_dict()
+            user_feedback = feedback_data.get("user_feedback", "")
+
             
             
             # Create feedback model with explicit user_id and transcription
@@ -297,47 +471,38 @@ class FeedbackService:
                 target_type="message" if user_message_id else "conversation",
                 transcription=transcription,
                 user_feedback=user_feedback,
+                grammar_issues=feedback_data.get("grammar_issues"),
+                vocabulary_issues=feedback_data.get("vocabulary_issues"),
             )
             
             # Insert feedback into database
-            result = db.feedback.insert_one(feedback.to_dict())
-            
-            # If associated with a conversation, update the conversation record
-            if user_message_id:
-                db.conversations.update_one(
-                    {"_id": ObjectId(user_message_id)},
-                    {"$push": {"feedback_ids": str(result.inserted_id)}}
-                )
+            if uow is None:
+                db.feedback.insert_one(feedback.to_dict())
+            else:
+                uow.insert("feedback", feedback.to_dict())
             
             # Return the feedback ID as a string
-            return str(result.inserted_id)
+            return str(feedback._id)
                 
         except Exception as e:
             logger.error(f"Error storing feedback: {str(e)}")
             raise Exception(f"Failed to store feedback: {str(e)}")
 
-    def _build_dual_feedback_prompt(
-        self, 
-        transcription: str, 
-        context: Optional[Dict[str, Any]] = None
-    ) -> str:
+    def _build_context_block(self, context: Optional[Dict[str, Any]] = None) -> str:
         """
-        Build prompt for generating user feedback.
+        Build the conversation context section of a feedback prompt.
         
         Args:
-            transcription: Transcribed text from the user's speech
             context: Optional conversation context information
             
         Returns:
-            Formatted prompt string for Gemini
+            Context section, or an empty string when no context is available
         """
-        prompt = ""
-        previous_exchanges =  f"""  \"\"\"{context.get('previous_exchanges', 'No previous exchanges')  }\"\"\"  """
+        if not context:
+            return ""
 
-        
-        # Add context if available
-        if context:
-            prompt += f"""
+        previous_exchanges =  f"""  \"\"\"{context.get('previous_exchanges', 'No previous exchanges')  }\"\"\"  """
+        return f"""
             Context:
             - User role: {context.get('user_role', 'Student')}
             - AI role: {context.get('ai_role', 'Teacher')}
@@ -346,22 +511,66 @@ class FeedbackService:
             Previous exchanges:
              {previous_exchanges}
             """
+
+    def _build_batch_feedback_prompt(
+        self,
+        items: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> str:
+        """
+        Build one prompt asking for feedback on several independent speeches.
         
+        Args:
+            items: List of (item_id, transcription, context) tuples
+            
+        Returns:
+            Formatted prompt string for Gemini
+        """
+        item_blocks = []
+        for item_id, transcription, context in items:
+            item_blocks.append(f"""
+        ### Item id: {item_id}
+        {self._build_context_block(context)}
+        Current student's speech: "{transcription}"
+        """)
+
+        prompt = f"""
+{FEEDBACK_INSTRUCTIONS}
+        You will receive {len(items)} independent student answers below. Apply the instructions above to each item separately,
+        using only that item's own context and speech.
+
+{FEEDBACK_OUTPUT_INSTRUCTIONS}
+        Return ONLY a JSON array with exactly one object per item. Each object has the item's "id"
+        plus the "user_feedback", "grammar_issues" and "vocabulary_issues" fields for that item.
+        {"".join(item_blocks)}
+        """
+        logger.debug(f"Generated batch feedback prompt for {len(items)} items ({len(prompt)} chars)")
+        return prompt
+
+    def _build_dual_feedback_prompt(
+        self, 
+        transcription: str, 
+        context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Build prompt for generating user feedback.
+        
+        Args:
+            transcription: Transcribed text from the user's speech
+            context: Optional conversation context information
+            
+        Returns:
+            Formatted prompt string for Gemini
+        """
+        # Add context if available
+        prompt = self._build_context_block(context)
+
         # Add user role and AI role        
         # Add transcription
         prompt += f"""
         Current student's speech: "{transcription}"
-        you are an expert English teacher providing feedback on a student's speech. this feedback will be showned when user click feedback button, dont greet the user or say anything else.
-        Note: because user speech is transcribed from audio, it may not contain punctuation. you do not need comment on this. 
-        Generate  feedback in string format:
-        Hãy đưa ra nhận xét và hướng dẫn như một người bản xứ nói tiếng Anh có thể sử dụng tiếng Việt để giải thích:
-                -Phân tích câu trả lời của người học và chỉ ra các lỗi về ngữ pháp và từ vựng.
-                -Cung cấp gợi ý hoặc ví dụ về cách dùng từ/cụm từ tốt hơn để diễn đạt tự nhiên hơn
-                -Đưa ra 2-3 phiên bản câu hoàn chỉnh hơn, sát với câu gốc nhưng đúng hơn, phù hợp với trình độ người học.
-                -Phân tích cấu trúc ngữ pháp (mental model) của câu ví dụ bạn đưa ra: chỉ ra chủ ngữ, động từ, bổ ngữ, cách dùng mệnh đề phụ (nếu có), và chức năng giao tiếp của từng phần trong câu. ( nhớ so sánh  với câu gốc của người học)
-                -Nếu câu trả lời của người học ngắn, chưa rõ ý, hoặc sai lệch hoàn toàn, hãy đưa ra một câu trả lời mẫu đơn giản hơn để họ có thể hình dung cách diễn đạt đúng, nhưng không nâng cấp quá xa so với trình độ hiện tại của họ.
-            
-        Return only the feedback string 
+{FEEDBACK_INSTRUCTIONS}
+{FEEDBACK_OUTPUT_INSTRUCTIONS}
+        Return only the JSON object.
         
         """
         # prompt += f"""
@@ -403,10 +612,10 @@ class FeedbackService:
 
         # Return ONLY the feedback string.
         # """
-        logger.info(f"Generated prompt for Gemini: {prompt}")
+        logger.debug(f"Generated feedback prompt ({len(prompt)} chars)", extra={"payload": prompt})
         return prompt
 
-    def _generate_fallback_feedback(self, transcription: str) -> FeedbackResult:
+    def generate_fallback_feedback(self, transcription: str) -> FeedbackResult:
         """
         Generate fallback feedback when the API call fails.
         
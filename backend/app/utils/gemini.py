@@ -1,7 +1,13 @@
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 import os
+import time
+from typing import Any, Dict, Optional
 from dotenv import load_dotenv
 
+from app.utils.llm_metrics import extract_token_counts, llm_metrics
+from app.utils.resilience import CircuitBreaker, ResilientCaller
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -17,10 +23,59 @@ genai.configure(api_key=api_key)
 # Initialize the Gemini model
 model = genai.GenerativeModel("gemini-2.0-flash")
 
-def generate_response(prompt: str):
+# Resilience settings for Gemini calls
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "30"))
+GEMINI_MAX_ATTEMPTS = int(os.getenv("GEMINI_MAX_ATTEMPTS", "3"))
+GEMINI_BREAKER_THRESHOLD = int(os.getenv("GEMINI_BREAKER_THRESHOLD", "5"))
+GEMINI_BREAKER_RECOVERY_SECONDS = float(os.getenv("GEMINI_BREAKER_RECOVERY_SECONDS", "30"))
+GEMINI_HEDGE_ENABLED = os.getenv("GEMINI_HEDGE_ENABLED", "false").lower() == "true"
+
+# Errors worth retrying: rate limiting, transient server failures and timeouts
+RETRYABLE_ERRORS = (
+    TimeoutError,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+)
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Return True for errors that a repeated call may succeed on."""
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+gemini_caller = ResilientCaller(
+    name="gemini",
+    timeout=GEMINI_TIMEOUT_SECONDS,
+    max_attempts=GEMINI_MAX_ATTEMPTS,
+    is_retryable=_is_retryable,
+    breaker=CircuitBreaker(
+        "gemini",
+        failure_threshold=GEMINI_BREAKER_THRESHOLD,
+        recovery_timeout=GEMINI_BREAKER_RECOVERY_SECONDS
+    ),
+    hedge=GEMINI_HEDGE_ENABLED
+)
+
+
+def generate_response(
+    prompt: str,
+    timeout: Optional[float] = None,
+    response_schema: Optional[Dict[str, Any]] = None,
+    prompt_type: Optional[str] = None,
+    user_id: Optional[str] = None
+):
     """
     Generate a response from the Gemini AI model based on the provided prompt.
     
+    The call is bounded by a deadline, retried with jittered exponential backoff
+    on retryable errors, guarded by a circuit breaker and, when GEMINI_HEDGE_ENABLED
+    is set, hedged with a second request once it runs past the recent p95 latency.
+    
     Args:
         prompt (str): The input text prompt to generate a response for.
             Sample input:
@@ -29,6 +84,14 @@ def generate_response(prompt: str):
              Here's the conversation so far:
              user: Tell me about your experience with Python
              Respond as an experienced interviewer."
+        timeout (Optional[float]): Overall deadline in seconds for all attempts.
+            Defaults to GEMINI_TIMEOUT_SECONDS.
+        response_schema (Optional[Dict[str, Any]]): JSON schema for structured output.
+            When given, Gemini is asked for an application/json response matching it.
+        prompt_type (Optional[str]): Prompt type tag used for instrumentation,
+            e.g. llm_metrics.PROMPT_REFINEMENT.
+        user_id (Optional[str]): ID of the user the call is made for, used for
+            the per-user daily usage rollup.
     
     Returns:
         str: The generated response text from the Gemini model.
@@ -39,8 +102,50 @@ def generate_response(prompt: str):
              Would you like me to elaborate on any specific aspect of my Python experience?"
         
     Raises:
-        Exception: If there are any issues with the API call or response generation.
+        CircuitOpenError: If recent calls kept failing and the circuit is open.
+        DeadlineExceededError: If no attempt completed within the deadline.
+        Exception: If there are any other issues with the API call or response generation.
     """
-    response = model.generate_content(prompt)
-    return response.text
+    generation_config = None
+    if response_schema is not None:
+        generation_config = {
+            "response_mime_type": "application/json",
+            "response_schema": response_schema
+        }
+
+    def _call(remaining: float):
+        return model.generate_content(
+            prompt,
+            generation_config=generation_config,
+            request_options={"timeout": remaining}
+        )
+
+    retries = []
+    started = time.monotonic()
+    try:
+        response = gemini_caller.call(
+            _call,
+            timeout=timeout,
+            on_retry=lambda attempt, error: retries.append(attempt)
+        )
+        text = response.text
+    except Exception as e:
+        llm_metrics.record(
+            prompt_type,
+            time.monotonic() - started,
+            retries=len(retries),
+            error=e,
+            user_id=user_id
+        )
+        raise
 
+    input_tokens, output_tokens = extract_token_counts(response)
+    llm_metrics.record(
+        prompt_type,
+        time.monotonic() - started,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        retries=len(retries),
+        user_id=user_id
+    )
+    return text
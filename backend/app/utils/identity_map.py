@@ -0,0 +1,126 @@
+"""
+Request-scoped identity map for MongoDB documents.
+
+Within one HTTP request a document is read from the database at most once:
+get_document() looks it up by (collection, _id) in a map that lives for the
+duration of the request, and later reads of the same document get the same
+dict back. Documents loaded some other way (e.g. the user found by email
+during authentication, or documents just inserted) are added with
+remember(), and writes drop the stale entry with forget().
+
+Reads outside a request (workers, scripts) are not cached.
+
+    message = await get_document("messages", message_id)
+    conversation = await get_document("conversations", message["conversation_id"], projection("voice_type"))
+"""
+
+from contextvars import ContextVar
+from typing import Any, Dict, FrozenSet, Optional, Tuple, Union
+
+from bson import ObjectId
+
+from app.config.database import async_db
+
+# (collection, _id) -> (document, fields it was read with; None for the whole document)
+CacheEntry = Tuple[Dict[str, Any], Optional[FrozenSet[str]]]
+
+_documents: ContextVar[Optional[Dict[Tuple[str, ObjectId], CacheEntry]]] = ContextVar(
+    "identity_map_documents", default=None
+)
+
+
+def projection(*fields: str) -> Dict[str, int]:
+    """
+    Build a projection reading only the given fields (and _id).
+
+    Args:
+        *fields: Field names to read
+
+    Returns:
+        Dict[str, int]: Projection for find/find_one
+    """
+    return {field: 1 for field in fields}
+
+
+def _key(collection: str, document_id: Union[str, ObjectId]) -> Tuple[str, ObjectId]:
+    return collection, document_id if isinstance(document_id, ObjectId) else ObjectId(document_id)
+
+
+async def get_document(
+    collection: str,
+    document_id: Union[str, ObjectId],
+    fields: Optional[Dict[str, int]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Read a document by _id, at most once per request.
+
+    A cached document satisfies the read if it holds every requested field; a
+    narrower cached read is widened by fetching the document again. The
+    returned dict is shared by every reader in the request, so callers must
+    not modify it.
+
+    Args:
+        collection: Collection name
+        document_id: The document's _id (ObjectId or its string form)
+        fields: Optional projection built with projection()
+
+    Returns:
+        Optional[Dict[str, Any]]: The document (possibly with more fields than
+            requested), or None if it does not exist
+    """
+    key = _key(collection, document_id)
+    wanted = frozenset(fields) if fields else None
+    documents = _documents.get()
+
+    if documents is not None and key in documents:
+        document, cached = documents[key]
+        if cached is None or (wanted is not None and wanted <= cached):
+            return document
+
+    document = await async_db[collection].find_one({"_id": key[1]}, fields)
+    if documents is not None and document is not None:
+        documents[key] = (document, wanted)
+    return document
+
+
+def remember(collection: str, document: Dict[str, Any]) -> None:
+    """
+    Add a whole document loaded elsewhere to the current request's map.
+
+    Args:
+        collection: Collection name
+        document: The complete document, including _id
+    """
+    documents = _documents.get()
+    if documents is not None:
+        documents[_key(collection, document["_id"])] = (document, None)
+
+
+def forget(collection: str, document_id: Union[str, ObjectId]) -> None:
+    """
+    Drop a document from the current request's map after writing to it.
+
+    Args:
+        collection: Collection name
+        document_id: The document's _id
+    """
+    documents = _documents.get()
+    if documents is not None:
+        documents.pop(_key(collection, document_id), None)
+
+
+class IdentityMapMiddleware:
+    """ASGI middleware giving every HTTP request its own identity map."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _documents.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _documents.reset(token)
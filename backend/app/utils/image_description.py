@@ -1,7 +1,11 @@
 
 import os 
+import time
+from typing import Optional
 from google import genai
 
+from app.utils.llm_metrics import PROMPT_IMAGE_DESCRIPTION, extract_token_counts, llm_metrics
+
 
 GOOGLE_API_KEY = os.getenv("GEMINI_API_KEY")
 client = genai.Client(api_key=GOOGLE_API_KEY)
@@ -31,12 +35,14 @@ fluency. The output should be a direct description, not a story or interpretatio
 
 
 
-def get_image_description(image_path:str = None) -> str:
+def get_image_description(image_path:str = None, user_id: Optional[str] = None) -> str:
     """
     Get a detailed description of the image using Google GenAI.
     
     Args:
         image_path (str): Path to the image file.
+        user_id (Optional[str]): ID of the user the description is generated for,
+            for usage tracking.
         
     Returns:
         str: Detailed description of the image.
@@ -44,15 +50,29 @@ def get_image_description(image_path:str = None) -> str:
     if not image_path:
         raise ValueError("Image path must be provided.")
     
-    # Upload the image
-    my_file = client.files.upload(file=image_path)
+    started = time.monotonic()
+    try:
+        # Upload the image
+        my_file = client.files.upload(file=image_path)
+        
+        # Generate content
+        response = client.models.generate_content(
+            model="gemini-2.0-flash",
+            contents=[my_file, prompt],
+        )
+        text = response.text
+    except Exception as e:
+        llm_metrics.record(PROMPT_IMAGE_DESCRIPTION, time.monotonic() - started, error=e, user_id=user_id)
+        raise
     
-    # Generate content
-    response = client.models.generate_content(
-        model="gemini-2.0-flash",
-        contents=[my_file, prompt],
+    input_tokens, output_tokens = extract_token_counts(response)
+    llm_metrics.record(
+        PROMPT_IMAGE_DESCRIPTION,
+        time.monotonic() - started,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        user_id=user_id
     )
-    
-    return response.text
+    return text
 
 
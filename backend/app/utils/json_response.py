@@ -0,0 +1,60 @@
+"""
+Fast JSON responses for MongoDB documents.
+
+MongoJSONResponse is the application's default response class: it serializes
+with orjson, which encodes datetimes natively, and turns ObjectIds into
+strings, so handlers can return documents without converting them.
+
+Routes with a response schema return model_response(Schema, data) instead of
+letting FastAPI validate the result, dump it to Python objects and encode
+those again: the document is validated once against a cached TypeAdapter and
+written to JSON bytes by pydantic-core directly.
+"""
+
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+
+def _default(value: Any) -> Any:
+    """Encode the types orjson does not know natively."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class MongoJSONResponse(ORJSONResponse):
+    """orjson response that also encodes ObjectIds and pydantic models."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema: Any) -> TypeAdapter:
+    """Return the TypeAdapter of a schema, built once per schema."""
+    return TypeAdapter(schema)
+
+
+def model_response(schema: Any, content: Any, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    """
+    Validate content against a response schema and serialize it in one pass.
+
+    Args:
+        schema: Response schema (a pydantic model or any type TypeAdapter accepts)
+        content: Data to validate, e.g. MongoDB documents
+        status_code: HTTP status of the response
+        headers: Optional extra response headers
+
+    Returns:
+        Response: JSON response with the schema's serialization of content
+    """
+    adapter = type_adapter(schema)
+    body = adapter.dump_json(adapter.validate_python(content))
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,361 @@
+"""
+Instrumentation for LLM calls.
+
+Every Gemini call is tagged with a prompt type and recorded here with its
+latency, token counts, retries and outcome. Process-wide histograms are kept in
+memory for the metrics endpoint, and token/cost totals are rolled up per user
+and per day in the `llm_usage_daily` collection.
+
+Recording a call never touches the database: rollup deltas are accumulated in
+memory and written in one bulk upsert by flush_rollups(), which the background
+event handler calls every LLM_USAGE_FLUSH_INTERVAL_SECONDS and on shutdown.
+"""
+
+import asyncio
+import bisect
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.config.database import async_db, db
+
+logger = logging.getLogger(__name__)
+
+# Prompt types
+PROMPT_REFINEMENT = "refinement"
+PROMPT_CONVERSATION_REPLY = "conversation_reply"
+PROMPT_DUAL_FEEDBACK = "dual_feedback"
+PROMPT_IMAGE_DESCRIPTION = "image_description"
+PROMPT_IMAGE_FEEDBACK = "image_feedback"
+PROMPT_UNTAGGED = "untagged"
+
+# Gemini 2.0 Flash list prices in USD per million tokens
+GEMINI_INPUT_COST_PER_MILLION = float(os.getenv("GEMINI_INPUT_COST_PER_MILLION", "0.10"))
+GEMINI_OUTPUT_COST_PER_MILLION = float(os.getenv("GEMINI_OUTPUT_COST_PER_MILLION", "0.40"))
+LLM_USAGE_ROLLUPS_ENABLED = os.getenv("LLM_USAGE_ROLLUPS_ENABLED", "true").lower() == "true"
+# How often buffered usage rollups are written to llm_usage_daily
+LLM_USAGE_FLUSH_INTERVAL_SECONDS = float(os.getenv("LLM_USAGE_FLUSH_INTERVAL_SECONDS", "10"))
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with cumulative bucket counts, sum and count.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add an observation."""
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """
+        Estimate a quantile as the upper bound of the bucket that contains it.
+
+        Args:
+            fraction: Quantile as a fraction, e.g. 0.95 for p95
+
+        Returns:
+            The bucket bound, None if empty, or inf if it falls past the last bucket
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self._counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return cumulative bucket counts in Prometheus style."""
+        cumulative = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets, self._counts):
+            running += bucket_count
+            cumulative.append({"le": bound, "count": running})
+        cumulative.append({"le": "+Inf", "count": self.count})
+        return {
+            "buckets": cumulative,
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99)
+        }
+
+
+class _PromptTypeStats:
+    """Aggregated statistics for one prompt type."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.retries = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost_usd = 0.0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.input_token_histogram = Histogram(TOKEN_BUCKETS)
+        self.output_token_histogram = Histogram(TOKEN_BUCKETS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": dict(self.errors),
+            "error_count": sum(self.errors.values()),
+            "retries": self.retries,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "latency_seconds": self.latency.to_dict(),
+            "input_tokens_per_call": self.input_token_histogram.to_dict(),
+            "output_tokens_per_call": self.output_token_histogram.to_dict()
+        }
+
+
+def estimate_cost(input_tokens: int, output_tokens: int) -> float:
+    """
+    Estimate the cost of a call in USD.
+
+    Args:
+        input_tokens: Prompt token count
+        output_tokens: Generated token count
+
+    Returns:
+        Estimated cost in USD
+    """
+    return (
+        input_tokens * GEMINI_INPUT_COST_PER_MILLION
+        + output_tokens * GEMINI_OUTPUT_COST_PER_MILLION
+    ) / 1_000_000
+
+
+def extract_token_counts(response: Any) -> Tuple[int, int]:
+    """
+    Read token counts from a Gemini response.
+
+    Works for both google.generativeai and google.genai responses, which expose
+    the same `usage_metadata` field names.
+
+    Args:
+        response: Response object returned by generate_content
+
+    Returns:
+        (input_tokens, output_tokens), zeros if the response has no usage data
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return 0, 0
+    return (
+        int(getattr(usage, "prompt_token_count", 0) or 0),
+        int(getattr(usage, "candidates_token_count", 0) or 0)
+    )
+
+
+# (user_id, date, prompt_type) of a daily usage document
+RollupKey = Tuple[Optional[str], str, str]
+
+
+class LLMMetrics:
+    """
+    Collects per-prompt-type histograms and per-user daily usage rollups.
+    """
+
+    def __init__(self, rollups_enabled: bool = LLM_USAGE_ROLLUPS_ENABLED):
+        self.rollups_enabled = rollups_enabled
+        self.started_at = datetime.utcnow()
+        self._stats: Dict[str, _PromptTypeStats] = {}
+        # Rollup deltas not yet written to llm_usage_daily
+        self._pending_rollups: Dict[RollupKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        prompt_type: Optional[str],
+        latency: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        retries: int = 0,
+        error: Optional[BaseException] = None,
+        user_id: Optional[str] = None
+    ) -> None:
+        """
+        Record one completed LLM call, including all of its retries.
+
+        Args:
+            prompt_type: Prompt type tag, e.g. PROMPT_REFINEMENT
+            latency: Wall-clock seconds for the call
+            input_tokens: Prompt token count of the successful attempt
+            output_tokens: Generated token count of the successful attempt
+            retries: Number of retries before the call finished
+            error: The error the call failed with, if any
+            user_id: ID of the user the call was made for, if known
+        """
+        prompt_type = prompt_type or PROMPT_UNTAGGED
+        cost = estimate_cost(input_tokens, output_tokens)
+
+        with self._lock:
+            stats = self._stats.setdefault(prompt_type, _PromptTypeStats())
+            stats.calls += 1
+            stats.retries += retries
+            stats.latency.observe(latency)
+            if error is not None:
+                error_name = type(error).__name__
+                stats.errors[error_name] = stats.errors.get(error_name, 0) + 1
+            else:
+                stats.input_tokens += input_tokens
+                stats.output_tokens += output_tokens
+                stats.cost_usd += cost
+                stats.input_token_histogram.observe(input_tokens)
+                stats.output_token_histogram.observe(output_tokens)
+
+            if self.rollups_enabled:
+                key = (user_id, datetime.utcnow().strftime("%Y-%m-%d"), prompt_type)
+                rollup = self._pending_rollups.setdefault(key, {
+                    "calls": 0,
+                    "errors": 0,
+                    "retries": 0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "cost_usd": 0.0,
+                    "latency_seconds_total": 0.0,
+                    "latency_seconds_max": 0.0
+                })
+                rollup["calls"] += 1
+                rollup["errors"] += 1 if error is not None else 0
+                rollup["retries"] += retries
+                rollup["input_tokens"] += input_tokens
+                rollup["output_tokens"] += output_tokens
+                rollup["cost_usd"] += cost
+                rollup["latency_seconds_total"] += latency
+                rollup["latency_seconds_max"] = max(rollup["latency_seconds_max"], latency)
+
+        logger.info(
+            f"LLM call prompt_type={prompt_type} latency={latency:.3f}s "
+            f"input_tokens={input_tokens} output_tokens={output_tokens} retries={retries} "
+            f"error={type(error).__name__ if error else None}"
+        )
+
+    def flush_rollups(self) -> int:
+        """
+        Write the buffered rollup deltas to llm_usage_daily in one bulk upsert.
+
+        Blocking; called from the event handler's worker thread. Deltas that
+        fail to write are dropped, since metrics must never break the calls
+        they describe.
+
+        Returns:
+            int: Number of daily usage documents updated
+        """
+        with self._lock:
+            pending, self._pending_rollups = self._pending_rollups, {}
+        if not pending:
+            return 0
+
+        now = datetime.utcnow()
+        operations = []
+        for (user_id, date, prompt_type), rollup in pending.items():
+            increments = dict(rollup)
+            latency_max = increments.pop("latency_seconds_max")
+            operations.append(UpdateOne(
+                {"user_id": user_id, "date": date, "prompt_type": prompt_type},
+                {
+                    "$inc": increments,
+                    "$max": {"latency_seconds_max": latency_max},
+                    "$set": {"updated_at": now}
+                },
+                upsert=True
+            ))
+        try:
+            db.llm_usage_daily.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to write {len(operations)} LLM usage rollups: {str(e)}")
+            return 0
+        return len(operations)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the in-process histograms and totals for every prompt type.
+
+        Returns:
+            Dict with collection start time and per-prompt-type statistics
+        """
+        with self._lock:
+            prompt_types = {name: stats.to_dict() for name, stats in self._stats.items()}
+        return {
+            "since": self.started_at.isoformat(),
+            "prompt_types": prompt_types
+        }
+
+    async def get_daily_usage(
+        self,
+        date: Optional[str] = None,
+        user_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Return per-user daily rollups, most expensive first.
+
+        Args:
+            date: Day in YYYY-MM-DD format; defaults to today (UTC)
+            user_id: Restrict to a single user
+            limit: Maximum number of user rows to return
+
+        Returns:
+            One row per user with totals and a per-prompt-type breakdown
+        """
+        query: Dict[str, Any] = {"date": date or datetime.utcnow().strftime("%Y-%m-%d")}
+        if user_id:
+            query["user_id"] = user_id
+
+        # Include this process's calls that are still buffered
+        await asyncio.to_thread(self.flush_rollups)
+
+        cursor = await async_db.llm_usage_daily.aggregate([
+            {"$match": query},
+            {"$group": {
+                "_id": "$user_id",
+                "calls": {"$sum": "$calls"},
+                "errors": {"$sum": "$errors"},
+                "retries": {"$sum": "$retries"},
+                "input_tokens": {"$sum": "$input_tokens"},
+                "output_tokens": {"$sum": "$output_tokens"},
+                "cost_usd": {"$sum": "$cost_usd"},
+                "by_prompt_type": {"$push": {
+                    "prompt_type": "$prompt_type",
+                    "calls": "$calls",
+                    "input_tokens": "$input_tokens",
+                    "output_tokens": "$output_tokens",
+                    "cost_usd": "$cost_usd"
+                }}
+            }},
+            {"$sort": {"cost_usd": -1}},
+            {"$limit": limit}
+        ])
+
+        usage = []
+        async for row in cursor:
+            row["user_id"] = row.pop("_id")
+            row["date"] = query["date"]
+            usage.append(row)
+        return usage
+
+
+# Create a singleton instance
+llm_metrics = LLMMetrics()
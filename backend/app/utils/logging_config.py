@@ -0,0 +1,162 @@
+"""
+Application logging pipeline.
+
+Request-path code only puts log records on an in-memory queue; a QueueListener
+thread formats them as JSON lines and writes them to stdout and, optionally, a
+rotating log file. Large fields are kept off the hot path:
+- messages longer than LOG_MAX_FIELD_CHARS are truncated
+- bulky data such as prompts goes in `extra={"payload": ...}`, which is kept
+  (truncated) for only a sampled share of records
+
+Usage:
+    logger.info("Generated feedback prompt", extra={"payload": prompt})
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_FILE = os.getenv("LOG_FILE", "app/logs/app.log")
+LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "2000"))
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+
+PAYLOAD_FIELD = "payload"
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+
+
+def truncate(value: Any, limit: int = LOG_MAX_FIELD_CHARS) -> Any:
+    """
+    Shorten long strings for logging.
+
+    Args:
+        value: Value to log
+        limit: Maximum number of characters to keep
+
+    Returns:
+        The value, with strings over the limit cut and marked with the original length
+    """
+    if isinstance(value, str) and len(value) > limit:
+        return f"{value[:limit]}... [truncated, {len(value)} chars]"
+    return value
+
+
+class PayloadSamplingFilter(logging.Filter):
+    """
+    Keeps the `payload` extra on a sampled share of records.
+
+    Unsampled records keep only the payload size, so the expensive part of the
+    record never reaches the queue.
+    """
+
+    def __init__(self, sample_rate: float = LOG_PAYLOAD_SAMPLE_RATE):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if hasattr(record, PAYLOAD_FIELD):
+            payload = getattr(record, PAYLOAD_FIELD)
+            if random.random() < self.sample_rate:
+                setattr(record, PAYLOAD_FIELD, truncate(payload if isinstance(payload, str) else repr(payload)))
+            else:
+                record.payload_chars = len(payload) if isinstance(payload, (str, bytes)) else None
+                delattr(record, PAYLOAD_FIELD)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": truncate(record.getMessage()),
+            "thread": record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = truncate(value) if isinstance(value, str) else value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stock handler formats the full message on the calling thread; this one
+    only resolves the message arguments and the traceback text, which must
+    happen before the record leaves the thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = truncate(record.getMessage())
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging() -> QueueListener:
+    """
+    Route all logging through a background queue listener.
+
+    Replaces any handlers on the root logger. Safe to call more than once;
+    later calls return the running listener.
+
+    Returns:
+        The started QueueListener
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    if LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    handlers = [logging.StreamHandler()]
+    if LOG_FILE:
+        os.makedirs(os.path.dirname(LOG_FILE) or ".", exist_ok=True)
+        handlers.append(RotatingFileHandler(LOG_FILE, maxBytes=10485760, backupCount=5))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(PayloadSamplingFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Stop the listener after it has written every queued record."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
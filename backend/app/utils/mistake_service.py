@@ -3,8 +3,10 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 
-from app.config.database import db
+from app.config.database import async_db, db
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +44,98 @@ class MistakeStatistics:
             "mastery_percentage": self.mastery_percentage
         }
 
+MISTAKE_STATUSES = ("NEW", "LEARNING", "MASTERED")
+MISTAKE_TYPES = ("GRAMMAR", "VOCABULARY")
+
+
+def normalize_mistake_text(text: str) -> str:
+    """
+    Normalize a mistake's original text for duplicate detection.
+    
+    Args:
+        text: The text containing the mistake
+        
+    Returns:
+        The text case-folded with whitespace collapsed
+    """
+    return " ".join(text.casefold().split())
+
+
+def statistics_pipeline(user_id: ObjectId) -> List[Dict[str, Any]]:
+    """Aggregation counting a user's mistakes by status and by type in one $facet."""
+    return [
+        {"$match": {"user_id": user_id}},
+        {"$facet": {
+            "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "by_type": [{"$group": {"_id": "$type", "count": {"$sum": 1}}}]
+        }}
+    ]
+
+
+def stats_document_from_facets(user_id: ObjectId, facets: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a mistake_stats document from the reconciliation $facet result.
+    
+    Args:
+        user_id: ID of the user, used as the document's _id
+        facets: One row with by_status and by_type lists of {_id, count}
+        
+    Returns:
+        The statistics document
+    """
+    status_counts = {status: 0 for status in MISTAKE_STATUSES}
+    for row in facets.get("by_status", []):
+        status_counts[row["_id"]] = row["count"]
+    type_counts = {mistake_type: 0 for mistake_type in MISTAKE_TYPES}
+    for row in facets.get("by_type", []):
+        type_counts[row["_id"]] = row["count"]
+    
+    now = datetime.utcnow()
+    return {
+        "_id": user_id,
+        "total_count": sum(status_counts.values()),
+        "status_counts": status_counts,
+        "type_counts": type_counts,
+        "updated_at": now,
+        "reconciled_at": now
+    }
+
+
+def statistics_from_document(stats: Dict[str, Any], due_count: int) -> MistakeStatistics:
+    """
+    Turn a mistake_stats document into MistakeStatistics.
+    
+    Args:
+        stats: The user's statistics document
+        due_count: Number of mistakes due for practice now
+        
+    Returns:
+        MistakeStatistics object with statistics
+    """
+    total_count = stats.get("total_count", 0)
+    status_counts = stats.get("status_counts", {})
+    type_counts = stats.get("type_counts", {})
+    mastered_count = status_counts.get("MASTERED", 0)
+    
+    # Calculate mastery percentage
+    mastery_percentage = 0
+    if total_count > 0:
+        mastery_percentage = (mastered_count / total_count) * 100
+    
+    return MistakeStatistics(
+        total_count=total_count,
+        mastered_count=mastered_count,
+        learning_count=status_counts.get("LEARNING", 0),
+        new_count=status_counts.get("NEW", 0),
+        type_distribution={
+            "GRAMMAR": type_counts.get("GRAMMAR", 0),
+            "VOCABULARY": type_counts.get("VOCABULARY", 0)
+        },
+        due_for_practice=due_count,
+        mastery_percentage=mastery_percentage
+    )
+
+
 class MistakeService:
     """
     Service for processing, storing, and managing language mistakes.
@@ -141,9 +235,7 @@ class MistakeService:
             all_mistakes = grammar_mistakes + vocab_mistakes
             
             # Store non-duplicate mistakes
-            stored_ids = self._store_unique_mistakes(user_id, all_mistakes)
-            
-            return len(stored_ids)
+            return self._store_unique_mistakes(user_id, all_mistakes)
             
         except Exception as e:
             logger.error(f"Error processing mistakes: {str(e)}")
@@ -212,11 +304,14 @@ class MistakeService:
             logger.error(f"Error fetching practice items: {str(e)}")
             return []
     
-    def get_mistake_statistics(self, user_id: str) -> MistakeStatistics:
+    async def get_mistake_statistics(self, user_id: str) -> MistakeStatistics:
         """
         Get statistics about a user's mistakes.
         
         This method matches the class diagram's getMistakeStatistics method.
+        Counts come from the user's materialized mistake_stats document (built
+        on first use); only the time-dependent due count is queried. Runs on
+        the async client, since it serves the statistics endpoint.
         
         Args:
             user_id: ID of the user
@@ -225,47 +320,93 @@ class MistakeService:
             MistakeStatistics object with statistics
         """
         try:
-            now = datetime.utcnow()
-            
-            # Get counts by status
-            total_count = db.mistakes.count_documents({"user_id": ObjectId(user_id)})
-            mastered_count = db.mistakes.count_documents({"user_id": ObjectId(user_id), "status": "MASTERED"})
-            learning_count = db.mistakes.count_documents({"user_id": ObjectId(user_id), "status": "LEARNING"})
-            new_count = db.mistakes.count_documents({"user_id": ObjectId(user_id), "status": "NEW"})
-            
-            # Get type distribution
-            grammar_count = db.mistakes.count_documents({"user_id": ObjectId(user_id), "type": "GRAMMAR"})
-            vocab_count = db.mistakes.count_documents({"user_id": ObjectId(user_id), "type": "VOCABULARY"})
-            
-            # Get due for practice
-            due_count = db.mistakes.count_documents({
-                "user_id": ObjectId(user_id), 
-                "next_practice_date": {"$lte": now},
-                "status": {"$ne": "MASTERED"}
+            user_object_id = ObjectId(user_id)
+            stats = await async_db.mistake_stats.find_one({"_id": user_object_id})
+            if stats is None:
+                cursor = await async_db.mistakes.aggregate(statistics_pipeline(user_object_id))
+                facets = await cursor.to_list()
+                stats = stats_document_from_facets(user_object_id, facets[0] if facets else {})
+                await async_db.mistake_stats.replace_one({"_id": user_object_id}, stats, upsert=True)
+            
+            # Mistakes become due as time passes, so this one is counted live
+            due_count = await async_db.mistakes.count_documents({
+                "user_id": user_object_id,
+                "status": {"$ne": "MASTERED"},
+                "next_practice_date": {"$lte": datetime.utcnow()}
             })
             
-            # Calculate mastery percentage
-            mastery_percentage = 0
-            if total_count > 0:
-                mastery_percentage = (mastered_count / total_count) * 100
-            
-            return MistakeStatistics(
-                total_count=total_count,
-                mastered_count=mastered_count,
-                learning_count=learning_count,
-                new_count=new_count,
-                type_distribution={
-                    "GRAMMAR": grammar_count,
-                    "VOCABULARY": vocab_count
-                },
-                due_for_practice=due_count,
-                mastery_percentage=mastery_percentage
-            )
+            return statistics_from_document(stats, due_count)
             
         except Exception as e:
             logger.error(f"Error getting mistake statistics: {str(e)}")
             return MistakeStatistics()
     
+    def reconcile_mistake_statistics(self, user_id: str) -> Dict[str, Any]:
+        """
+        Rebuild a user's mistake_stats document from the mistakes collection.
+        
+        Incremental updates can drift (e.g. a mistake inserted while the
+        document is being rebuilt), so documents are recounted periodically
+        with a single $facet aggregation.
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            The stored statistics document
+        """
+        user_object_id = ObjectId(user_id)
+        facets = list(db.mistakes.aggregate(statistics_pipeline(user_object_id)))
+        stats = stats_document_from_facets(user_object_id, facets[0] if facets else {})
+        db.mistake_stats.replace_one({"_id": user_object_id}, stats, upsert=True)
+        return stats
+    
+    def reconcile_stale_statistics(self, max_age_seconds: int, limit: int = 100) -> int:
+        """
+        Recount the statistics documents that were not reconciled recently.
+        
+        Args:
+            max_age_seconds: Reconcile documents older than this
+            limit: Maximum number of documents to reconcile in one pass
+            
+        Returns:
+            Number of documents reconciled
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+        stale = db.mistake_stats.find(
+            {"reconciled_at": {"$lt": cutoff}},
+            {"_id": 1}
+        ).sort("reconciled_at", 1).limit(limit)
+        
+        reconciled = 0
+        for stats in stale:
+            try:
+                self.reconcile_mistake_statistics(str(stats["_id"]))
+                reconciled += 1
+            except Exception as e:
+                logger.error(f"Error reconciling mistake statistics for {stats['_id']}: {str(e)}")
+        return reconciled
+    
+    def _increment_statistics(self, user_id: str, increments: Dict[str, int]) -> None:
+        """
+        Apply counter changes to a user's statistics document.
+        
+        Users without a document are skipped: their first read builds it from
+        the mistakes collection, which already includes this change.
+        
+        Args:
+            user_id: ID of the user
+            increments: Counter paths and deltas, e.g. {"status_counts.NEW": 1}
+        """
+        try:
+            db.mistake_stats.update_one(
+                {"_id": ObjectId(user_id)},
+                {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}}
+            )
+        except Exception as e:
+            # Reconciliation repairs the counters; never fail the mistake write
+            logger.error(f"Error updating mistake statistics: {str(e)}")
+    
     def update_after_practice(
         self,
         mistake_id: str, 
@@ -324,25 +465,40 @@ class MistakeService:
             # Calculate next practice date
             next_practice_date = self._calculate_next_practice(practice_count, was_successful)
             
-            # Update in database
-            db.mistakes.update_one(
-                {"_id": ObjectId(mistake_id)},
-                {
-                    "$set": {
-                        "practice_count": practice_count,
-                        "success_count": success_count,
-                        "last_practiced": datetime.utcnow(),
-                        "next_practice_date": next_practice_date,
-                        "mastery_level": mastery_percentage,
-                        "status": status,
-                        "is_learned": is_learned,
-                        "last_answer": user_answer
-                    }
-                }
+            # Update in database; matching the read status keeps the statistics
+            # counters exact when two practice results race. The updated
+            # document comes back with the write, so it is not read again.
+            previous_status = mistake.get("status", "NEW")
+            update = {
+                "practice_count": practice_count,
+                "success_count": success_count,
+                "last_practiced": datetime.utcnow(),
+                "next_practice_date": next_practice_date,
+                "mastery_level": mastery_percentage,
+                "status": status,
+                "is_learned": is_learned,
+                "last_answer": user_answer
+            }
+            if status == "MASTERED":
+                # Mastered mistakes leave the duplicate-detection identity for
+                # good. active is never set back to True here: a newer mistake
+                # may hold the identity by now, and legacy mistakes without
+                # normalized_text would all collide on a null key
+                update["active"] = False
+            updated_mistake = db.mistakes.find_one_and_update(
+                {"_id": ObjectId(mistake_id), "status": previous_status},
+                {"$set": update},
+                return_document=ReturnDocument.AFTER
             )
             
-            # Get updated mistake
-            updated_mistake = db.mistakes.find_one({"_id": ObjectId(mistake_id)})
+            if updated_mistake is None:
+                # A concurrent practice result changed the status first; report its outcome
+                updated_mistake = db.mistakes.find_one({"_id": ObjectId(mistake_id)})
+            elif status != previous_status:
+                self._increment_statistics(user_id, {
+                    f"status_counts.{previous_status}": -1,
+                    f"status_counts.{status}": 1
+                })
             
             if not updated_mistake:
                 raise ValueError(f"Updated mistake not found: {mistake_id}")
@@ -478,61 +634,91 @@ class MistakeService:
     # Alias for backward compatibility
     _calculate_next_practice = _calculate_next_practice_date
     
-    def _store_unique_mistakes(self, user_id: str, mistakes: List[Dict[str, Any]]) -> List[str]:
+    def _store_unique_mistakes(self, user_id: str, mistakes: List[Dict[str, Any]]) -> int:
         """
         Store mistakes while handling duplicates.
         
         This method matches the class diagram's storeUniqueMistakes method.
+        A mistake is identified by (user_id, type, normalized text) among the
+        user's unmastered mistakes. All mistakes go to the database in one
+        bulk_write of upserts: known ones get their frequency incremented, new
+        ones are inserted. The partial unique index on that identity makes
+        concurrent feedback for the same user safe.
         
         Args:
             user_id: ID of the user
             mistakes: List of mistakes to store
             
         Returns:
-            List of stored mistake IDs
+            Number of mistakes stored or updated
         """
-        stored_ids = []
-        
+        # Merge repeats within this feedback into one upsert
+        grouped: Dict[tuple, Dict[str, Any]] = {}
         for mistake in mistakes:
             # Skip empty mistakes
             if not mistake.get("original_text") or not mistake.get("correction"):
                 continue
-                
-            # Check for existing similar mistake
-            existing = None
-            try:
-                existing = db.mistakes.find_one({
-                    "user_id": ObjectId(user_id),
-                    "type": mistake["type"],
-                    "original_text": mistake["original_text"],
-                    "status": {"$ne": "MASTERED"}
-                })
-            except Exception as e:
-                logger.error(f"Error finding existing mistake: {str(e)}")
-                continue
-            
-            if existing:
-                # Update existing mistake (increase frequency)
-                try:
-                    db.mistakes.update_one(
-                        {"_id": existing["_id"]},
-                        {
-                            "$inc": {"frequency": 1},
-                            "$set": {"last_occurred": datetime.utcnow()}
-                        }
-                    )
-                    stored_ids.append(str(existing["_id"]))
-                except Exception as e:
-                    logger.error(f"Error updating existing mistake: {str(e)}")
+            key = (mistake["type"], normalize_mistake_text(mistake["original_text"]))
+            if key in grouped:
+                grouped[key]["occurrences"] += 1
             else:
-                # Insert new mistake
-                try:
-                    result = db.mistakes.insert_one(mistake)
-                    stored_ids.append(str(result.inserted_id))
-                except Exception as e:
-                    logger.error(f"Error inserting new mistake: {str(e)}")
-        
-        return stored_ids
+                grouped[key] = {"mistake": mistake, "occurrences": 1}
+        
+        if not grouped:
+            return 0
+        
+        now = datetime.utcnow()
+        operations = []
+        mistake_types = []
+        for (mistake_type, normalized_text), entry in grouped.items():
+            identity = {
+                "user_id": ObjectId(user_id),
+                "type": mistake_type,
+                "normalized_text": normalized_text,
+                "active": True
+            }
+            new_fields = {
+                field: value for field, value in entry["mistake"].items()
+                if field not in identity and field not in ("frequency", "last_occurred")
+            }
+            operations.append(UpdateOne(
+                identity,
+                {
+                    "$inc": {"frequency": entry["occurrences"]},
+                    "$set": {"last_occurred": now},
+                    "$setOnInsert": new_fields
+                },
+                upsert=True
+            ))
+            mistake_types.append(mistake_type)
+        
+        try:
+            result = db.mistakes.bulk_write(operations, ordered=False)
+            matched = result.matched_count
+            upserted = list(result.upserted_ids)
+        except BulkWriteError as e:
+            # Two feedbacks inserting the same identity at once: the loser gets a
+            # duplicate key error, and re-running its upsert matches the winner
+            errors = e.details.get("writeErrors", [])
+            if not errors or any(error.get("code") != 11000 for error in errors):
+                logger.error(f"Error storing mistakes: {str(e)}")
+                raise
+            retry = db.mistakes.bulk_write([operations[error["index"]] for error in errors], ordered=False)
+            matched = e.details.get("nMatched", 0) + retry.matched_count
+            upserted = [item["index"] for item in e.details.get("upserted", [])]
+            upserted += [errors[index]["index"] for index in retry.upserted_ids]
+        
+        self._record_inserted_mistakes(user_id, [mistake_types[index] for index in upserted])
+        return matched + len(upserted)
+    
+    def _record_inserted_mistakes(self, user_id: str, mistake_types: List[str]) -> None:
+        """Count newly inserted mistakes in the user's statistics."""
+        if not mistake_types:
+            return
+        increments = {"total_count": len(mistake_types), "status_counts.NEW": len(mistake_types)}
+        for mistake_type in mistake_types:
+            increments[f"type_counts.{mistake_type}"] = increments.get(f"type_counts.{mistake_type}", 0) + 1
+        self._increment_statistics(user_id, increments)
     
     def _transform_to_practice_item(self, mistake: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,133 @@
+"""
+Keyset (cursor) pagination over MongoDB collections.
+
+Pages are sorted by a timestamp field with _id as tie-breaker and continue
+from the last document of the previous page, so every page is an index range
+scan no matter how deep the client has scrolled, and documents inserted
+meanwhile never shift or repeat items. The cursor handed to clients is an
+opaque token of the last document's (timestamp, _id).
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+# Page sizes accepted by listing endpoints
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(timestamp: datetime, document_id: ObjectId) -> str:
+    """
+    Build the opaque cursor pointing after a document.
+
+    Args:
+        timestamp: The document's sort timestamp
+        document_id: The document's _id
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    raw = json.dumps([timestamp.isoformat(), str(document_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Read a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor token from a previous page
+
+    Returns:
+        Tuple[datetime, ObjectId]: The (timestamp, _id) to continue after
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, document_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), ObjectId(document_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def keyset_filter(field: str, cursor: Optional[str], descending: bool = True) -> Dict[str, Any]:
+    """
+    Build the query condition selecting documents after a cursor.
+
+    Args:
+        field: Timestamp field the pages are sorted by
+        cursor: Cursor token, or None for the first page
+        descending: Whether pages go from newest to oldest
+
+    Returns:
+        Dict[str, Any]: Condition to merge into the query (empty for the first page)
+    """
+    if not cursor:
+        return {}
+    timestamp, document_id = decode_cursor(cursor)
+    operator = "$lt" if descending else "$gt"
+    return {"$or": [
+        {field: {operator: timestamp}},
+        {field: timestamp, "_id": {operator: document_id}}
+    ]}
+
+
+def keyset_sort(field: str, descending: bool = True) -> List[Tuple[str, int]]:
+    """Return the sort matching keyset_filter: the timestamp, then _id."""
+    direction = -1 if descending else 1
+    return [(field, direction), ("_id", direction)]
+
+
+def next_page(documents: List[Dict[str, Any]], field: str, limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Split a fetch of `limit + 1` documents into the page and the next cursor.
+
+    Args:
+        documents: Documents fetched with limit + 1
+        field: Timestamp field the pages are sorted by
+        limit: Page size
+
+    Returns:
+        Tuple: The page's documents and the cursor of the next page (None on the last page)
+    """
+    if len(documents) <= limit:
+        return documents, None
+    page = documents[:limit]
+    return page, encode_cursor(page[-1][field], page[-1]["_id"])
+
+
+def keyset_page(
+    documents: List[Dict[str, Any]],
+    field: str,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Page through documents already in memory (e.g. an archived bundle) like keyset_filter does in a query.
+
+    Args:
+        documents: All documents, in any order
+        field: Timestamp field the pages are sorted by
+        cursor: Cursor token, or None for the first page
+        limit: Page size
+        descending: Whether pages go from newest to oldest
+
+    Returns:
+        Tuple: The page's documents and the cursor of the next page (None on the last page)
+    """
+    ordered = sorted(documents, key=lambda document: (document[field], document["_id"]), reverse=descending)
+    if cursor:
+        after = decode_cursor(cursor)
+        if descending:
+            ordered = [document for document in ordered if (document[field], document["_id"]) < after]
+        else:
+            ordered = [document for document in ordered if (document[field], document["_id"]) > after]
+    return next_page(ordered[:limit + 1], field, limit)
@@ -0,0 +1,295 @@
+"""
+Resilience helpers for calls to slow or unreliable upstream services.
+
+This module provides:
+1. Jittered exponential backoff for retries
+2. A thread-safe circuit breaker
+3. A rolling latency window used to decide when to hedge a request
+4. ResilientCaller, which combines the above around a blocking call
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a call does not complete within its deadline."""
+
+
+def backoff_delay(attempt: int, base_delay: float = 0.5, max_delay: float = 8.0) -> float:
+    """
+    Compute a "full jitter" exponential backoff delay.
+
+    Args:
+        attempt: Zero-based index of the retry being scheduled
+        base_delay: Delay in seconds for the first retry before jitter
+        max_delay: Upper bound for the un-jittered delay
+
+    Returns:
+        A random delay in seconds between 0 and min(max_delay, base_delay * 2**attempt)
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker that stops calling an upstream after repeated failures.
+
+    The breaker opens after `failure_threshold` consecutive failures and rejects
+    calls for `recovery_timeout` seconds. It then lets a single trial call through
+    (half-open); success closes the circuit again, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state, taking the recovery timeout into account."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may be attempted right now.
+
+        Returns:
+            True if the call may proceed, False if the circuit is open
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            # Half-open: only one trial call at a time
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful call and close the circuit."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit '{self.name}' closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit when the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Circuit '{self.name}' opened after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class LatencyWindow:
+    """
+    Rolling window of recent call latencies.
+
+    Used to derive the hedging threshold (e.g. the p95 latency) from live traffic.
+    """
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Add a latency sample in seconds."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Return the given percentile of the window.
+
+        Args:
+            fraction: Percentile as a fraction, e.g. 0.95 for p95
+
+        Returns:
+            Latency in seconds, or None while the window has too few samples
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class ResilientCaller:
+    """
+    Wraps a blocking upstream call with a deadline, retries, a circuit breaker
+    and optional request hedging.
+
+    The wrapped function receives the remaining time budget in seconds so it can
+    pass a matching timeout to the underlying client.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float = 30.0,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        is_retryable: Optional[Callable[[BaseException], bool]] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        max_workers: int = 32
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.is_retryable = is_retryable or (lambda exc: isinstance(exc, TimeoutError))
+        self.breaker = breaker or CircuitBreaker(name)
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.latency = LatencyWindow()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-call")
+
+    def call(
+        self,
+        fn: Callable[[float], Any],
+        timeout: Optional[float] = None,
+        on_retry: Optional[Callable[[int, BaseException], None]] = None
+    ) -> Any:
+        """
+        Execute `fn` with the configured resilience policy.
+
+        Args:
+            fn: Blocking callable taking the remaining time budget in seconds
+            timeout: Overall deadline for all attempts; defaults to self.timeout
+            on_retry: Optional callback invoked with (attempt, error) before each retry
+
+        Returns:
+            The result of the first successful call
+
+        Raises:
+            CircuitOpenError: If the circuit breaker rejects the call
+            DeadlineExceededError: If the deadline passes before a call succeeds
+            Exception: The last non-retryable or final error raised by `fn`
+        """
+        deadline = time.monotonic() + (timeout if timeout is not None else self.timeout)
+        last_error: Optional[BaseException] = None
+
+        for attempt in range(self.max_attempts):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            if not self.breaker.allow_request():
+                raise CircuitOpenError(f"Circuit '{self.name}' is open; upstream call rejected")
+
+            try:
+                result = self._run_attempt(fn, remaining)
+                self.breaker.record_success()
+                return result
+            except Exception as e:
+                last_error = e
+                if not self.is_retryable(e):
+                    # The upstream answered; the request itself was bad
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+
+            if attempt + 1 >= self.max_attempts:
+                break
+
+            delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+            if time.monotonic() + delay >= deadline:
+                break
+            logger.warning(
+                f"{self.name} call failed (attempt {attempt + 1}/{self.max_attempts}): "
+                f"{last_error}; retrying in {delay:.2f}s"
+            )
+            if on_retry:
+                on_retry(attempt + 1, last_error)
+            time.sleep(delay)
+
+        if last_error is not None and not isinstance(last_error, TimeoutError):
+            raise last_error
+        raise DeadlineExceededError(f"{self.name} call did not complete within its deadline")
+
+    def _run_attempt(self, fn: Callable[[float], Any], remaining: float) -> Any:
+        """
+        Run one attempt, firing a hedged duplicate if the first one is slow.
+
+        Args:
+            fn: Blocking callable taking the remaining time budget in seconds
+            remaining: Time budget for this attempt in seconds
+
+        Returns:
+            The result of whichever request finishes successfully first
+        """
+        end = time.monotonic() + remaining
+        started = {}
+
+        def submit():
+            future = self._executor.submit(fn, max(0.0, end - time.monotonic()))
+            started[future] = time.monotonic()
+            return future
+
+        pending = {submit()}
+
+        hedge_after = self.latency.percentile(self.hedge_percentile) if self.hedge else None
+        if hedge_after is not None and hedge_after < remaining:
+            done, _ = wait(pending, timeout=hedge_after)
+            if not done:
+                logger.debug(f"{self.name} call exceeded p{int(self.hedge_percentile * 100)} ({hedge_after:.2f}s); hedging")
+                pending.add(submit())
+
+        last_error: Optional[BaseException] = None
+        while pending:
+            left = end - time.monotonic()
+            if left <= 0:
+                break
+            done, pending = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    self.latency.record(time.monotonic() - started[future])
+                    return future.result()
+                last_error = error
+
+        if pending or last_error is None:
+            raise DeadlineExceededError(f"{self.name} call timed out after {remaining:.1f}s")
+        raise last_error
@@ -8,7 +8,7 @@ from fastapi import UploadFile, HTTPException, status
 from bson import ObjectId
 import inspect
 from app.utils.transcription_error_message import TranscriptionErrorMessages
-from app.config.database import db
+from app.config.database import async_db
 from app.models.audio import Audio
 from app.utils.audio_processor import transcribe_audio_local,transcribe_audio_with_whisper
 
@@ -141,13 +141,14 @@ class SpeechService:
         # This prevents downstream processes from failing due to missing transcription
         return TranscriptionErrorMessages.FALLBACK_ERROR.value
     
-    def save_audio_file(self, audio_file: UploadFile, user_id: str) -> Tuple[str, Audio]:
+    async def save_audio_file(self, audio_file: UploadFile, user_id: str, transcription: Optional[str] = None) -> Tuple[str, Audio]:
         """
         Save an audio file to disk and create a database record.
         
         Args:
             audio_file: The audio file to save
             user_id: ID of the user who owns the file
+            transcription: Transcription to store with the record, if already known
             
         Returns:
             Tuple containing the file path and Audio model
@@ -177,14 +178,15 @@ class SpeechService:
                 user_id=user_object_id,
                 filename=audio_file.filename,
                 file_path=str(file_path),
+                transcription=transcription,
                 language="en-US"  # Default language
             )
             
             # Insert into database
-            result = db.audio.insert_one(new_audio.to_dict())
+            result = await async_db.audio.insert_one(new_audio.to_dict())
             
             # Fetch the inserted audio
-            created_audio = db.audio.find_one({"_id": result.inserted_id})
+            created_audio = await async_db.audio.find_one({"_id": result.inserted_id})
             
             # Store the _id value
             audio_id = created_audio["_id"]
@@ -0,0 +1,175 @@
+"""
+In-flight speech synthesis shared between requests.
+
+A synthesis job streams audio from the TTS service into the TTS cache and an
+in-memory buffer. Any number of listeners can attach to a running job: they
+receive everything buffered so far and then follow the live stream. This lets
+the message pipeline start synthesis as soon as an AI reply is stored, while the
+speech endpoint simply attaches to the job (or, once finished, reads the cache).
+"""
+
+import asyncio
+import logging
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.utils.tts_cache import tts_cache
+from app.utils.tts_client_service import get_audio_media_type, get_speech_from_tts_service
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechSynthesisJob:
+    """
+    One running synthesis whose audio can be read by several listeners.
+
+    Attributes:
+        key: TTS cache key of the audio
+        response_format: Audio format being synthesized
+        media_type: Content-Type reported by the TTS service
+        error: The error that ended the job, if any
+    """
+
+    def __init__(self, key: str, response_format: str):
+        self.key = key
+        self.response_format = response_format
+        self.media_type = get_audio_media_type(response_format)
+        self.error: Optional[BaseException] = None
+        self.task: Optional[asyncio.Task] = None
+        self._chunks: List[bytes] = []
+        self._done = False
+        self._started = asyncio.Event()
+        self._changed = asyncio.Condition()
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not."""
+        return self._done
+
+    async def wait_finished(self) -> None:
+        """Wait until the job has finished, successfully or not."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._done)
+
+    async def wait_started(self) -> None:
+        """Wait until the TTS service accepted the request or the job failed."""
+        await self._started.wait()
+
+    def mark_started(self, media_type: Optional[str] = None) -> None:
+        if media_type:
+            self.media_type = media_type
+        self._started.set()
+
+    async def publish(self, chunk: bytes) -> None:
+        """Append a chunk and wake up listeners."""
+        async with self._changed:
+            self._chunks.append(chunk)
+            self._changed.notify_all()
+
+    async def finish(self, error: Optional[BaseException] = None) -> None:
+        """Mark the job as finished and wake up listeners."""
+        async with self._changed:
+            self.error = error
+            self._done = True
+            self._changed.notify_all()
+        self._started.set()
+
+    async def listen(self) -> AsyncIterator[bytes]:
+        """
+        Stream the job's audio from the beginning.
+
+        Yields:
+            bytes: Audio chunks in order, live until the job finishes
+
+        Raises:
+            Exception: The job's error, if it failed
+        """
+        position = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: position < len(self._chunks) or self._done)
+                pending = self._chunks[position:]
+                finished = self._done
+            position += len(pending)
+            for chunk in pending:
+                yield chunk
+            if finished and position >= len(self._chunks):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class SpeechSynthesisRegistry:
+    """
+    Tracks running synthesis jobs by cache key so each audio is synthesized once.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, SpeechSynthesisJob] = {}
+
+    def get(self, key: str) -> Optional[SpeechSynthesisJob]:
+        """Return the running job for `key`, if any."""
+        return self._jobs.get(key)
+
+    def get_or_start(
+        self,
+        key: str,
+        response_format: str,
+        synthesize: Optional[Callable[..., Awaitable[Any]]] = None,
+        **tts_options: Any
+    ) -> SpeechSynthesisJob:
+        """
+        Attach to the running job for `key`, or start one.
+
+        Must be called from the event loop.
+
+        Args:
+            key: TTS cache key of the audio
+            response_format: Audio format to synthesize
+            synthesize: Coroutine function returning a StreamingResponse;
+                defaults to get_speech_from_tts_service
+            **tts_options: Arguments for `synthesize`
+                (text_to_speak, voice_name, model_name, speed, lang_code)
+
+        Returns:
+            SpeechSynthesisJob: The job producing the audio
+        """
+        job = self._jobs.get(key)
+        if job is not None:
+            return job
+        job = SpeechSynthesisJob(key, response_format)
+        self._jobs[key] = job
+        job.task = asyncio.create_task(
+            self._run(job, response_format, synthesize or get_speech_from_tts_service, tts_options)
+        )
+        return job
+
+    async def _run(
+        self,
+        job: SpeechSynthesisJob,
+        response_format: str,
+        synthesize: Callable[..., Awaitable[Any]],
+        tts_options: Dict[str, Any]
+    ):
+        """Stream audio from the TTS service into the cache and the job buffer."""
+        error = None
+        try:
+            response = await synthesize(response_format=response_format, **tts_options)
+            job.mark_started(response.media_type)
+            # Closing the body releases the TTS backend even if the job stops early
+            async with aclosing(response.body_iterator) as body:
+                async for chunk in tts_cache.tee(job.key, response_format, body):
+                    await job.publish(chunk)
+        except asyncio.CancelledError as e:
+            error = e
+            raise
+        except Exception as e:
+            logger.error(f"Speech synthesis {job.key} failed: {str(e)}")
+            error = e
+        finally:
+            await job.finish(error)
+            self._jobs.pop(job.key, None)
+
+
+# Create a singleton instance
+speech_synthesis = SpeechSynthesisRegistry()
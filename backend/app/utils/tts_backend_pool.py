@@ -0,0 +1,267 @@
+"""
+Pool of kokoro TTS backends.
+
+Speech requests are spread over every instance listed in TTS_BACKEND_URLS:
+- each request goes to the available backend with the fewest outstanding
+  requests (streams count until the last byte was read)
+- a background task probes every backend's health endpoint and takes failing
+  instances out of rotation until they answer again
+- each backend has a CircuitBreaker fed by real traffic, so an instance that
+  keeps failing is skipped even between probes
+- per-backend request counts, errors and latency are kept for the metrics API
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.utils.resilience import CircuitBreaker, LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated kokoro base URLs; TTS_BACKEND_BASE_URL is the single-instance default
+TTS_BACKEND_BASE_URL = os.getenv("TTS_BACKEND_BASE_URL", "http://tts_kokoro:8880")
+TTS_BACKEND_URLS = [
+    url.strip().rstrip("/")
+    for url in os.getenv("TTS_BACKEND_URLS", TTS_BACKEND_BASE_URL).split(",")
+    if url.strip()
+]
+# Connection pool and timeouts of each backend's client
+TTS_MAX_CONNECTIONS = int(os.getenv("TTS_MAX_CONNECTIONS", "50"))
+TTS_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("TTS_MAX_KEEPALIVE_CONNECTIONS", "20"))
+TTS_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("TTS_KEEPALIVE_EXPIRY_SECONDS", "60"))
+TTS_CONNECT_TIMEOUT_SECONDS = float(os.getenv("TTS_CONNECT_TIMEOUT_SECONDS", "5"))
+TTS_READ_TIMEOUT_SECONDS = float(os.getenv("TTS_READ_TIMEOUT_SECONDS", "60"))
+TTS_POOL_TIMEOUT_SECONDS = float(os.getenv("TTS_POOL_TIMEOUT_SECONDS", "10"))
+# Health probing and circuit breaking
+TTS_HEALTH_PATH = os.getenv("TTS_HEALTH_PATH", "/health")
+TTS_HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("TTS_HEALTH_CHECK_INTERVAL_SECONDS", "10"))
+TTS_HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("TTS_HEALTH_CHECK_TIMEOUT_SECONDS", "2"))
+TTS_BREAKER_FAILURE_THRESHOLD = int(os.getenv("TTS_BREAKER_FAILURE_THRESHOLD", "3"))
+TTS_BREAKER_RECOVERY_SECONDS = float(os.getenv("TTS_BREAKER_RECOVERY_SECONDS", "15"))
+
+
+class NoTTSBackendAvailableError(Exception):
+    """Raised when every TTS backend is unhealthy or has an open circuit."""
+
+
+class TTSBackend:
+    """
+    One kokoro instance with its own connection pool, breaker and statistics.
+
+    Args:
+        base_url: Base URL of the instance, e.g. http://tts_kokoro:8880
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.breaker = CircuitBreaker(
+            f"tts:{base_url}",
+            failure_threshold=TTS_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=TTS_BREAKER_RECOVERY_SECONDS
+        )
+        self.latency = LatencyWindow(size=500, min_samples=1)
+        self.healthy = True
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Keep-alive client for this backend, created on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(
+                    max_connections=TTS_MAX_CONNECTIONS,
+                    max_keepalive_connections=TTS_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=TTS_KEEPALIVE_EXPIRY_SECONDS
+                ),
+                timeout=httpx.Timeout(
+                    TTS_READ_TIMEOUT_SECONDS,
+                    connect=TTS_CONNECT_TIMEOUT_SECONDS,
+                    pool=TTS_POOL_TIMEOUT_SECONDS
+                )
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def snapshot(self) -> Dict:
+        """Return this backend's state and statistics."""
+        return {
+            "url": self.base_url,
+            "healthy": self.healthy,
+            "circuit": self.breaker.state,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "latency_seconds": {
+                "p50": self.latency.percentile(0.5),
+                "p95": self.latency.percentile(0.95),
+                "p99": self.latency.percentile(0.99)
+            }
+        }
+
+
+class TTSBackendLease:
+    """
+    A backend reserved for one request.
+
+    The caller reports the outcome with success() or failure() and calls
+    release() once the response stream is closed. A lease released without an
+    outcome counts as a failure, so a half-open circuit never waits forever for
+    its trial request.
+    """
+
+    def __init__(self, backend: TTSBackend):
+        self.backend = backend
+        self.started = time.perf_counter()
+        self._reported = False
+        self._released = False
+        backend.outstanding += 1
+        backend.requests += 1
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self.backend.client
+
+    def success(self):
+        """Record a successful response (time to first byte goes into the latency window)."""
+        if self._reported:
+            return
+        self._reported = True
+        self.backend.breaker.record_success()
+        self.backend.latency.record(time.perf_counter() - self.started)
+
+    def failure(self, error: str):
+        """Record a failed request against the backend's circuit breaker."""
+        if self._reported:
+            return
+        self._reported = True
+        self.backend.errors += 1
+        self.backend.last_error = error
+        self.backend.breaker.record_failure()
+
+    def release(self):
+        """Return the backend's request slot. Safe to call more than once."""
+        if self._released:
+            return
+        self._released = True
+        self.failure("released without a response")
+        self.backend.outstanding -= 1
+
+
+class TTSBackendPool:
+    """
+    Least-outstanding-requests balancer over several TTS backends.
+
+    Args:
+        urls: Base URLs of the backends
+    """
+
+    def __init__(self, urls: List[str] = TTS_BACKEND_URLS):
+        self.backends = [TTSBackend(url) for url in urls]
+        self._health_task: Optional[asyncio.Task] = None
+
+    def _candidates(self, exclude: List[TTSBackend]) -> List[TTSBackend]:
+        """Backends to try, least loaded first (ties go to the least used). Unhealthy ones only if nothing else is left."""
+        usable = [
+            backend for backend in self.backends
+            if backend not in exclude and backend.breaker.state != CircuitBreaker.OPEN
+        ]
+        healthy = [backend for backend in usable if backend.healthy]
+        return sorted(healthy or usable, key=lambda backend: (backend.outstanding, backend.requests))
+
+    def pick(self, exclude: Optional[List[TTSBackend]] = None) -> TTSBackend:
+        """
+        Choose the backend for the next request.
+
+        Args:
+            exclude: Backends that already failed this request
+
+        Returns:
+            TTSBackend: The available backend with the fewest outstanding requests
+
+        Raises:
+            NoTTSBackendAvailableError: If no backend may be called right now
+        """
+        for backend in self._candidates(exclude or []):
+            if backend.breaker.allow_request():
+                return backend
+        raise NoTTSBackendAvailableError("No TTS backend available")
+
+    def acquire(self, exclude: Optional[List[TTSBackend]] = None) -> TTSBackendLease:
+        """
+        Reserve the least loaded available backend for one request.
+
+        Args:
+            exclude: Backends that already failed this request
+
+        Returns:
+            TTSBackendLease: The reservation; call release() when the response is closed
+
+        Raises:
+            NoTTSBackendAvailableError: If no backend may be called right now
+        """
+        return TTSBackendLease(self.pick(exclude))
+
+    async def check_health(self):
+        """Probe every backend once and update its health flag."""
+        async def probe(backend: TTSBackend):
+            try:
+                response = await backend.client.get(TTS_HEALTH_PATH, timeout=TTS_HEALTH_CHECK_TIMEOUT_SECONDS)
+                healthy = response.status_code == 200
+            except httpx.HTTPError:
+                healthy = False
+            if healthy != backend.healthy:
+                log = logger.info if healthy else logger.warning
+                log(f"TTS backend {backend.base_url} is {'healthy' if healthy else 'unhealthy'}")
+            backend.healthy = healthy
+
+        await asyncio.gather(*(probe(backend) for backend in self.backends))
+
+    async def _health_loop(self):
+        while True:
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.error(f"TTS health check failed: {str(e)}", exc_info=True)
+            await asyncio.sleep(TTS_HEALTH_CHECK_INTERVAL_SECONDS)
+
+    async def start(self):
+        """Open the backend clients and start background health probing."""
+        for backend in self.backends:
+            backend.client
+        if self._health_task is None and TTS_HEALTH_CHECK_INTERVAL_SECONDS > 0:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def close(self):
+        """Stop health probing and close every backend's connections."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for backend in self.backends:
+            await backend.close()
+
+    def snapshot(self) -> List[Dict]:
+        """Return the state and statistics of every backend."""
+        return [backend.snapshot() for backend in self.backends]
+
+
+# Create a singleton instance
+tts_backend_pool = TTSBackendPool()
@@ -0,0 +1,254 @@
+"""
+Persistent, content-addressed cache for synthesized speech.
+
+Audio is stored on disk under a hash of everything that determines the
+synthesized bytes (text, voice, speed, format, model and language), so replays
+of the same AI message never reach the TTS backend again. The store is bounded
+by TTS_CACHE_MAX_BYTES and evicts the least recently played entries first.
+
+Disk access stays off the event loop: the index is built by load() in a worker
+thread at startup, and streamed audio is written by a dedicated writer thread.
+Async callers run get() through asyncio.to_thread.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Kept outside app/uploads, which is served publicly; audio is only served
+# through the authenticated speech endpoint
+TTS_CACHE_DIR = Path(os.getenv("TTS_CACHE_DIR", "app/data/tts_cache"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+
+def build_tts_cache_key(
+    text: str,
+    voice_name: str,
+    speed: float,
+    response_format: str,
+    model_name: str = "kokoro",
+    lang_code: str = "en-US"
+) -> str:
+    """
+    Build the cache key for a synthesis request.
+
+    Args:
+        text: Text to synthesize
+        voice_name: TTS voice
+        speed: Playback speed
+        response_format: Audio format, e.g. "mp3"
+        model_name: TTS model
+        lang_code: Language code
+
+    Returns:
+        str: Hex SHA-256 digest identifying the audio
+    """
+    material = json.dumps(
+        [text, voice_name, float(speed), response_format, model_name, lang_code],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    On-disk audio store with size-bounded LRU eviction.
+
+    Entries live at <directory>/<key[:2]>/<key>.<format>. Recency is kept in
+    memory and mirrored to file access times, so the LRU order survives
+    restarts while modification times keep recording when the audio was made.
+    """
+
+    def __init__(self, directory: Path = TTS_CACHE_DIR, max_bytes: int = TTS_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Path]" = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        # One thread writes every streamed entry, in the order chunks arrive
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-cache-writer")
+
+    def _path_for(self, key: str, response_format: str) -> Path:
+        return self.directory / key[:2] / f"{key}.{response_format}"
+
+    async def load(self):
+        """Index the entries already on disk in a worker thread."""
+        def load_locked():
+            with self._lock:
+                self._load()
+
+        await asyncio.to_thread(load_locked)
+
+    def _load(self):
+        """Index existing entries, oldest first. Must be called with the lock held."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.directory.exists():
+            return
+        files = [path for path in self.directory.glob("*/*") if path.is_file() and not path.name.startswith(".")]
+        for path in sorted(files, key=lambda p: p.stat().st_atime):
+            key = path.stem
+            size = path.stat().st_size
+            self._entries[key] = path
+            self._sizes[key] = size
+            self._total_bytes += size
+        logger.info(f"TTS cache loaded {len(self._entries)} entries ({self._total_bytes} bytes)")
+        self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the store fits. Lock must be held."""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, path = self._entries.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(key, 0)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            logger.debug(f"Evicted TTS cache entry {key}")
+
+    def contains(self, key: str) -> bool:
+        """
+        Check the in-memory index for an entry without touching the disk.
+
+        Entries are only known once the index was loaded (see load()); before
+        that every key is reported as missing.
+
+        Args:
+            key: Cache key from build_tts_cache_key
+
+        Returns:
+            bool: Whether the entry is indexed
+        """
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: str) -> Optional[Path]:
+        """
+        Look up cached audio and mark it as recently used.
+
+        Checks the file on disk, so async callers run it in a worker thread.
+
+        Args:
+            key: Cache key from build_tts_cache_key
+
+        Returns:
+            Optional[Path]: Path to the audio file, or None on a miss
+        """
+        with self._lock:
+            self._load()
+            path = self._entries.get(key)
+            if path is None:
+                return None
+            if not path.exists():
+                self._entries.pop(key)
+                self._total_bytes -= self._sizes.pop(key, 0)
+                return None
+            self._entries.move_to_end(key)
+        try:
+            os.utime(path, (time.time(), path.stat().st_mtime))
+        except OSError:
+            pass
+        return path
+
+    def put(self, key: str, response_format: str, audio: bytes) -> Path:
+        """
+        Store complete audio.
+
+        Args:
+            key: Cache key from build_tts_cache_key
+            response_format: Audio format, used as the file extension
+            audio: Audio bytes
+
+        Returns:
+            Path: Path of the stored file
+        """
+        temp_path = self._temp_path(key)
+        temp_path.write_bytes(audio)
+        return self._commit(key, response_format, temp_path)
+
+    async def tee(self, key: str, response_format: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        Pass an audio stream through while writing it into the cache.
+
+        The entry is only committed once the stream finished; an interrupted
+        stream (upstream error or client disconnect) leaves no partial entry.
+        File operations run on the writer thread, so the event loop never
+        blocks on the disk.
+
+        Args:
+            key: Cache key from build_tts_cache_key
+            response_format: Audio format, used as the file extension
+            chunks: Audio stream from the TTS backend
+
+        Yields:
+            bytes: The unchanged audio chunks
+        """
+        loop = asyncio.get_running_loop()
+        f, temp_path = await loop.run_in_executor(self._writer, self._open_temp, key)
+        completed = False
+        try:
+            async for chunk in chunks:
+                await loop.run_in_executor(self._writer, f.write, chunk)
+                yield chunk
+            completed = True
+        finally:
+            # Queued behind any write still running, even if this task was cancelled
+            await loop.run_in_executor(self._writer, self._finish_temp, f, key, response_format, temp_path, completed)
+
+    def _temp_path(self, key: str) -> Path:
+        directory = self.directory / key[:2]
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / f".{key}.{uuid.uuid4().hex}.part"
+
+    def _open_temp(self, key: str):
+        temp_path = self._temp_path(key)
+        return open(temp_path, "wb"), temp_path
+
+    def _finish_temp(self, f, key: str, response_format: str, temp_path: Path, completed: bool):
+        """Close a streamed temp file and commit it, or drop it if the stream was cut short."""
+        f.close()
+        if completed:
+            self._commit(key, response_format, temp_path)
+        else:
+            temp_path.unlink(missing_ok=True)
+
+    def _commit(self, key: str, response_format: str, temp_path: Path) -> Path:
+        """Move a finished temp file into place and account for its size."""
+        path = self._path_for(key, response_format)
+        size = temp_path.stat().st_size
+        os.replace(temp_path, path)
+        with self._lock:
+            self._load()
+            if key in self._entries:
+                self._total_bytes -= self._sizes.get(key, 0)
+            self._entries[key] = path
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._total_bytes += size
+            self._evict()
+        return path
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes currently stored."""
+        with self._lock:
+            self._load()
+            return self._total_bytes
+
+
+# Create a singleton instance
+tts_cache = TTSCache()
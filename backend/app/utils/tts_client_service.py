@@ -2,18 +2,44 @@
 import httpx
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 import os
 import random
 import logging
-logging.basicConfig(level=logging.INFO)
+from typing import Dict, Optional
+
+from app.utils.tts_backend_pool import NoTTSBackendAvailableError, tts_backend_pool
 
 logger = logging.getLogger(__name__)
-# Update to use the container name with correct port in the Docker network
-TTS_BACKEND_BASE_URL = os.getenv("TTS_BACKEND_BASE_URL", "http://tts_kokoro:8880")
 # Path for the TTS endpoint
 TTS_ENDPOINT_PATH = "/v1/audio/speech"
 TTS_MODEL_NAME = "kokoro"  # Default TTS model
 TTS_VOICE_NAME = "af_heart"  # Default voice
+# Defaults used for AI message playback; pre-rendered audio must match them
+DEFAULT_SPEECH_SPEED = 1.3
+DEFAULT_RESPONSE_FORMAT = "mp3"
+DEFAULT_LANG_CODE = "en-US"
+# Output formats kokoro can produce, most bandwidth-efficient first
+SUPPORTED_AUDIO_FORMATS = ["opus", "aac", "mp3", "flac", "wav", "pcm"]
+# Raw PCM from kokoro is 16-bit little-endian mono at this rate
+PCM_SAMPLE_RATE = 24000
+# Media types (from the Accept header) that select an output format
+ACCEPT_MEDIA_TYPES = {
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+    "application/ogg": "opus",
+    "audio/aac": "aac",
+    "audio/mp4": "aac",
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/flac": "flac",
+    "audio/wav": "wav",
+    "audio/wave": "wav",
+    "audio/x-wav": "wav",
+    "audio/pcm": "pcm",
+    "audio/l16": "pcm",
+    "application/octet-stream": "pcm"
+}
 
 
     
@@ -22,6 +48,228 @@ FEMALE = ["af_aoede", "af_heart", "bf_v0isabella"]
 
 
 
+def get_audio_media_type(response_format: str) -> str:
+    """
+    Return the Content-Type for a TTS output format.
+    
+    Args:
+        response_format (str): Audio format, e.g. "mp3"
+        
+    Returns:
+        str: The matching media type
+    """
+    if response_format == "mp3":
+        return "audio/mpeg"
+    if response_format == "opus":
+        return "audio/ogg; codecs=opus"
+    if response_format == "pcm":
+        return "application/octet-stream"
+    return f"audio/{response_format}"
+
+
+def negotiate_audio_format(
+    accept: Optional[str] = None,
+    requested: Optional[str] = None,
+    default: str = DEFAULT_RESPONSE_FORMAT
+) -> str:
+    """
+    Choose the speech output format for a client.
+    
+    An explicit `format` query parameter wins. Otherwise the Accept header is
+    matched against the supported formats by q-value, preferring the more
+    compact format on ties. Wildcards and unknown types fall back to the default.
+    
+    Args:
+        accept (Optional[str]): The request's Accept header
+        requested (Optional[str]): Format named by the client, e.g. "opus"
+        default (str): Format for clients without a preference
+        
+    Returns:
+        str: One of SUPPORTED_AUDIO_FORMATS
+        
+    Raises:
+        HTTPException: If the requested format is not supported
+    """
+    if requested:
+        requested = requested.lower()
+        if requested not in SUPPORTED_AUDIO_FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported audio format '{requested}'. Use one of: {', '.join(SUPPORTED_AUDIO_FORMATS)}"
+            )
+        return requested
+
+    best_format, best_q = None, 0.0
+    for media_range in (accept or "").split(","):
+        media_type, _, params = media_range.partition(";")
+        response_format = ACCEPT_MEDIA_TYPES.get(media_type.strip().lower())
+        if response_format is None:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q or (
+            q == best_q and q > 0
+            and SUPPORTED_AUDIO_FORMATS.index(response_format) < SUPPORTED_AUDIO_FORMATS.index(best_format)
+        ):
+            best_format, best_q = response_format, q
+    return best_format or default
+
+
+def get_audio_headers(response_format: str) -> Dict[str, str]:
+    """
+    Return response headers describing negotiated speech audio.
+    
+    Args:
+        response_format (str): The negotiated audio format
+        
+    Returns:
+        Dict[str, str]: Vary for caches, plus the sample layout for raw PCM
+    """
+    headers = {"Vary": "Accept"}
+    if response_format == "pcm":
+        headers.update({
+            "X-Audio-Encoding": "s16le",
+            "X-Audio-Sample-Rate": str(PCM_SAMPLE_RATE),
+            "X-Audio-Channels": "1"
+        })
+    return headers
+
+
+async def start_tts_client():
+    """Open the TTS backend pool and start health probing. Called on application startup."""
+    await tts_backend_pool.start()
+    logger.info(f"TTS backend pool ready with {len(tts_backend_pool.backends)} backend(s)")
+
+
+async def close_tts_client():
+    """Close the TTS backend pool and its pooled connections. Called on shutdown."""
+    await tts_backend_pool.close()
+
+
+class LeasedAudioStream:
+    """
+    Audio chunks of a streamed TTS response that holds a backend lease.
+    
+    Closing the stream closes the upstream response and releases the lease,
+    whether or not it was ever iterated, so a StreamingResponse that is never
+    sent (or whose client disconnects before the body starts) does not keep
+    the backend's request slot.
+    
+    Args:
+        response (httpx.Response): The streamed 200 response from the backend
+        lease (TTSBackendLease): The lease returned with it
+    """
+
+    def __init__(self, response: httpx.Response, lease):
+        self._response = response
+        self._lease = lease
+        self._chunks = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self._chunks is None:
+            self._chunks = self._response.aiter_bytes()
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            await self.aclose()
+            raise
+        except httpx.StreamClosed as e:
+            logger.error(f"StreamClosed error during aiter_bytes in generator: {e}", exc_info=True)
+            await self.aclose()
+            raise
+        except Exception as e:
+            logger.error(f"Exception in streaming generator: {e}", exc_info=True)
+            await self.aclose()
+            raise
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self):
+        """Close the upstream response and release the lease. Safe to call more than once."""
+        try:
+            if self._chunks is not None:
+                await self._chunks.aclose()
+            # Returns the connection to the backend's pool and frees its request slot
+            if not self._response.is_closed:
+                await self._response.aclose()
+        finally:
+            self._lease.release()
+
+
+async def _send_tts_request(payload: dict, headers: Optional[dict] = None, stream: bool = True):
+    """
+    Send a synthesis request through the TTS backend pool.
+    
+    Transport errors and 5xx answers count against the backend's circuit breaker
+    and the request is retried on the next least loaded backend.
+    
+    Args:
+        payload (dict): JSON body for the TTS endpoint
+        headers (Optional[dict]): Request headers
+        stream (bool): Leave the body unread for streaming
+        
+    Returns:
+        Tuple[httpx.Response, TTSBackendLease]: The 200 response and the lease
+            to release once the response is closed
+        
+    Raises:
+        HTTPException: If no backend produced the audio
+    """
+    tried = []
+    last_error = None
+    while True:
+        try:
+            lease = tts_backend_pool.acquire(exclude=tried)
+        except NoTTSBackendAvailableError:
+            if last_error is not None:
+                raise last_error
+            logger.error("No TTS backend available")
+            raise HTTPException(status_code=503, detail="TTS Service unavailable: no healthy backend")
+
+        tried.append(lease.backend)
+        try:
+            request = lease.client.build_request("POST", TTS_ENDPOINT_PATH, json=payload, headers=headers)
+            response = await lease.client.send(request, stream=stream)
+        except (httpx.TimeoutException, httpx.RequestError) as e:
+            logger.error(f"TTS Service communication error ({lease.backend.base_url}): {e}")
+            lease.failure(type(e).__name__)
+            lease.release()
+            status_code = 504 if isinstance(e, httpx.TimeoutException) else 503
+            last_error = HTTPException(status_code=status_code, detail=f"TTS Service communication error: {str(e)}")
+            continue
+        except BaseException:
+            lease.release()
+            raise
+        logger.debug(f"TTS response status: {response.status_code} from {lease.backend.base_url}")
+
+        if response.status_code == 200:
+            lease.success()
+            return response, lease
+
+        error_content = await response.aread()
+        await response.aclose()
+        error_detail = f"TTS Service error ({response.status_code}): {error_content.decode(errors='replace')}"
+        logger.error(f"{error_detail} from {lease.backend.base_url}")
+        last_error = HTTPException(status_code=response.status_code, detail=error_detail)
+        if response.status_code < 500:
+            # The request itself was rejected; another backend would do the same
+            lease.success()
+            lease.release()
+            raise last_error
+        lease.failure(f"HTTP {response.status_code}")
+        lease.release()
+
+
 async def get_speech_from_tts_service(
     text_to_speak: str,
     voice_name: str, # e.g., "af_heart"
@@ -33,7 +281,6 @@ async def get_speech_from_tts_service(
     """
     Calls the external TTS Service to convert text to speech and streams the audio.
     """
-    tts_request_url = f"{TTS_BACKEND_BASE_URL}{TTS_ENDPOINT_PATH}"
     payload = {
         "model": model_name,
         "input": text_to_speak,
@@ -61,69 +308,73 @@ async def get_speech_from_tts_service(
     if response_format == "mp3":
         headers["Accept"] = "audio/mpeg"
 
-    client = httpx.AsyncClient(timeout=60.0)
-    response_stream = None  # Initialize to None to hold the actual response object
+    logger.debug(
+        f"Sending TTS request (voice={voice_name}, format={response_format}, chars={len(text_to_speak)})",
+        extra={"payload": payload}
+    )
+    response_stream, lease = await _send_tts_request(payload, headers=headers, stream=True)
+    audio_stream = LeasedAudioStream(response_stream, lease)
 
     try:
-        request = client.build_request("POST", tts_request_url, json=payload, headers=headers)
-        logger.info(f"DEBUG: Sending TTS request to: {request.url}")
-        logger.info(f"DEBUG: TTS Payload: {payload}") # Keep payload logging for now
-        logger.info(f"DEBUG: TTS Headers: {request.headers}")
-
-        response_stream = await client.send(request, stream=True)
-        logger.info(f"DEBUG: TTS response status: {response_stream.status_code}")
-
-        if response_stream.status_code != 200:
-            error_content = await response_stream.aread()
-            if not response_stream.is_closed:
-                await response_stream.aclose()
-            await client.aclose() # Client must be closed here as StreamingResponse won't be returned
-            error_detail = f"TTS Service error ({response_stream.status_code}): {error_content.decode()}"
-            logger.error(error_detail)
-            raise HTTPException(status_code=response_stream.status_code, detail=error_detail)
-        
-        async def generator_func(current_response, client_to_close):
-            try:
-                async for chunk in current_response.aiter_bytes():
-                    yield chunk
-            except httpx.StreamClosed as e:
-                logger.error(f"StreamClosed error during aiter_bytes in generator: {e}", exc_info=True)
-                raise
-            except Exception as e:
-                logger.error(f"Exception in streaming generator: {e}", exc_info=True)
-                raise
-            finally:
-                logger.info("DEBUG: Generator finally block: Closing response stream.")
-                if current_response is not None and not current_response.is_closed:
-                    await current_response.aclose()
-                logger.info("DEBUG: Generator finally block: Closing client.")
-                if client_to_close is not None: # httpx.AsyncClient.aclose() is idempotent
-                    await client_to_close.aclose()
-
-        media_type = response_stream.headers.get("content-type", "audio/mpeg" if response_format == "mp3" else "application/octet-stream")
-           
-        return StreamingResponse(generator_func(response_stream, client), media_type=media_type)
-
-    except (httpx.TimeoutException, httpx.RequestError) as e:
-        logger.error(f"TTS Service communication error: {e}", exc_info=True)
-        if response_stream is not None and not response_stream.is_closed:
-            await response_stream.aclose()
-        if client is not None: # client is always defined here
-            await client.aclose()
-        status_code = 504 if isinstance(e, httpx.TimeoutException) else 503
-        raise HTTPException(status_code=status_code, detail=f"TTS Service communication error: {str(e)}")
+        # Same Content-Type as cached copies of the audio, whatever the backend reports
+        media_type = get_audio_media_type(response_format)
+
+        # The stream closes itself once exhausted; the background task closes it
+        # after the response is sent even if the body was never iterated.
+        # Callers consuming body_iterator directly must close it (e.g. with aclosing)
+        return StreamingResponse(audio_stream, media_type=media_type, background=BackgroundTask(audio_stream.aclose))
+
     except Exception as e: 
         logger.error(f"ERROR: Unexpected error in get_speech_from_tts_service: {str(e)}", exc_info=True)
-        if response_stream is not None and not response_stream.is_closed:
-            await response_stream.aclose()
-        if client is not None: # client is always defined here
-            await client.aclose()
-        if isinstance(e, HTTPException): # Re-raise if it's already an HTTPException
-            raise
+        await audio_stream.aclose()
         raise HTTPException(status_code=500, detail=f"Unexpected error during TTS request: {str(e)}")
 
 
 
+async def synthesize_speech_bytes(
+    text_to_speak: str,
+    voice_name: str,
+    model_name: str = TTS_MODEL_NAME,
+    response_format: str = DEFAULT_RESPONSE_FORMAT,
+    speed: float = DEFAULT_SPEECH_SPEED,
+    lang_code: str = DEFAULT_LANG_CODE
+) -> bytes:
+    """
+    Calls the external TTS Service and returns the complete audio as bytes.
+    
+    Used by offline jobs that store audio instead of streaming it to a client.
+    
+    Args:
+        text_to_speak (str): Text to synthesize
+        voice_name (str): Kokoro voice name, e.g. "af_heart"
+        model_name (str): TTS model name
+        response_format (str): Audio format, e.g. "mp3"
+        speed (float): Playback speed
+        lang_code (str): Language code
+        
+    Returns:
+        bytes: The synthesized audio
+        
+    Raises:
+        HTTPException: If the TTS service returns an error or cannot be reached
+    """
+    payload = {
+        "model": model_name,
+        "input": text_to_speak,
+        "voice": voice_name,
+        "response_format": response_format,
+        "download_format": response_format,
+        "speed": speed,
+        "stream": False,
+        "return_download_link": False,
+        "lang_code": lang_code
+    }
+
+    response, lease = await _send_tts_request(payload, stream=False)
+    lease.release()
+    return response.content
+
+
 def pick_suitable_voice_name(gender:str) -> str:
     """   
     Returns a random voice name based on the specified gender.
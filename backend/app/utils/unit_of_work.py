@@ -0,0 +1,119 @@
+"""
+Unit of work: the writes of one logical operation, applied together.
+
+Callers queue inserts and updates while they work and commit once at the end,
+so nothing is written if the operation fails halfway (e.g. a turn whose AI
+reply could not be generated leaves no orphan user message). Commit sends one
+ordered bulk_write per collection instead of one round trip per write.
+
+With DB_TRANSACTIONS_ENABLED the bulk writes also run in a multi-document
+transaction, so readers never see half of a commit either. Transactions need a
+replica set or sharded cluster; a standalone mongod rejects them.
+
+After a commit the request's identity map holds the inserted documents and
+no longer holds the updated ones.
+
+    uow = UnitOfWork()
+    uow.insert("messages", message.to_dict())
+    uow.update("conversations", {"_id": conversation_id}, {"$inc": {"message_count": 1}})
+    await uow.commit()
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Tuple, Union
+
+from pymongo import InsertOne, UpdateOne
+
+from app.config.database import client, db, get_async_client, get_async_database
+from app.utils.identity_map import forget, remember
+
+logger = logging.getLogger(__name__)
+
+# Wrap commits in a transaction (requires a replica set)
+DB_TRANSACTIONS_ENABLED = os.getenv("DB_TRANSACTIONS_ENABLED", "false").lower() == "true"
+
+WriteOperation = Union[InsertOne, UpdateOne]
+
+
+class UnitOfWork:
+    """
+    Collects writes and applies them in as few round trips as possible.
+
+    Writes to one collection keep their queuing order; collections are
+    written in the order they were first used.
+    """
+
+    def __init__(self, transactional: bool = DB_TRANSACTIONS_ENABLED):
+        """
+        Args:
+            transactional: Run the commit in a transaction
+        """
+        self.transactional = transactional
+        self._operations: Dict[str, List[WriteOperation]] = {}
+        self._inserted: List[Tuple[str, Dict[str, Any]]] = []
+        self._updated: List[Tuple[str, Any]] = []
+
+    def insert(self, collection: str, document: Dict[str, Any]) -> None:
+        """Queue the insert of a document (which should carry its own _id)."""
+        self._operations.setdefault(collection, []).append(InsertOne(document))
+        self._inserted.append((collection, document))
+
+    def update(self, collection: str, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False) -> None:
+        """Queue an update of the first document matching filter."""
+        self._operations.setdefault(collection, []).append(UpdateOne(filter, update, upsert=upsert))
+        if "_id" in filter:
+            self._updated.append((collection, filter["_id"]))
+
+    def __len__(self) -> int:
+        return sum(len(operations) for operations in self._operations.values())
+
+    async def commit(self) -> None:
+        """
+        Apply the queued writes on the async client. Used on the request path.
+
+        Raises:
+            PyMongoError: If a write fails (the transaction, if any, is aborted)
+        """
+        operations, self._operations = self._operations, {}
+        database = get_async_database()
+
+        async def apply(session=None):
+            for collection, writes in operations.items():
+                await database[collection].bulk_write(writes, ordered=True, session=session)
+
+        if self.transactional:
+            async with get_async_client().start_session() as session:
+                await session.with_transaction(apply)
+        else:
+            await apply()
+        self._update_identity_map()
+
+    def commit_blocking(self) -> None:
+        """
+        Apply the queued writes on the blocking client. Used in worker threads.
+
+        Raises:
+            PyMongoError: If a write fails (the transaction, if any, is aborted)
+        """
+        operations, self._operations = self._operations, {}
+
+        def apply(session=None):
+            for collection, writes in operations.items():
+                db[collection].bulk_write(writes, ordered=True, session=session)
+
+        if self.transactional:
+            with client.start_session() as session:
+                session.with_transaction(apply)
+        else:
+            apply()
+        self._update_identity_map()
+
+    def _update_identity_map(self) -> None:
+        """Register committed inserts and drop updated documents from the identity map."""
+        inserted, self._inserted = self._inserted, []
+        updated, self._updated = self._updated, []
+        for collection, document in inserted:
+            remember(collection, document)
+        for collection, document_id in updated:
+            forget(collection, document_id)
@@ -0,0 +1,81 @@
+"""
+In-process cache of authenticated users.
+
+get_current_user runs on every authenticated request; the cache keeps the
+user documents it loads for AUTH_USER_CACHE_TTL_SECONDS, keyed by the token
+subject (the email), so steady-state requests authenticate without a database
+read. Writes to a user invalidate its entry in this process; other worker
+processes see the change once their entry expires, so the TTL bounds how long
+a profile change or deletion takes to reach every worker.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# How long a loaded user is reused (0 disables the cache)
+AUTH_USER_CACHE_TTL_SECONDS = float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "30"))
+# Maximum number of cached users; the least recently used are evicted
+AUTH_USER_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_USER_CACHE_MAX_ENTRIES", "10000"))
+
+
+class UserCache:
+    """Bounded LRU cache of user documents with a time-to-live."""
+
+    def __init__(self, ttl_seconds: float = AUTH_USER_CACHE_TTL_SECONDS, max_entries: int = AUTH_USER_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, subject: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached user.
+
+        Args:
+            subject: The token subject (email)
+
+        Returns:
+            Optional[Dict[str, Any]]: A copy of the user document, or None if
+                it is not cached or has expired
+        """
+        entry = self._entries.get(subject)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[subject]
+            return None
+        self._entries.move_to_end(subject)
+        # Handlers may modify current_user; keep the cached document intact
+        return dict(user)
+
+    def put(self, subject: str, user: Dict[str, Any]) -> None:
+        """
+        Cache a user document.
+
+        Args:
+            subject: The token subject (email)
+            user: The user document
+        """
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[subject] = (time.monotonic() + self.ttl_seconds, dict(user))
+        self._entries.move_to_end(subject)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str) -> None:
+        """Drop a user after it was modified."""
+        self._entries.pop(subject, None)
+
+    def clear(self) -> None:
+        """Drop every cached user."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Create a singleton instance
+user_cache = UserCache()
@@ -0,0 +1,14 @@
+"""
+Load-test harness for the conversation loop.
+
+Runs scripted virtual users (register, login, create conversation, audio2text,
+message, speech, feedback) against the API while Gemini, the kokoro TTS service
+and Whisper are replaced by local stand-ins with configurable latency and error
+rates. Reports p50/p95/p99 latency and throughput per endpoint.
+
+Usage (from the backend directory):
+    python -m loadtest run --users 20 --duration 60
+    python -m loadtest run --target http://localhost:8000 --users 50
+    python -m loadtest fakes
+    python -m loadtest serve --mongomock
+"""
@@ -0,0 +1,170 @@
+"""
+Command line entry point for the load-test harness.
+
+    python -m loadtest run      # start fakes and the API, run users, print the report
+    python -m loadtest fakes    # only run the fake Gemini and TTS servers
+    python -m loadtest serve    # only run the API wired to the fakes
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from loadtest.fakes import LatencyProfile
+from loadtest.server import serve_app, serve_fakes
+from loadtest.users import run_virtual_users
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _add_fake_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--gemini-port", type=int, default=8931)
+    parser.add_argument("--tts-port", type=int, default=8932)
+    parser.add_argument("--gemini-latency", default="0.8:0.5", help="Gemini latency as median_seconds[:sigma]")
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0, help="Share of Gemini calls that fail")
+    parser.add_argument("--gemini-error-status", type=int, default=503, help="HTTP status of injected Gemini failures")
+    parser.add_argument("--tts-latency", default="0.3:0.4", help="TTS time to first byte as median_seconds[:sigma]")
+    parser.add_argument("--tts-error-rate", type=float, default=0.0, help="Share of TTS calls that fail")
+
+
+def _add_app_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--app-port", type=int, default=8930)
+    parser.add_argument("--transcription-latency", default="0.4:0.3", help="Whisper stand-in latency as median_seconds[:sigma]")
+    parser.add_argument("--real-transcription", action="store_true", help="Use the real Whisper model")
+    parser.add_argument("--mongomock", action="store_true", help="Use an in-memory database instead of MONGODB_URL")
+
+
+def _fake_command(args) -> list:
+    return [
+        sys.executable, "-m", "loadtest", "fakes",
+        "--host", args.host,
+        "--gemini-port", str(args.gemini_port),
+        "--tts-port", str(args.tts_port),
+        "--gemini-latency", args.gemini_latency,
+        "--gemini-error-rate", str(args.gemini_error_rate),
+        "--gemini-error-status", str(args.gemini_error_status),
+        "--tts-latency", args.tts_latency,
+        "--tts-error-rate", str(args.tts_error_rate)
+    ]
+
+
+def _app_command(args) -> list:
+    command = _fake_command(args)
+    command[3] = "serve"
+    command += ["--app-port", str(args.app_port), "--transcription-latency", args.transcription_latency]
+    if args.real_transcription:
+        command.append("--real-transcription")
+    if args.mongomock:
+        command.append("--mongomock")
+    return command
+
+
+def _wait_until_up(url: str, timeout: float = 120.0):
+    """Wait until `url` answers any HTTP response."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    raise SystemExit(f"Timed out waiting for {url}")
+
+
+def command_run(args):
+    processes = []
+    target = args.target
+    try:
+        if target is None:
+            processes.append(subprocess.Popen(_fake_command(args), cwd=BACKEND_DIR))
+            processes.append(subprocess.Popen(_app_command(args), cwd=BACKEND_DIR))
+            target = f"http://{args.host}:{args.app_port}"
+            _wait_until_up(f"http://{args.host}:{args.tts_port}/health")
+            _wait_until_up(f"{target}/")
+
+        logger.info(f"Running {args.users} virtual users against {target} for {args.duration}s")
+        report = asyncio.run(run_virtual_users(
+            target,
+            users=args.users,
+            duration=args.duration,
+            ramp_up=args.ramp_up,
+            think_time=args.think_time,
+            feedback_timeout=args.feedback_timeout
+        ))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+    print(report.format_table())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.summary(), f, indent=2)
+        logger.info(f"Wrote JSON report to {args.json}")
+
+
+def command_fakes(args):
+    serve_fakes(
+        args.host,
+        args.gemini_port,
+        args.tts_port,
+        LatencyProfile.parse(args.gemini_latency, args.gemini_error_rate, args.gemini_error_status),
+        LatencyProfile.parse(args.tts_latency, args.tts_error_rate)
+    )
+
+
+def command_serve(args):
+    serve_app(
+        args.host,
+        args.app_port,
+        gemini_url=f"http://{args.host}:{args.gemini_port}",
+        tts_url=f"http://{args.host}:{args.tts_port}",
+        transcription_profile=LatencyProfile.parse(args.transcription_latency),
+        real_transcription=args.real_transcription,
+        mongomock=args.mongomock
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Load-test the conversation loop.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run virtual users and print a latency report")
+    _add_fake_arguments(run_parser)
+    _add_app_arguments(run_parser)
+    run_parser.add_argument("--target", help="Base URL of an already running API; skips starting fakes and the API")
+    run_parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    run_parser.add_argument("--duration", type=float, default=60.0, help="Run length in seconds")
+    run_parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds over which users start")
+    run_parser.add_argument("--think-time", type=float, default=1.0, help="Mean pause between turns in seconds")
+    run_parser.add_argument("--feedback-timeout", type=float, default=30.0, help="Seconds to wait for feedback per turn")
+    run_parser.add_argument("--json", help="Also write the report as JSON to this file")
+    run_parser.set_defaults(func=command_run)
+
+    fakes_parser = subparsers.add_parser("fakes", help="Run the fake Gemini and TTS servers")
+    _add_fake_arguments(fakes_parser)
+    fakes_parser.set_defaults(func=command_fakes)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the API wired to the fake upstreams")
+    _add_fake_arguments(serve_parser)
+    _add_app_arguments(serve_parser)
+    serve_parser.set_defaults(func=command_serve)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Local stand-ins for Gemini and the kokoro TTS service.
+
+Both are small FastAPI apps speaking the same wire protocol as the real
+services, so the application's real clients (google-generativeai over REST and
+httpx) are exercised end to end. Each fake draws its latency from a log-normal
+distribution and fails a configurable share of requests.
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+class LatencyProfile:
+    """
+    Latency and error distribution of a fake upstream.
+
+    Latency is log-normal around `median` seconds with shape `sigma`, which gives
+    the long right tail real LLM and TTS services show.
+    """
+
+    def __init__(
+        self,
+        median: float,
+        sigma: float = 0.5,
+        error_rate: float = 0.0,
+        error_status: int = 503
+    ):
+        self.median = median
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+    @classmethod
+    def parse(cls, spec: str, error_rate: float = 0.0, error_status: int = 503) -> "LatencyProfile":
+        """
+        Build a profile from a "median[:sigma]" string, e.g. "0.8:0.5".
+
+        Args:
+            spec: Median latency in seconds, optionally followed by the sigma
+            error_rate: Share of requests that fail, between 0 and 1
+            error_status: HTTP status returned for failed requests
+
+        Returns:
+            The parsed profile
+        """
+        median, _, sigma = spec.partition(":")
+        return cls(float(median), float(sigma) if sigma else 0.5, error_rate, error_status)
+
+    def sample_latency(self) -> float:
+        """Draw a latency in seconds."""
+        if self.median <= 0:
+            return 0.0
+        return random.lognormvariate(math.log(self.median), self.sigma)
+
+    def should_fail(self) -> bool:
+        """Decide whether the current request fails."""
+        return random.random() < self.error_rate
+
+
+REPLY_SENTENCES = [
+    "That sounds great.",
+    "Could you tell me a little more about that?",
+    "I see what you mean.",
+    "How long have you been doing that?",
+    "Let me check that for you.",
+    "What would you like to do next?",
+    "Thank you for waiting.",
+    "Is there anything else I can help you with today?"
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used for the fake usage metadata."""
+    return max(1, len(text) // 4)
+
+
+def batch_item_ids(prompt: str) -> List[str]:
+    """Return the item ids of a batch feedback prompt."""
+    return re.findall(r"### Item id: (\S+)", prompt)
+
+
+def _fake_feedback(item_id: Optional[str] = None) -> Dict[str, Any]:
+    """Feedback object matching FEEDBACK_RESPONSE_SCHEMA."""
+    feedback = {
+        "user_feedback": "Bạn nói khá tốt! Hãy chú ý thì của động từ.",
+        "grammar_issues": [{
+            "issue": "I go there yesterday",
+            "correction": "I went there yesterday",
+            "explanation": "Use the past tense for finished actions.",
+            "severity": 3
+        }],
+        "vocabulary_issues": [{
+            "original": "very good",
+            "better_alternative": "excellent",
+            "reason": "More natural in this context.",
+            "example_usage": "The service was excellent."
+        }]
+    }
+    if item_id is not None:
+        feedback["id"] = item_id
+    return feedback
+
+
+def fake_gemini_text(prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Produce a plausible answer for each prompt type the application sends.
+
+    Args:
+        prompt: The prompt text
+        generation_config: The request's generationConfig, if any
+
+    Returns:
+        Response text in the format the calling code expects
+    """
+    schema = (generation_config or {}).get("responseSchema") or {}
+
+    if "refined_user_role" in prompt:
+        return json.dumps({
+            "refined_user_role": "Customer",
+            "refined_ai_role": "Waiter",
+            "refined_situation": "Ordering dinner at a busy restaurant",
+            "response": "Good evening! Welcome to our restaurant. What would you like to order?",
+            "ai_gender": random.choice(["female", "male"])
+        })
+    if str(schema.get("type", "")).upper() == "ARRAY" or "### Item id:" in prompt:
+        return json.dumps([_fake_feedback(item_id) for item_id in batch_item_ids(prompt)])
+    if "user_feedback" in prompt or "user_feedback" in json.dumps(schema):
+        return json.dumps(_fake_feedback())
+    if "better_version" in prompt:
+        return json.dumps({
+            "better_version": "Two people are sitting at a table in a bright office.",
+            "explanation": "Added the setting and used the present continuous."
+        })
+    return " ".join(random.sample(REPLY_SENTENCES, 2))
+
+
+def create_fake_gemini_app(profile: LatencyProfile) -> FastAPI:
+    """
+    Create a fake of the Gemini REST API (generateContent only).
+
+    Args:
+        profile: Latency and error distribution
+
+    Returns:
+        FastAPI app to serve with uvicorn
+    """
+    app = FastAPI(title="Fake Gemini")
+
+    @app.post("/{api_version}/models/{model_action}")
+    async def generate_content(api_version: str, model_action: str, request: Request):
+        body = await request.json()
+        await asyncio.sleep(profile.sample_latency())
+
+        if profile.should_fail():
+            return JSONResponse(
+                status_code=profile.error_status,
+                content={"error": {"code": profile.error_status, "message": "Injected failure", "status": "UNAVAILABLE"}}
+            )
+
+        prompt = "\n".join(
+            part.get("text", "")
+            for content in body.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        text = fake_gemini_text(prompt, body.get("generationConfig"))
+        return {
+            "candidates": [{
+                "content": {"parts": [{"text": text}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0
+            }],
+            "usageMetadata": {
+                "promptTokenCount": estimate_tokens(prompt),
+                "candidatesTokenCount": estimate_tokens(text),
+                "totalTokenCount": estimate_tokens(prompt) + estimate_tokens(text)
+            }
+        }
+
+    return app
+
+
+def create_fake_tts_app(
+    profile: LatencyProfile,
+    bytes_per_char: int = 500,
+    seconds_per_char: float = 0.002,
+    chunk_size: int = 4096
+) -> FastAPI:
+    """
+    Create a fake of the kokoro /v1/audio/speech endpoint.
+
+    The first byte arrives after a sampled latency; the rest of the audio is
+    streamed at a rate proportional to the text length.
+
+    Args:
+        profile: Time-to-first-byte and error distribution
+        bytes_per_char: Audio bytes produced per input character
+        seconds_per_char: Synthesis time per input character after the first byte
+        chunk_size: Size of streamed chunks in bytes
+
+    Returns:
+        FastAPI app to serve with uvicorn
+    """
+    app = FastAPI(title="Fake TTS")
+
+    @app.post("/v1/audio/speech")
+    async def speech(request: Request):
+        body = await request.json()
+        await asyncio.sleep(profile.sample_latency())
+
+        if profile.should_fail():
+            return JSONResponse(status_code=profile.error_status, content={"detail": "Injected failure"})
+
+        text = body.get("input", "")
+        total = max(chunk_size, len(text) * bytes_per_char)
+        chunks = math.ceil(total / chunk_size)
+        delay_per_chunk = (len(text) * seconds_per_char) / chunks
+        response_format = body.get("response_format", "mp3")
+        media_type = "audio/mpeg" if response_format == "mp3" else f"audio/{response_format}"
+
+        async def audio_stream():
+            remaining = total
+            while remaining > 0:
+                size = min(chunk_size, remaining)
+                remaining -= size
+                yield b"\x00" * size
+                if delay_per_chunk:
+                    await asyncio.sleep(delay_per_chunk)
+
+        if not body.get("stream", True):
+            await asyncio.sleep(len(text) * seconds_per_char)
+            return StreamingResponse(iter([b"\x00" * total]), media_type=media_type)
+        return StreamingResponse(audio_stream(), media_type=media_type)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return app
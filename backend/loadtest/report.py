@@ -0,0 +1,99 @@
+"""
+Latency and throughput statistics for a load-test run.
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+
+def percentile(samples: List[float], fraction: float) -> Optional[float]:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        samples: Observations
+        fraction: Percentile as a fraction, e.g. 0.95 for p95
+
+    Returns:
+        The percentile, or None if there are no samples
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LoadReport:
+    """
+    Collects per-endpoint request outcomes during a run.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def record(self, endpoint: str, seconds: float, error: Optional[str] = None) -> None:
+        """
+        Record one request.
+
+        Args:
+            endpoint: Endpoint name, e.g. "POST /conversations/{id}/message"
+            seconds: Request latency
+            error: Status code or exception name if the request failed
+        """
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        if error is not None:
+            endpoint_errors = self.errors.setdefault(endpoint, {})
+            endpoint_errors[error] = endpoint_errors.get(error, 0) + 1
+
+    @property
+    def elapsed(self) -> float:
+        """Wall-clock duration of the run in seconds."""
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the run.
+
+        Returns:
+            Dict with the run duration and, per endpoint, count, errors,
+            throughput and mean/p50/p95/p99/max latency in milliseconds
+        """
+        endpoints = {}
+        for endpoint, samples in self.latencies.items():
+            errors = self.errors.get(endpoint, {})
+
+            def ms(value):
+                return None if value is None else round(value * 1000, 1)
+
+            endpoints[endpoint] = {
+                "count": len(samples),
+                "errors": sum(errors.values()),
+                "errors_by_kind": dict(errors),
+                "throughput_rps": round(len(samples) / self.elapsed, 2) if self.elapsed else None,
+                "mean_ms": ms(sum(samples) / len(samples)),
+                "p50_ms": ms(percentile(samples, 0.50)),
+                "p95_ms": ms(percentile(samples, 0.95)),
+                "p99_ms": ms(percentile(samples, 0.99)),
+                "max_ms": ms(max(samples))
+            }
+        return {"elapsed_seconds": round(self.elapsed, 2), "endpoints": endpoints}
+
+    def format_table(self) -> str:
+        """Render the summary as a fixed-width text table."""
+        summary = self.summary()
+        header = f"{'endpoint':<42} {'count':>6} {'err':>5} {'rps':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+        lines = [f"Run time: {summary['elapsed_seconds']}s", header, "-" * len(header)]
+        for endpoint, stats in summary["endpoints"].items():
+            lines.append(
+                f"{endpoint:<42} {stats['count']:>6} {stats['errors']:>5} {stats['throughput_rps'] or 0:>7} "
+                f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9} {stats['max_ms']:>9}"
+            )
+            for kind, count in stats["errors_by_kind"].items():
+                lines.append(f"    {kind}: {count}")
+        return "\n".join(lines)
@@ -0,0 +1,258 @@
+"""
+Processes that the load test runs against: the fake upstreams and the API
+itself wired to them.
+
+The API runs with its real code paths; only the external dependencies are
+swapped:
+- Gemini: google-generativeai is re-configured to use the REST transport
+  against the fake Gemini server
+- TTS: TTS_BACKEND_BASE_URL points at the fake TTS server
+- Whisper: replaced by a stand-in model with sampled transcription latency,
+  unless real transcription is requested
+- MongoDB: the configured MONGODB_URL, or an in-memory mongomock database
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+import types
+
+import uvicorn
+
+from loadtest.fakes import LatencyProfile, create_fake_gemini_app, create_fake_tts_app
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPTS = [
+    "I would like to order a coffee and a sandwich please",
+    "Yesterday I go to the market with my sister",
+    "Can you tell me how long does it take to get there",
+    "I have been working here for three years",
+    "What time the meeting start tomorrow"
+]
+
+
+class FakeWhisperModel:
+    """Stand-in for a loaded Whisper model."""
+
+    def __init__(self, profile: LatencyProfile):
+        self.profile = profile
+
+    def transcribe(self, audio_path: str, **kwargs):
+        # Whisper runs on the request thread, so block like the real model does
+        time.sleep(self.profile.sample_latency())
+        return {"text": random.choice(TRANSCRIPTS)}
+
+
+def install_fake_transcription(profile: LatencyProfile):
+    """
+    Register stand-in `whisper` (and, if missing, `torch`) modules.
+
+    Must run before the application is imported, since the Whisper model is
+    loaded at import time.
+
+    Args:
+        profile: Transcription latency distribution
+    """
+    whisper = types.ModuleType("whisper")
+    whisper.load_model = lambda *args, **kwargs: FakeWhisperModel(profile)
+    sys.modules["whisper"] = whisper
+
+    try:
+        import torch  # noqa: F401
+    except ImportError:
+        torch = types.ModuleType("torch")
+        torch.cuda = types.SimpleNamespace(is_available=lambda: False)
+        sys.modules["torch"] = torch
+
+
+class AsyncMongomockCursor:
+    """Async view of a mongomock cursor, shaped like pymongo's AsyncCursor."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, *args, **kwargs):
+        self._cursor = self._cursor.skip(*args, **kwargs)
+        return self
+
+    def limit(self, *args, **kwargs):
+        self._cursor = self._cursor.limit(*args, **kwargs)
+        return self
+
+    async def to_list(self, length=None):
+        documents = list(self._cursor)
+        return documents if length is None else documents[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self._cursor:
+            yield document
+
+
+class AsyncMongomockCollection:
+    """Async view of a mongomock collection, shaped like pymongo's AsyncCollection."""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        return AsyncMongomockCursor(self._collection.find(*args, **kwargs))
+
+    async def aggregate(self, *args, **kwargs):
+        return AsyncMongomockCursor(self._collection.aggregate(*args, **kwargs))
+
+    def __getattr__(self, name):
+        attribute = getattr(self._collection, name)
+        if not callable(attribute):
+            return attribute
+
+        async def call(*args, **kwargs):
+            return attribute(*args, **kwargs)
+        return call
+
+
+class AsyncMongomockDatabase:
+    """Async view of a mongomock database."""
+
+    def __init__(self, database):
+        self._database = database
+
+    def __getattr__(self, name):
+        return AsyncMongomockCollection(getattr(self._database, name))
+
+    def __getitem__(self, name):
+        return AsyncMongomockCollection(self._database[name])
+
+
+def install_mongomock():
+    """
+    Replace pymongo's sync and async clients with in-memory mongomock clients.
+
+    Must run before the application is imported. All clients share one
+    in-memory store, so the async request path and the blocking worker threads
+    see the same data.
+    """
+    try:
+        import mongomock
+    except ImportError:
+        raise SystemExit("--mongomock requires the mongomock package (pip install mongomock)")
+    import pymongo
+    from mongomock.collection import BulkOperationBuilder
+    from mongomock.store import ServerStore
+
+    store = ServerStore()
+
+    # pymongo's UpdateOne passes a `sort` argument mongomock does not know yet
+    add_update = BulkOperationBuilder.add_update
+    BulkOperationBuilder.add_update = lambda self, *args, sort=None, **kwargs: add_update(self, *args, **kwargs)
+
+    class MongomockClient(mongomock.MongoClient):
+        """Stand-in for pymongo.MongoClient."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, _store=store, **kwargs)
+
+    class AsyncMongomockClient:
+        """Stand-in for pymongo.AsyncMongoClient."""
+
+        def __init__(self, *args, **kwargs):
+            self._client = MongomockClient(*args, **kwargs)
+
+        def __getitem__(self, name):
+            return AsyncMongomockDatabase(self._client[name])
+
+        def get_database(self, name=None, **kwargs):
+            return AsyncMongomockDatabase(self._client.get_database(name, **kwargs))
+
+        async def close(self):
+            self._client.close()
+
+    pymongo.MongoClient = MongomockClient
+    pymongo.AsyncMongoClient = AsyncMongomockClient
+
+
+def serve_app(
+    host: str,
+    port: int,
+    gemini_url: str,
+    tts_url: str,
+    transcription_profile: LatencyProfile,
+    real_transcription: bool = False,
+    mongomock: bool = False
+):
+    """
+    Run the API wired to the fake upstreams. Blocks until interrupted.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind
+        gemini_url: Base URL of the fake Gemini server
+        tts_url: Base URL of the fake TTS server
+        transcription_profile: Latency distribution of the Whisper stand-in
+        real_transcription: Use the real Whisper model instead of the stand-in
+        mongomock: Use an in-memory database instead of MONGODB_URL
+    """
+    os.environ["TTS_BACKEND_BASE_URL"] = tts_url
+    os.environ.setdefault("GEMINI_API_KEY", "loadtest")
+    os.environ.setdefault("JWT_SECRET_KEY", "loadtest-secret")
+
+    if not real_transcription:
+        install_fake_transcription(transcription_profile)
+    if mongomock:
+        install_mongomock()
+
+    from app.main import app
+    import google.generativeai as genai
+
+    # Modules configure Gemini at import time; point every client at the fake
+    genai.configure(
+        api_key=os.environ["GEMINI_API_KEY"],
+        transport="rest",
+        client_options={"api_endpoint": gemini_url}
+    )
+
+    uvicorn.run(app, host=host, port=port, log_level="warning")
+
+
+async def _serve_fakes(
+    host: str,
+    gemini_port: int,
+    tts_port: int,
+    gemini_profile: LatencyProfile,
+    tts_profile: LatencyProfile
+):
+    servers = [
+        uvicorn.Server(uvicorn.Config(create_fake_gemini_app(gemini_profile), host=host, port=gemini_port, log_level="warning")),
+        uvicorn.Server(uvicorn.Config(create_fake_tts_app(tts_profile), host=host, port=tts_port, log_level="warning"))
+    ]
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+def serve_fakes(
+    host: str,
+    gemini_port: int,
+    tts_port: int,
+    gemini_profile: LatencyProfile,
+    tts_profile: LatencyProfile
+):
+    """
+    Run the fake Gemini and TTS servers. Blocks until interrupted.
+
+    Args:
+        host: Interface to bind
+        gemini_port: Port of the fake Gemini server
+        tts_port: Port of the fake TTS server
+        gemini_profile: Gemini latency and error distribution
+        tts_profile: TTS time-to-first-byte and error distribution
+    """
+    asyncio.run(_serve_fakes(host, gemini_port, tts_port, gemini_profile, tts_profile))
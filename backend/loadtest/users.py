@@ -0,0 +1,211 @@
+"""
+Scripted virtual users for the conversation loop.
+
+Each user registers, logs in, creates a conversation and then repeats turns of
+audio2text -> message -> speech -> feedback until the run ends.
+"""
+
+import asyncio
+import io
+import logging
+import random
+import time
+import uuid
+import wave
+from typing import Any, Callable, Optional
+
+import httpx
+
+from loadtest.report import LoadReport
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS = [
+    ("Customer", "Waiter", "Ordering food at a restaurant"),
+    ("Job seeker", "Interviewer", "A job interview for a software engineering position"),
+    ("Tourist", "Hotel receptionist", "Checking in at a hotel"),
+    ("Patient", "Doctor", "A routine health check-up")
+]
+
+FEEDBACK_ENDPOINT = "GET /messages/{id}/feedback"
+FEEDBACK_READY = "feedback ready (time after message)"
+
+
+def make_silent_wav(seconds: float = 1.0, sample_rate: int = 16000) -> bytes:
+    """Build a short silent WAV file to upload as the user's speech."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"\x00\x00" * int(seconds * sample_rate))
+    return buffer.getvalue()
+
+
+class VirtualUser:
+    """
+    One scripted user driving the API.
+
+    Args:
+        client: Shared HTTP client pointed at the API base URL
+        report: Report collecting request outcomes
+        run_id: Identifier making the user's email unique across runs
+        index: Index of the user within the run
+        think_time: Mean pause between turns in seconds
+        feedback_timeout: How long to poll for feedback before giving up
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        report: LoadReport,
+        run_id: str,
+        index: int,
+        think_time: float = 1.0,
+        feedback_timeout: float = 30.0
+    ):
+        self.client = client
+        self.report = report
+        self.email = f"loadtest-{run_id}-{index}@example.com"
+        self.password = "Loadtest123!"
+        self.think_time = think_time
+        self.feedback_timeout = feedback_timeout
+        self.headers = {}
+        self.audio = make_silent_wav()
+
+    async def _request(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        accept: Optional[Callable[[Any], bool]] = None,
+        **kwargs
+    ) -> Optional[httpx.Response]:
+        """
+        Send a request, read the full body and record its latency.
+
+        `accept` can reject a 2xx response by its JSON body, for endpoints that
+        report failures in the body instead of the status code.
+        """
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError as e:
+            self.report.record(name, time.perf_counter() - started, error=type(e).__name__)
+            return None
+        error = None if response.status_code < 400 else str(response.status_code)
+        if error is None and accept is not None and not accept(response.json()):
+            error = "rejected body"
+        self.report.record(name, time.perf_counter() - started, error=error)
+        return response if error is None else None
+
+    async def setup(self) -> Optional[str]:
+        """
+        Register, log in and create a conversation.
+
+        Returns:
+            The conversation ID, or None if any step failed
+        """
+        await self._request(
+            "POST /users/register", "POST", "/api/users/register",
+            json={"name": "Load Tester", "email": self.email, "password": self.password}
+        )
+        response = await self._request(
+            "POST /users/login", "POST", "/api/users/login",
+            data={"username": self.email, "password": self.password}
+        )
+        if response is None:
+            return None
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        user_role, ai_role, situation = random.choice(SCENARIOS)
+        response = await self._request(
+            "POST /conversations", "POST", "/api/conversations",
+            json={"user_role": user_role, "ai_role": ai_role, "situation": situation}
+        )
+        if response is None:
+            return None
+        return response.json()["conversation"]["id"]
+
+    async def turn(self, conversation_id: str) -> None:
+        """Run one speak -> reply -> listen -> feedback turn."""
+        response = await self._request(
+            "POST /audio2text", "POST", "/api/audio2text",
+            accept=lambda body: bool(body.get("audio_id")),
+            files={"audio_file": ("speech.wav", self.audio, "audio/wav")}
+        )
+        if response is None:
+            return
+
+        message_sent = time.perf_counter()
+        response = await self._request(
+            "POST /conversations/{id}/message", "POST", f"/api/conversations/{conversation_id}/message",
+            params={"audio_id": response.json()["audio_id"]}
+        )
+        if response is None:
+            return
+        body = response.json()
+
+        await self._request("GET /messages/{id}/speech", "GET", f"/api/messages/{body['ai_message']['id']}/speech")
+        await self._wait_for_feedback(body["user_message"]["id"], message_sent)
+
+    async def _wait_for_feedback(self, message_id: str, message_sent: float) -> None:
+        """Poll the feedback endpoint until the background feedback is stored."""
+        deadline = message_sent + self.feedback_timeout
+        while time.perf_counter() < deadline:
+            response = await self._request(FEEDBACK_ENDPOINT, "GET", f"/api/messages/{message_id}/feedback")
+            if response is not None and response.json().get("is_ready"):
+                self.report.record(FEEDBACK_READY, time.perf_counter() - message_sent)
+                return
+            await asyncio.sleep(0.5)
+        self.report.record(FEEDBACK_READY, time.perf_counter() - message_sent, error="timeout")
+
+    async def run(self, stop_at: float) -> None:
+        """Set up, then run turns until `stop_at` (a time.perf_counter value)."""
+        conversation_id = await self.setup()
+        if conversation_id is None:
+            return
+        while time.perf_counter() < stop_at:
+            await self.turn(conversation_id)
+            await asyncio.sleep(random.expovariate(1 / self.think_time) if self.think_time > 0 else 0)
+
+
+async def run_virtual_users(
+    base_url: str,
+    users: int,
+    duration: float,
+    ramp_up: float = 5.0,
+    think_time: float = 1.0,
+    feedback_timeout: float = 30.0
+) -> LoadReport:
+    """
+    Run virtual users against the API.
+
+    Args:
+        base_url: API base URL, e.g. http://127.0.0.1:8000
+        users: Number of concurrent virtual users
+        duration: Length of the run in seconds, ramp-up included
+        ramp_up: Seconds over which user start times are spread
+        think_time: Mean pause between turns in seconds
+        feedback_timeout: How long each user polls for feedback
+
+    Returns:
+        The filled-in report
+    """
+    report = LoadReport()
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=users * 2, max_keepalive_connections=users * 2)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        report.started_at = time.perf_counter()
+        stop_at = report.started_at + duration
+
+        async def start_user(index: int):
+            await asyncio.sleep(ramp_up * index / max(1, users))
+            user = VirtualUser(client, report, run_id, index, think_time, feedback_timeout)
+            await user.run(stop_at)
+
+        await asyncio.gather(*(start_user(index) for index in range(users)))
+        report.finished_at = time.perf_counter()
+
+    return report
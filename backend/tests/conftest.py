@@ -8,6 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.main import app
 from app.config.database import db
+from app.utils.user_cache import user_cache
 
 @pytest.fixture
 def client():
@@ -23,8 +24,10 @@ def test_user():
 
 @pytest.fixture(autouse=True)
 def setup_teardown():
-    # Setup: Clear the users collection before each test
+    # Setup: Clear the users collection (and the users cached by authentication) before each test
     db.users.delete_many({})
+    user_cache.clear()
     yield
     # Teardown: Clear the users collection after each test
-    db.users.delete_many({}) 
\ No newline at end of file
+    db.users.delete_many({})
+    user_cache.clear() 
\ No newline at end of file
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.tts_client_service import get_audio_headers, negotiate_audio_format
+
+
+def test_query_parameter_overrides_accept_header():
+    """Test that an explicit format wins and unknown formats are rejected"""
+    assert negotiate_audio_format("audio/ogg", "PCM") == "pcm"
+    with pytest.raises(HTTPException) as error:
+        negotiate_audio_format(None, "m4b")
+    assert error.value.status_code == 400
+
+
+def test_accept_header_negotiation():
+    """Test q-values, tie-breaking toward compact formats and wildcard fallback"""
+    firefox = "audio/webm,audio/ogg,audio/wav,audio/*;q=0.9,application/ogg;q=0.7,video/*;q=0.6,*/*;q=0.5"
+    assert negotiate_audio_format(firefox) == "opus"
+    assert negotiate_audio_format("audio/mpeg, audio/ogg;q=0.5") == "mp3"
+    assert negotiate_audio_format("audio/wav, audio/mpeg") == "mp3"
+    assert negotiate_audio_format("audio/ogg;q=0, audio/mpeg;q=0.1") == "mp3"
+    assert negotiate_audio_format("*/*") == "mp3"
+    assert negotiate_audio_format(None) == "mp3"
+
+
+def test_pcm_headers_describe_sample_layout():
+    """Test that raw PCM responses tell the player how to decode them"""
+    assert get_audio_headers("mp3") == {"Vary": "Accept"}
+    assert get_audio_headers("pcm")["X-Audio-Sample-Rate"] == "24000"
@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.audio_response import audio_file_response, is_not_modified
+
+
+@pytest.fixture
+def audio_client(tmp_path):
+    """Serve a small audio file through audio_file_response"""
+    path = tmp_path / "speech.mp3"
+    path.write_bytes(b"0123456789")
+    app = FastAPI()
+
+    @app.get("/speech")
+    async def speech(request: Request):
+        return audio_file_response(path, "audio/mpeg", request.headers, etag='"abc"')
+
+    return TestClient(app)
+
+
+def test_full_response_has_caching_headers(audio_client):
+    """Test that materialized audio is served with validators and immutable caching"""
+    response = audio_client.get("/speech")
+    assert response.status_code == 200
+    assert response.content == b"0123456789"
+    assert response.headers["etag"] == '"abc"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["last-modified"]
+
+
+def test_range_request_returns_partial_content(audio_client):
+    """Test that seeking gets 206 with just the requested bytes"""
+    response = audio_client.get("/speech", headers={"Range": "bytes=2-5"})
+    assert response.status_code == 206
+    assert response.content == b"2345"
+    assert response.headers["content-range"] == "bytes 2-5/10"
+
+
+def test_conditional_requests_return_not_modified(audio_client):
+    """Test that a current client copy is revalidated with 304"""
+    last_modified = audio_client.get("/speech").headers["last-modified"]
+
+    assert audio_client.get("/speech", headers={"If-None-Match": '"abc"'}).status_code == 304
+    assert audio_client.get("/speech", headers={"If-None-Match": '"other"'}).status_code == 200
+    assert audio_client.get("/speech", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+
+def test_if_none_match_takes_precedence():
+    """Test that If-Modified-Since is ignored when If-None-Match is present"""
+    headers = {"if-none-match": '"old"', "if-modified-since": "Wed, 21 Oct 2099 07:28:00 GMT"}
+    assert not is_not_modified(headers, '"abc"', 0)
+    assert is_not_modified({"if-none-match": 'W/"abc", "x"'}, '"abc"', 0)
+    assert not is_not_modified({"if-modified-since": "not a date"}, '"abc"', 0)
@@ -0,0 +1,64 @@
+import os
+import sys
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.utils import speech_service as speech_module
+from app.utils.auth import get_current_user
+from app.utils.speech_service import SpeechService
+
+
+class FakeAudioCollection:
+    """Audio collection stand-in that keeps inserted records in memory."""
+
+    def __init__(self):
+        self.documents = []
+
+    async def insert_one(self, document):
+        self.documents.append(document)
+        return SimpleNamespace(inserted_id=document["_id"])
+
+    async def find_one(self, filter):
+        return next(d for d in self.documents if d["_id"] == filter["_id"])
+
+
+def post_audio(client, monkeypatch, tmp_path, transcription):
+    """Upload a recording through audio2text with transcription and storage faked out"""
+    audio = FakeAudioCollection()
+    monkeypatch.setattr(speech_module, "async_db", SimpleNamespace(audio=audio))
+    monkeypatch.setattr(speech_module, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(
+        SpeechService, "transcribe_from_upload",
+        lambda self, audio_file, language_code="en-US": (transcription, None)
+    )
+    app.dependency_overrides[get_current_user] = lambda: {"_id": ObjectId(), "email": "test@example.com"}
+    try:
+        response = client.post("/api/audio2text", files={"audio_file": ("turn.wav", b"RIFF audio", "audio/wav")})
+    finally:
+        app.dependency_overrides.clear()
+    return response, audio
+
+
+def test_audio2text_stores_the_transcription_with_the_recording(client, monkeypatch, tmp_path):
+    """Test that the saved audio record carries the text the message route reads"""
+    response, audio = post_audio(client, monkeypatch, tmp_path, "One coffee please")
+
+    body = response.json()
+    assert body["success"] is True
+    assert body["transcription"] == "One coffee please"
+    assert [str(document["_id"]) for document in audio.documents] == [body["audio_id"]]
+    assert audio.documents[0]["transcription"] == "One coffee please"
+    assert open(audio.documents[0]["file_path"], "rb").read() == b"RIFF audio"
+
+
+def test_failed_transcription_stores_nothing(client, monkeypatch, tmp_path):
+    """Test that an upload whose transcription failed is not kept"""
+    response, audio = post_audio(client, monkeypatch, tmp_path, "")
+
+    assert response.json()["success"] is False
+    assert audio.documents == []
@@ -0,0 +1,37 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.audio_service import AudioService
+
+
+def test_transcription_without_a_conversation_is_accepted():
+    """Test that audio2text's empty conversation_id passes validation"""
+    result = asyncio.run(AudioService().process_audio_for_feedback(
+        transcription="One coffee please",
+        user_id=str(ObjectId()),
+        conversation_id=""
+    ))
+
+    assert result["success"] is True
+    assert result["conversation_id"] == ""
+
+
+def test_malformed_conversation_id_is_rejected():
+    """Test that a conversation_id that is given must still be an ObjectId"""
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(AudioService().process_audio_for_feedback(
+            transcription="One coffee please",
+            user_id=str(ObjectId()),
+            conversation_id="not-an-id"
+        ))
+
+    assert error.value.status_code == 400
+    assert error.value.detail == "Invalid conversation ID format"
@@ -0,0 +1,196 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import bson
+import pytest
+from bson import ObjectId
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+mongomock = pytest.importorskip("mongomock")
+
+from loadtest.server import AsyncMongomockDatabase
+from app.utils import conversation_archive, identity_map
+from app.utils.conversation_archive import (
+    ARCHIVE_COLLECTION,
+    archive_cold_conversations,
+    archive_conversation,
+    get_archived_messages,
+    get_feedback,
+    get_message,
+    restore_conversation
+)
+
+NOW = datetime(2026, 6, 1)
+LAST_ACTIVITY = NOW - timedelta(days=200)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """One in-memory database behind both the blocking and the async client"""
+    database = mongomock.MongoClient()["speakai"]
+    async_database = AsyncMongomockDatabase(database)
+    monkeypatch.setattr(conversation_archive, "db", database)
+    monkeypatch.setattr(conversation_archive, "async_db", async_database)
+    monkeypatch.setattr(identity_map, "async_db", async_database)
+    return database
+
+
+def add_conversation(database, messages=2):
+    """Store a cold conversation with its messages and feedback on the user's messages"""
+    conversation = {"_id": ObjectId(), "user_id": ObjectId(), "last_activity_at": LAST_ACTIVITY, "message_count": messages}
+    database.conversations.insert_one(conversation)
+    for index in range(messages):
+        message = {
+            "_id": ObjectId(),
+            "conversation_id": conversation["_id"],
+            "sender": "user" if index % 2 == 0 else "ai",
+            "content": f"message {index}",
+            "timestamp": LAST_ACTIVITY - timedelta(minutes=messages - index)
+        }
+        database.messages.insert_one(message)
+        if message["sender"] == "user":
+            database.feedback.insert_one({"_id": ObjectId(), "target_id": message["_id"], "user_feedback": "Good"})
+    return conversation
+
+
+def add_late_message(database, conversation):
+    """Store a message the way a turn does before its conversation update lands"""
+    message = {
+        "_id": ObjectId(),
+        "conversation_id": conversation["_id"],
+        "sender": "user",
+        "content": "I'm back",
+        "timestamp": NOW
+    }
+    database.messages.insert_one(message)
+    return message
+
+
+def test_cold_conversation_moves_into_the_archive(database):
+    """Test that messages and feedback are bundled and removed from the hot collections"""
+    conversation = add_conversation(database)
+
+    assert archive_cold_conversations(older_than_days=90, now=NOW) == 1
+
+    stub = database.conversations.find_one({"_id": conversation["_id"]})
+    bundle = database[ARCHIVE_COLLECTION].find_one({"_id": conversation["_id"]})
+    assert stub["archived"] is True
+    assert "archive_purge_pending" not in stub
+    assert [message["content"] for message in bundle["messages"]] == ["message 0", "message 1"]
+    assert len(bundle["feedback"]) == 1
+    assert database.messages.count_documents({}) == 0
+    assert database.feedback.count_documents({}) == 0
+
+
+def test_conversation_that_became_active_is_skipped(database):
+    """Test that activity after the conversation was read leaves it in place"""
+    conversation = add_conversation(database)
+    database.conversations.update_one({"_id": conversation["_id"]}, {"$set": {"last_activity_at": NOW}})
+
+    assert archive_conversation(conversation, NOW) is False
+
+    assert "archived" not in database.conversations.find_one({"_id": conversation["_id"]})
+    assert database[ARCHIVE_COLLECTION].count_documents({}) == 0
+    assert database.messages.count_documents({}) == 2
+
+
+def test_message_stored_while_archiving_cancels_the_archive(database, monkeypatch):
+    """Test that a message written before its conversation update is not stranded"""
+    conversation = add_conversation(database)
+    late = {}
+
+    def encode(document):
+        # Runs between reading the messages and marking the conversation archived
+        if not late:
+            late.update(add_late_message(database, conversation))
+        return bson.encode(document)
+
+    monkeypatch.setattr(conversation_archive, "bson", SimpleNamespace(encode=encode))
+
+    assert archive_conversation(conversation, NOW) is False
+
+    stub = database.conversations.find_one({"_id": conversation["_id"]})
+    assert not {"archived", "archived_at", "archive_purge_pending"} & set(stub)
+    assert database[ARCHIVE_COLLECTION].count_documents({}) == 0
+    assert database.messages.count_documents({"conversation_id": conversation["_id"]}) == 3
+
+
+def test_interrupted_purge_completes_on_the_next_run(database, monkeypatch):
+    """Test that a stub left with archive_purge_pending is purged by the next run"""
+    conversation = add_conversation(database)
+    purge = conversation_archive._purge_hot_documents
+
+    def crash(bundle):
+        raise RuntimeError("worker stopped")
+
+    monkeypatch.setattr(conversation_archive, "_purge_hot_documents", crash)
+    assert archive_cold_conversations(older_than_days=90, now=NOW) == 0
+    assert database.conversations.find_one({"_id": conversation["_id"]})["archive_purge_pending"] is True
+    assert database.messages.count_documents({}) == 2
+
+    monkeypatch.setattr(conversation_archive, "_purge_hot_documents", purge)
+    late = add_late_message(database, conversation)
+    archive_cold_conversations(older_than_days=90, now=NOW)
+
+    stub = database.conversations.find_one({"_id": conversation["_id"]})
+    bundle = database[ARCHIVE_COLLECTION].find_one({"_id": conversation["_id"]})
+    assert stub["archived"] is True
+    assert "archive_purge_pending" not in stub
+    assert database.messages.count_documents({}) == 0
+    assert database.feedback.count_documents({}) == 0
+    # A message that arrived before the purge is kept in the bundle
+    assert bundle["messages"][-1]["_id"] == late["_id"]
+
+
+def test_reads_fall_back_to_the_archive(database):
+    """Test that archived messages and feedback are still found by _id"""
+    conversation = add_conversation(database)
+    message = database.messages.find_one({"sender": "user"})
+    feedback = database.feedback.find_one({"target_id": message["_id"]})
+    archive_cold_conversations(older_than_days=90, now=NOW)
+
+    async def scenario():
+        return (
+            await get_message(str(message["_id"])),
+            await get_feedback(feedback["_id"]),
+            await get_message(ObjectId()),
+            await get_archived_messages(conversation["_id"])
+        )
+
+    archived_message, archived_feedback, missing, messages = asyncio.run(scenario())
+
+    assert archived_message == message
+    assert archived_feedback == feedback
+    assert missing is None
+    assert [archived["_id"] for archived in messages][0] == message["_id"]
+
+
+def test_hot_documents_are_read_first(database):
+    """Test that reads of active conversations never touch the archive"""
+    add_conversation(database)
+    message = database.messages.find_one({"sender": "user"})
+
+    assert asyncio.run(get_message(message["_id"])) == message
+
+
+def test_restore_is_idempotent(database):
+    """Test that repeating or resuming a restore leaves one copy of every document"""
+    conversation = add_conversation(database)
+    archive_cold_conversations(older_than_days=90, now=NOW)
+    bundle = database[ARCHIVE_COLLECTION].find_one({"_id": conversation["_id"]})
+    # An earlier restore was interrupted after putting one message back
+    database.messages.insert_one(bundle["messages"][0])
+
+    asyncio.run(restore_conversation(conversation["_id"]))
+    asyncio.run(restore_conversation(conversation["_id"]))
+
+    stub = database.conversations.find_one({"_id": conversation["_id"]})
+    assert not {"archived", "archived_at", "archive_purge_pending"} & set(stub)
+    assert database.messages.count_documents({"conversation_id": conversation["_id"]}) == 2
+    assert database.feedback.count_documents({}) == 1
+    assert database[ARCHIVE_COLLECTION].count_documents({}) == 0
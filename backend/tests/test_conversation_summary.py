@@ -0,0 +1,29 @@
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.conversation import Conversation
+from app.services.conversation_service import MESSAGE_PREVIEW_CHARS, message_preview
+
+
+def test_short_messages_are_kept_whole():
+    """Test that previews only collapse whitespace of short messages"""
+    assert message_preview("How  are\nyou?") == "How are you?"
+    assert message_preview(None) is None
+
+
+def test_long_messages_are_cut_at_a_word():
+    """Test that long previews end at a word boundary with an ellipsis"""
+    preview = message_preview("word " * 100)
+    assert len(preview) <= MESSAGE_PREVIEW_CHARS
+    assert preview.endswith("word…")
+
+
+def test_new_conversations_start_with_an_empty_summary():
+    """Test the denormalized fields stored with a new conversation"""
+    conversation = Conversation(user_id=None, user_role="a", ai_role="b", situation="c").to_dict()
+    assert conversation["message_count"] == 0
+    assert conversation["last_message_preview"] is None
+    assert conversation["last_activity_at"] == conversation["started_at"]
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.schemas.conversation import ConversationCreate
+from app.services.conversation_service import ConversationService
+
+
+def test_typical_conversation_request_is_accepted():
+    """Test that ordinary roles and situations pass validation"""
+    data = ConversationCreate(user_role="customer", ai_role="waiter", situation="ordering food at a restaurant")
+
+    assert ConversationService().validate_conversation_data(data) is True
+
+
+@pytest.mark.parametrize("field, limit, message", [
+    ("user_role", 100, "User role must be 100 characters or less"),
+    ("ai_role", 100, "AI role must be 100 characters or less"),
+    ("situation", 500, "Situation must be 500 characters or less")
+])
+def test_length_limits_match_their_messages(field, limit, message):
+    """Test that each field is accepted at its documented limit and rejected above it"""
+    fields = {"user_role": "customer", "ai_role": "waiter", "situation": "ordering food"}
+    service = ConversationService()
+
+    assert service.validate_conversation_data(ConversationCreate(**{**fields, field: "a" * limit})) is True
+    with pytest.raises(HTTPException) as error:
+        service.validate_conversation_data(ConversationCreate(**{**fields, field: "a" * (limit + 1)}))
+    assert error.value.status_code == 400
+    assert error.value.detail == message
@@ -0,0 +1,38 @@
+import asyncio
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import database
+
+
+def test_async_client_is_reused_within_a_loop():
+    """Test that one event loop shares a single async client and pool"""
+    async def scenario():
+        first = database.get_async_client()
+        second = database.get_async_client()
+        collection = database.async_db.messages
+        await database.close_async_client()
+        return first, second, collection
+
+    first, second, collection = asyncio.run(scenario())
+    assert first is second
+    assert collection.name == "messages"
+    assert collection.database.name == database.DATABASE_NAME
+
+
+def test_async_client_is_recreated_for_a_new_loop():
+    """Test that a client bound to a finished loop is not reused"""
+    async def current_client():
+        return database.get_async_client()
+
+    async def next_loop_client():
+        client = database.get_async_client()
+        await database.close_async_client()
+        return client
+
+    first = asyncio.run(current_client())
+    second = asyncio.run(next_loop_client())
+    assert first is not second
@@ -0,0 +1,33 @@
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.db_indexes import HOT_QUERIES, INDEXES, plan_stages
+
+
+def test_every_hot_query_has_a_declared_index():
+    """Test that each hot query's collection has an index led by one of its filter fields"""
+    for query in HOT_QUERIES:
+        leading_fields = [index.document["key"].keys() for index in INDEXES[query.collection]]
+        assert any(next(iter(fields)) in query.filter for fields in leading_fields), query
+
+
+def test_users_email_is_unique():
+    """Test that registration can rely on a unique email index"""
+    index = INDEXES["users"][0].document
+    assert list(index["key"]) == ["email"]
+    assert index["unique"] is True
+
+
+def test_plan_stages_walks_classic_and_slot_based_plans():
+    """Test that collection scans are found in nested explain output"""
+    classic = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}
+    assert plan_stages(classic) == ["FETCH", "IXSCAN"]
+
+    slot_based = {"queryPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}}
+    assert "COLLSCAN" in plan_stages(slot_based)
+
+    merged = {"stage": "OR", "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}]}
+    assert plan_stages(merged) == ["OR", "IXSCAN", "COLLSCAN"]
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.results.feedback_result import FeedbackResult
+from app.utils import feedback_service as feedback_module
+from app.utils.feedback_batcher import FeedbackBatcher, FeedbackJob
+from app.utils.feedback_service import BATCH_FEEDBACK_RESPONSE_SCHEMA, FeedbackService
+from app.utils.resilience import CircuitOpenError, DeadlineExceededError
+
+
+class FakeFeedbackService:
+    """FeedbackService stand-in that records batched and single calls."""
+
+    def __init__(self, answered=None, batch_error=None):
+        self.answered = answered
+        self.batch_error = batch_error
+        self.batches = []
+        self.singles = []
+        self.saved = []
+
+    def build_feedback_context(self, conversation_id):
+        return {"conversation_id": conversation_id}
+
+    def generate_batch_feedback(self, items, user_id=None):
+        self.batches.append([item_id for item_id, _, _ in items])
+        if self.batch_error is not None:
+            raise self.batch_error
+        return {
+            item_id: FeedbackResult(user_feedback=f"batch {transcription}")
+            for item_id, transcription, _ in items
+            if self.answered is None or item_id in self.answered
+        }
+
+    def generate_dual_feedback(self, transcription, context=None, user_id=None):
+        self.singles.append(transcription)
+        return FeedbackResult(user_feedback=f"single {transcription}")
+
+    def generate_fallback_feedback(self, transcription):
+        return FeedbackResult(user_feedback=f"fallback {transcription}")
+
+    def save_feedback_for_message(self, user_id, feedback_result, user_message_id, transcription=None, context=None):
+        self.saved.append((user_message_id, feedback_result.user_feedback))
+
+
+def make_job(index):
+    return FeedbackJob("user-1", "conversation-1", f"speech {index}", f"message-{index}")
+
+
+def test_jobs_queued_within_the_window_share_one_call():
+    """Test that jobs submitted together are answered by one batched call"""
+    service = FakeFeedbackService()
+    batcher = FeedbackBatcher(service, max_batch_size=8, max_wait_seconds=0.2)
+
+    async def scenario():
+        batcher.start()
+        for index in range(3):
+            await batcher.submit(make_job(index))
+        await asyncio.sleep(0.5)
+        await batcher.stop()
+
+    asyncio.run(scenario())
+
+    assert service.batches == [["0", "1", "2"]]
+    assert service.singles == []
+    assert sorted(service.saved) == [(f"message-{index}", f"batch speech {index}") for index in range(3)]
+
+
+def test_full_batches_are_dispatched_without_waiting():
+    """Test that max_batch_size splits a burst into several calls"""
+    service = FakeFeedbackService()
+    batcher = FeedbackBatcher(service, max_batch_size=2, max_wait_seconds=10)
+
+    async def scenario():
+        batcher.start()
+        for index in range(4):
+            await batcher.submit(make_job(index))
+        await asyncio.sleep(0.2)
+        dispatched = list(service.batches)
+        await batcher.stop()
+        return dispatched
+
+    dispatched = asyncio.run(scenario())
+
+    assert dispatched == [["0", "1"], ["0", "1"]]
+    assert len(service.saved) == 4
+
+
+def test_stop_flushes_the_batch_being_collected():
+    """Test that jobs already taken off the queue are processed on shutdown"""
+    service = FakeFeedbackService()
+    batcher = FeedbackBatcher(service, max_batch_size=8, max_wait_seconds=10)
+
+    async def scenario():
+        batcher.start()
+        for index in range(3):
+            await batcher.submit(make_job(index))
+        # Let the worker move the jobs into the batch it is still collecting
+        await asyncio.sleep(0.1)
+        assert batcher._queue.empty()
+        await batcher.stop()
+
+    asyncio.run(scenario())
+
+    assert sorted(message_id for message_id, _ in service.saved) == ["message-0", "message-1", "message-2"]
+
+
+def test_items_missing_from_the_batch_fall_back_to_single_calls():
+    """Test that an item the batch response left out is retried on its own"""
+    service = FakeFeedbackService(answered={"0"})
+    batcher = FeedbackBatcher(service)
+
+    batcher._process_batch([make_job(0), make_job(1)])
+
+    assert service.singles == ["speech 1"]
+    assert sorted(service.saved) == [("message-0", "batch speech 0"), ("message-1", "single speech 1")]
+
+
+def test_unparseable_batch_response_falls_back_to_single_calls():
+    """Test that a batch answer that is not a JSON list is retried item by item"""
+    service = FakeFeedbackService(batch_error=ValueError("Batch feedback response is not a JSON list"))
+    batcher = FeedbackBatcher(service)
+
+    batcher._process_batch([make_job(0), make_job(1)])
+
+    assert service.singles == ["speech 0", "speech 1"]
+    assert sorted(service.saved) == [("message-0", "single speech 0"), ("message-1", "single speech 1")]
+
+
+@pytest.mark.parametrize("error", [
+    CircuitOpenError("Circuit 'gemini' is open; upstream call rejected"),
+    DeadlineExceededError("gemini call did not complete within its deadline"),
+    RuntimeError("503 Service Unavailable")
+])
+def test_failed_batch_call_is_not_fanned_out(error):
+    """Test that an upstream failure stores fallback feedback without single calls"""
+    service = FakeFeedbackService(batch_error=error)
+    batcher = FeedbackBatcher(service)
+
+    batcher._process_batch([make_job(0), make_job(1), make_job(2)])
+
+    assert len(service.batches) == 1
+    assert service.singles == []
+    assert sorted(service.saved) == [(f"message-{index}", f"fallback speech {index}") for index in range(3)]
+
+
+def test_submit_without_worker_processes_immediately():
+    """Test that jobs submitted outside the application lifespan are not queued"""
+    service = FakeFeedbackService()
+    batcher = FeedbackBatcher(service)
+
+    asyncio.run(batcher.submit(make_job(0)))
+
+    assert service.batches == []
+    assert service.saved == [("message-0", "single speech 0")]
+
+
+def test_generate_batch_feedback_maps_answers_to_items(monkeypatch):
+    """Test that the batched response is split by item id with one schema call"""
+    calls = []
+
+    def fake_generate_response(prompt, **kwargs):
+        calls.append(kwargs)
+        return "```json\n" + json.dumps([
+            {"id": "a", "user_feedback": "Good", "grammar_issues": [], "vocabulary_issues": []},
+            {"id": "b", "user_feedback": "", "grammar_issues": [], "vocabulary_issues": []},
+            {"id": "unknown", "user_feedback": "Stray", "grammar_issues": [], "vocabulary_issues": []},
+            "not an object"
+        ]) + "\n```"
+
+    monkeypatch.setattr(feedback_module, "generate_response", fake_generate_response)
+
+    results = FeedbackService().generate_batch_feedback(
+        [("a", "I go there", None), ("b", "She like it", None)],
+        user_id="user-1"
+    )
+
+    assert list(results) == ["a"]
+    assert results["a"].user_feedback == "Good"
+    assert len(calls) == 1
+    assert calls[0]["response_schema"] == BATCH_FEEDBACK_RESPONSE_SCHEMA
+    assert calls[0]["user_id"] == "user-1"
+
+
+def test_generate_batch_feedback_rejects_a_non_list_response(monkeypatch):
+    """Test that an unparseable batch response raises so callers can fall back"""
+    monkeypatch.setattr(feedback_module, "generate_response", lambda prompt, **kwargs: '{"id": "a"}')
+
+    with pytest.raises(ValueError):
+        FeedbackService().generate_batch_feedback([("a", "I go there", None)])
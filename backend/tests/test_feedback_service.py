@@ -0,0 +1,168 @@
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import feedback_service as feedback_module
+from app.utils import mistake_service as mistake_module
+from app.utils.feedback_service import FEEDBACK_RESPONSE_SCHEMA, FeedbackService
+
+STRUCTURED_RESPONSE = {
+    "user_feedback": "Dùng thì quá khứ: I went to school yesterday.",
+    "grammar_issues": [
+        {"issue": "I go", "correction": "I went", "explanation": "Past tense", "severity": 4}
+    ],
+    "vocabulary_issues": [
+        {"original": "big", "better_alternative": "huge", "reason": "Stronger", "example_usage": "A huge house"}
+    ]
+}
+
+
+class RecordingUnitOfWork:
+    """UnitOfWork stand-in that keeps the queued writes instead of applying them."""
+
+    instances = []
+
+    def __init__(self):
+        self.inserts = []
+        self.updates = []
+        self.committed = False
+        RecordingUnitOfWork.instances.append(self)
+
+    def insert(self, collection, document):
+        self.inserts.append((collection, document))
+
+    def update(self, collection, filter, update, upsert=False):
+        self.updates.append((collection, filter, update))
+
+    def commit_blocking(self):
+        self.committed = True
+
+
+class RecordingCollection:
+    """Mistake collection stand-in that records bulk upserts."""
+
+    def __init__(self):
+        self.bulk_writes = []
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_writes.append(operations)
+        return SimpleNamespace(matched_count=0, upserted_count=len(operations), upserted_ids={})
+
+    def update_one(self, *args, **kwargs):
+        pass
+
+
+def fake_gemini(monkeypatch, response):
+    """Replace the Gemini client and return the list of calls made to it."""
+    calls = []
+
+    def fake_generate_response(prompt, **kwargs):
+        calls.append(kwargs)
+        return response
+
+    monkeypatch.setattr(feedback_module, "generate_response", fake_generate_response)
+    return calls
+
+
+def test_structured_response_is_parsed_with_the_schema(monkeypatch):
+    """Test that feedback and issues come from one schema-constrained call"""
+    calls = fake_gemini(monkeypatch, json.dumps(STRUCTURED_RESPONSE))
+
+    result = FeedbackService().generate_dual_feedback("I go to school yesterday", user_id="user-1")
+
+    assert len(calls) == 1
+    assert calls[0]["response_schema"] == FEEDBACK_RESPONSE_SCHEMA
+    assert result.user_feedback == STRUCTURED_RESPONSE["user_feedback"]
+    assert result.grammar_issues == STRUCTURED_RESPONSE["grammar_issues"]
+    assert result.vocabulary_issues == STRUCTURED_RESPONSE["vocabulary_issues"]
+
+
+def test_structured_issues_reach_the_mistake_service_without_another_call(monkeypatch):
+    """Test that saving feedback records its mistakes from the structured issues"""
+    calls = fake_gemini(monkeypatch, json.dumps(STRUCTURED_RESPONSE))
+    mistakes = RecordingCollection()
+    monkeypatch.setattr(mistake_module, "db", SimpleNamespace(mistakes=mistakes, mistake_stats=RecordingCollection()))
+    monkeypatch.setattr(feedback_module, "UnitOfWork", RecordingUnitOfWork)
+    RecordingUnitOfWork.instances.clear()
+    service = FeedbackService()
+    user_id = str(ObjectId())
+    message_id = str(ObjectId())
+
+    result = service.generate_dual_feedback("I go to school, it is big", user_id=user_id)
+    feedback_id = service.save_feedback_for_message(
+        user_id, result, message_id, transcription="I go to school, it is big"
+    )
+
+    assert len(calls) == 1
+    uow = RecordingUnitOfWork.instances[0]
+    assert uow.committed
+    assert [collection for collection, _ in uow.inserts] == ["feedback"]
+    assert uow.updates == [("messages", {"_id": ObjectId(message_id)}, {"$set": {"feedback_id": feedback_id}})]
+    assert len(mistakes.bulk_writes) == 1
+    stored = {operation._filter["normalized_text"] for operation in mistakes.bulk_writes[0]}
+    assert stored == {"i go", "big"}
+
+
+def test_feedback_without_issues_skips_the_mistake_service(monkeypatch):
+    """Test that feedback with no issues stores nothing in the mistake collection"""
+    fake_gemini(monkeypatch, json.dumps({"user_feedback": "Great!", "grammar_issues": [], "vocabulary_issues": []}))
+    mistakes = RecordingCollection()
+    monkeypatch.setattr(mistake_module, "db", SimpleNamespace(mistakes=mistakes, mistake_stats=RecordingCollection()))
+    monkeypatch.setattr(feedback_module, "UnitOfWork", RecordingUnitOfWork)
+    service = FeedbackService()
+
+    result = service.generate_dual_feedback("I went to school")
+    service.save_feedback_for_message(str(ObjectId()), result, str(ObjectId()))
+
+    assert mistakes.bulk_writes == []
+
+
+def test_malformed_json_falls_back_to_basic_feedback(monkeypatch):
+    """Test that a truncated schema response yields fallback feedback without issues"""
+    fake_gemini(monkeypatch, '{"user_feedback": "Good')
+
+    result = FeedbackService().generate_dual_feedback("I go to school")
+
+    assert result.user_feedback
+    assert result.grammar_issues == []
+    assert result.vocabulary_issues == []
+
+
+def test_response_missing_user_feedback_falls_back(monkeypatch):
+    """Test that a JSON object without user_feedback is not used as feedback"""
+    fake_gemini(monkeypatch, json.dumps({"grammar_issues": [{"issue": "I go"}], "vocabulary_issues": []}))
+
+    result = FeedbackService().generate_dual_feedback("I go to school")
+
+    assert result.user_feedback == FeedbackService().generate_fallback_feedback("I go to school").user_feedback
+    assert result.grammar_issues == []
+
+
+def test_malformed_issue_entries_are_dropped(monkeypatch):
+    """Test that non-object issue entries are ignored rather than stored"""
+    fake_gemini(monkeypatch, json.dumps({
+        "user_feedback": "Check the tense.",
+        "grammar_issues": ["I go", {"issue": "I go", "correction": "I went"}],
+        "vocabulary_issues": None
+    }))
+
+    result = FeedbackService().generate_dual_feedback("I go to school")
+
+    assert result.grammar_issues == [{"issue": "I go", "correction": "I went"}]
+    assert result.vocabulary_issues == []
+
+
+def test_plain_text_response_is_kept_as_feedback(monkeypatch):
+    """Test that a non-JSON answer is still shown to the learner, without issues"""
+    fake_gemini(monkeypatch, "Use the past tense here.")
+
+    result = FeedbackService().generate_dual_feedback("I go to school")
+
+    assert result.user_feedback == "Use the past tense here."
+    assert result.grammar_issues == []
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+
+from app.utils import identity_map
+from app.utils.identity_map import IdentityMapMiddleware, forget, get_document, projection, remember
+
+
+class CountingCollection:
+    """Async collection fake that counts find_one calls"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.reads = []
+
+    async def find_one(self, filter, fields=None):
+        self.reads.append(fields)
+        document = self.documents.get(filter["_id"])
+        if document is None:
+            return None
+        if not fields:
+            return dict(document)
+        return {key: value for key, value in document.items() if key == "_id" or key in fields}
+
+
+def run_in_request(monkeypatch, documents, scenario):
+    """Run a scenario inside the middleware, as a request handler would"""
+    collection = CountingCollection(documents)
+    monkeypatch.setattr(identity_map, "async_db", {"messages": collection, "users": collection})
+    result = {}
+
+    async def app(scope, receive, send):
+        result["value"] = await scenario()
+
+    asyncio.run(IdentityMapMiddleware(app)({"type": "http"}, None, None))
+    return collection.reads, result["value"]
+
+
+def test_document_is_read_once_per_request(monkeypatch):
+    """Test that repeated reads of a document share one database read"""
+    message_id = ObjectId()
+
+    async def scenario():
+        first = await get_document("messages", message_id)
+        second = await get_document("messages", str(message_id))
+        return first, second
+
+    reads, (first, second) = run_in_request(monkeypatch, {message_id: {"_id": message_id, "content": "Hi"}}, scenario)
+
+    assert len(reads) == 1
+    assert first is second
+
+
+def test_narrow_read_is_widened_when_more_fields_are_needed(monkeypatch):
+    """Test that a projected read only serves reads of the same or fewer fields"""
+    message_id = ObjectId()
+
+    async def scenario():
+        await get_document("messages", message_id, projection("content", "sender"))
+        narrow = await get_document("messages", message_id, projection("content"))
+        full = await get_document("messages", message_id)
+        return narrow, full
+
+    reads, (narrow, full) = run_in_request(
+        monkeypatch, {message_id: {"_id": message_id, "content": "Hi", "sender": "ai", "audio_path": None}}, scenario
+    )
+
+    assert reads == [{"content": 1, "sender": 1}, None]
+    assert "audio_path" not in narrow
+    assert "audio_path" in full
+
+
+def test_remembered_and_forgotten_documents(monkeypatch):
+    """Test that remembered documents need no read and forgotten ones are read again"""
+    user_id = ObjectId()
+    user = {"_id": user_id, "name": "Ada Lovelace"}
+
+    async def scenario():
+        remember("users", user)
+        cached = await get_document("users", user_id)
+        forget("users", user_id)
+        fresh = await get_document("users", user_id)
+        return cached, fresh
+
+    reads, (cached, fresh) = run_in_request(monkeypatch, {user_id: dict(user)}, scenario)
+
+    assert cached is user
+    assert fresh is not user
+    assert len(reads) == 1
+
+
+def test_reads_outside_a_request_are_not_cached(monkeypatch):
+    """Test that workers and scripts always read from the database"""
+    message_id = ObjectId()
+    collection = CountingCollection({message_id: {"_id": message_id}})
+    monkeypatch.setattr(identity_map, "async_db", {"messages": collection})
+
+    async def scenario():
+        await get_document("messages", message_id)
+        await get_document("messages", message_id)
+
+    asyncio.run(scenario())
+    assert len(collection.reads) == 2
@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+from datetime import datetime
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+
+from app.schemas.conversation import ConversationPage
+from app.schemas.message import MessageResponse
+from app.utils.json_response import MongoJSONResponse, model_response, type_adapter
+
+
+def test_default_response_encodes_objectids_and_datetimes():
+    """Test that documents can be returned without converting them by hand"""
+    document_id = ObjectId()
+    response = MongoJSONResponse({"_id": document_id, "at": datetime(2025, 1, 2, 3, 4, 5)})
+
+    assert json.loads(response.body) == {"_id": str(document_id), "at": "2025-01-02T03:04:05"}
+
+
+def test_model_response_reads_mongo_documents():
+    """Test that _id and ObjectId fields are serialized as string ids"""
+    message_id, conversation_id, feedback_id = ObjectId(), ObjectId(), ObjectId()
+    document = {
+        "_id": message_id,
+        "conversation_id": conversation_id,
+        "sender": "user",
+        "content": "Hello",
+        "timestamp": datetime(2025, 1, 2, 3, 4, 5),
+        "feedback_id": feedback_id,
+        "speech_path": None
+    }
+
+    response = model_response(MessageResponse, document)
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {
+        "id": str(message_id),
+        "conversation_id": str(conversation_id),
+        "sender": "user",
+        "content": "Hello",
+        "timestamp": "2025-01-02T03:04:05",
+        "audio_path": None,
+        "transcription": None,
+        "feedback_id": str(feedback_id)
+    }
+
+
+def test_model_response_serializes_pages():
+    """Test that nested documents in a page are validated and serialized"""
+    conversation_id = ObjectId()
+    page = {
+        "items": [{
+            "_id": conversation_id,
+            "user_role": "Customer",
+            "ai_role": "Barista",
+            "situation": "Ordering coffee",
+            "started_at": datetime(2025, 1, 2)
+        }],
+        "next_cursor": None
+    }
+
+    body = json.loads(model_response(ConversationPage, page).body)
+
+    assert body["items"][0]["id"] == str(conversation_id)
+    assert body["items"][0]["message_count"] == 0
+    assert body["next_cursor"] is None
+
+
+def test_type_adapters_are_cached():
+    """Test that a schema's TypeAdapter is built once"""
+    assert type_adapter(MessageResponse) is type_adapter(MessageResponse)
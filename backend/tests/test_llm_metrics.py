@@ -0,0 +1,130 @@
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import llm_metrics as llm_metrics_module
+from app.utils.llm_metrics import (
+    Histogram,
+    LLMMetrics,
+    PROMPT_DUAL_FEEDBACK,
+    PROMPT_REFINEMENT,
+    estimate_cost,
+    extract_token_counts
+)
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test that bucket counts are cumulative and quantiles use bucket bounds"""
+    histogram = Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.7, 3.0, 10.0):
+        histogram.observe(value)
+
+    data = histogram.to_dict()
+    assert [bucket["count"] for bucket in data["buckets"]] == [1, 3, 4, 5]
+    assert data["count"] == 5
+    assert histogram.quantile(0.5) == 2.0
+    assert histogram.quantile(0.99) == float("inf")
+
+
+def test_extract_token_counts():
+    """Test reading usage metadata with and without usage data"""
+    response = SimpleNamespace(
+        usage_metadata=SimpleNamespace(prompt_token_count=120, candidates_token_count=30)
+    )
+    assert extract_token_counts(response) == (120, 30)
+    assert extract_token_counts(SimpleNamespace()) == (0, 0)
+
+
+def test_record_aggregates_per_prompt_type():
+    """Test that calls, tokens, cost, retries and errors are tracked per prompt type"""
+    metrics = LLMMetrics(rollups_enabled=False)
+    metrics.record(PROMPT_REFINEMENT, 0.8, input_tokens=1000, output_tokens=200, retries=1)
+    metrics.record(PROMPT_REFINEMENT, 1.2, input_tokens=500, output_tokens=100)
+    metrics.record(PROMPT_DUAL_FEEDBACK, 5.0, retries=2, error=TimeoutError("slow"))
+
+    snapshot = metrics.snapshot()["prompt_types"]
+    refinement = snapshot[PROMPT_REFINEMENT]
+    assert refinement["calls"] == 2
+    assert refinement["retries"] == 1
+    assert refinement["input_tokens"] == 1500
+    assert refinement["output_tokens"] == 300
+    assert refinement["cost_usd"] == round(estimate_cost(1500, 300), 6)
+    assert refinement["latency_seconds"]["count"] == 2
+
+    feedback = snapshot[PROMPT_DUAL_FEEDBACK]
+    assert feedback["errors"] == {"TimeoutError": 1}
+    assert feedback["retries"] == 2
+    assert feedback["input_tokens_per_call"]["count"] == 0
+
+
+class RecordingUsageCollection:
+    """llm_usage_daily stand-in that records bulk writes"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.bulk_writes = []
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_writes.append(operations)
+        if self.error:
+            raise self.error
+
+    def update_one(self, *args, **kwargs):
+        raise AssertionError("record() must not write to the database")
+
+
+def test_rollups_are_buffered_and_flushed_in_one_bulk_write(monkeypatch):
+    """Test that recording never writes and a flush merges calls per user, day and prompt type"""
+    usage = RecordingUsageCollection()
+    monkeypatch.setattr(llm_metrics_module, "db", SimpleNamespace(llm_usage_daily=usage))
+    metrics = LLMMetrics(rollups_enabled=True)
+
+    metrics.record(PROMPT_REFINEMENT, 0.5, input_tokens=100, output_tokens=10, user_id="user-1")
+    metrics.record(PROMPT_REFINEMENT, 2.0, input_tokens=200, output_tokens=20, retries=1, user_id="user-1")
+    metrics.record(PROMPT_REFINEMENT, 1.0, error=TimeoutError("slow"), user_id="user-2")
+    assert usage.bulk_writes == []
+
+    assert metrics.flush_rollups() == 2
+    assert metrics.flush_rollups() == 0
+    assert len(usage.bulk_writes) == 1
+
+    by_user = {operation._filter["user_id"]: operation for operation in usage.bulk_writes[0]}
+    first = by_user["user-1"]
+    assert first._filter["prompt_type"] == PROMPT_REFINEMENT
+    assert first._upsert is True
+    assert first._doc["$inc"] == {
+        "calls": 2,
+        "errors": 0,
+        "retries": 1,
+        "input_tokens": 300,
+        "output_tokens": 30,
+        "cost_usd": estimate_cost(100, 10) + estimate_cost(200, 20),
+        "latency_seconds_total": 2.5
+    }
+    assert first._doc["$max"] == {"latency_seconds_max": 2.0}
+    assert by_user["user-2"]._doc["$inc"]["errors"] == 1
+
+
+def test_failed_flush_does_not_raise(monkeypatch):
+    """Test that a database error while flushing is logged, not raised"""
+    usage = RecordingUsageCollection(error=RuntimeError("database unavailable"))
+    monkeypatch.setattr(llm_metrics_module, "db", SimpleNamespace(llm_usage_daily=usage))
+    metrics = LLMMetrics(rollups_enabled=True)
+    metrics.record(PROMPT_DUAL_FEEDBACK, 1.0, input_tokens=10, output_tokens=5, user_id="user-1")
+
+    assert metrics.flush_rollups() == 0
+    assert len(usage.bulk_writes) == 1
+
+
+def test_disabled_rollups_are_not_buffered(monkeypatch):
+    """Test that nothing is written when rollups are disabled"""
+    usage = RecordingUsageCollection()
+    monkeypatch.setattr(llm_metrics_module, "db", SimpleNamespace(llm_usage_daily=usage))
+    metrics = LLMMetrics(rollups_enabled=False)
+    metrics.record(PROMPT_REFINEMENT, 0.5, input_tokens=100, output_tokens=10, user_id="user-1")
+
+    assert metrics.flush_rollups() == 0
+    assert usage.bulk_writes == []
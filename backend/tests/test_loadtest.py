@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest.fakes import LatencyProfile, fake_gemini_text
+from loadtest.report import LoadReport, percentile
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles over a known sample"""
+    samples = [float(value) for value in range(1, 101)]
+    assert percentile(samples, 0.50) == 50.0
+    assert percentile(samples, 0.95) == 95.0
+    assert percentile(samples, 0.99) == 99.0
+    assert percentile([], 0.5) is None
+
+
+def test_report_summary_counts_errors_and_throughput():
+    """Test per-endpoint counts, errors and throughput"""
+    report = LoadReport()
+    report.started_at, report.finished_at = 0.0, 2.0
+    report.record("POST /audio2text", 0.1)
+    report.record("POST /audio2text", 0.3, error="500")
+
+    stats = report.summary()["endpoints"]["POST /audio2text"]
+    assert stats["count"] == 2
+    assert stats["errors_by_kind"] == {"500": 1}
+    assert stats["throughput_rps"] == 1.0
+    assert stats["p99_ms"] == 300.0
+
+
+def test_latency_profile_parse():
+    """Test parsing a median:sigma latency spec"""
+    profile = LatencyProfile.parse("0.8:0.25", error_rate=0.1)
+    assert (profile.median, profile.sigma, profile.error_rate) == (0.8, 0.25, 0.1)
+    assert LatencyProfile.parse("0").sample_latency() == 0.0
+
+
+def test_fake_gemini_answers_batch_feedback_per_item():
+    """Test that the fake answers every item of a batch feedback prompt"""
+    prompt = "### Item id: 0\nspeech one\n### Item id: 1\nspeech two"
+    answer = json.loads(fake_gemini_text(prompt, {"responseSchema": {"type": "ARRAY"}}))
+    assert [item["id"] for item in answer] == ["0", "1"]
+    assert all("user_feedback" in item for item in answer)
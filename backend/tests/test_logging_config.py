@@ -0,0 +1,43 @@
+import json
+import logging
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.logging_config import JsonFormatter, PayloadSamplingFilter, truncate
+
+
+def make_record(message="hello", **extra):
+    record = logging.makeLogRecord({"name": "test", "levelname": "INFO", "levelno": logging.INFO, "msg": message})
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_truncate_marks_original_length():
+    """Test that long strings are cut and keep their original length"""
+    assert truncate("short", 10) == "short"
+    assert truncate("x" * 20, 10) == "x" * 10 + "... [truncated, 20 chars]"
+
+
+def test_json_formatter_includes_extras():
+    """Test that records become one JSON line with extra fields"""
+    line = JsonFormatter().format(make_record("call done", prompt_type="refinement"))
+    entry = json.loads(line)
+    assert entry["message"] == "call done"
+    assert entry["level"] == "INFO"
+    assert entry["prompt_type"] == "refinement"
+
+
+def test_payload_sampling_drops_unsampled_payloads():
+    """Test that unsampled payloads are replaced by their size"""
+    record = make_record(payload="p" * 500)
+    assert PayloadSamplingFilter(sample_rate=0.0).filter(record)
+    assert not hasattr(record, "payload")
+    assert record.payload_chars == 500
+
+    record = make_record(payload="p" * 500)
+    PayloadSamplingFilter(sample_rate=1.0).filter(record)
+    assert record.payload == "p" * 500
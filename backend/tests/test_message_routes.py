@@ -0,0 +1,128 @@
+import os
+import sys
+import threading
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.routes import message_routes
+from app.utils.auth import get_current_user
+
+
+class FakeAudioCollection:
+    def __init__(self, document):
+        self.document = document
+
+    async def find_one(self, filter):
+        return self.document
+
+
+class FakeDatabase:
+    def __init__(self, audio):
+        self.audio = FakeAudioCollection(audio)
+
+
+def test_ai_timeout_reaches_the_client_and_runs_off_the_event_loop(client, monkeypatch):
+    """Test that the turn keeps the AI service's 504 and calls Gemini in a worker thread"""
+    user_id, conversation_id, audio_id = ObjectId(), ObjectId(), ObjectId()
+    loop_threads, calls = [], []
+
+    async def get_conversation_context(conversation_id):
+        loop_threads.append(threading.get_ident())
+        return {
+            "conversation": {
+                "_id": ObjectId(conversation_id),
+                "user_id": user_id,
+                "ai_role": "Barista",
+                "user_role": "Customer",
+                "situation": "Ordering coffee"
+            },
+            "messages": []
+        }
+
+    def generate_ai_response(prompt, user_id=None):
+        calls.append(threading.get_ident())
+        raise HTTPException(status_code=504, detail="AI response generation timed out")
+
+    monkeypatch.setattr(message_routes.conversation_service, "get_conversation_context", get_conversation_context)
+    monkeypatch.setattr(message_routes.ai_service, "generate_ai_response", generate_ai_response)
+    monkeypatch.setattr(message_routes, "async_db", FakeDatabase({
+        "_id": audio_id,
+        "transcription": "One coffee please",
+        "file_path": "app/uploads/audio.wav"
+    }))
+    app.dependency_overrides[get_current_user] = lambda: {"_id": user_id, "email": "test@example.com"}
+    try:
+        response = client.post(f"/api/conversations/{conversation_id}/message", params={"audio_id": str(audio_id)})
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    assert response.status_code == 504
+    assert len(calls) == 1
+    assert calls[0] != loop_threads[0]
+
+
+class FakeUnitOfWork:
+    """UnitOfWork stand-in that drops the turn's writes."""
+
+    def insert(self, collection, document):
+        pass
+
+    def update(self, collection, filter, update, upsert=False):
+        pass
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.parametrize("speech_format, presynthesized", [
+    ("opus", [("Two coffees coming up.", "af_heart", "opus")]),
+    (None, [])
+])
+def test_reply_is_presynthesized_in_the_clients_speech_format(client, monkeypatch, speech_format, presynthesized):
+    """Test that presynthesis uses the stored speech format and is skipped while it is unknown"""
+    user_id, conversation_id, audio_id = ObjectId(), ObjectId(), ObjectId()
+    calls = []
+
+    async def get_conversation_context(conversation_id):
+        conversation = {
+            "_id": ObjectId(conversation_id),
+            "user_id": user_id,
+            "ai_role": "Barista",
+            "user_role": "Customer",
+            "situation": "Ordering coffee",
+            "voice_type": "af_heart"
+        }
+        if speech_format:
+            conversation["speech_format"] = speech_format
+        return {"conversation": conversation, "messages": []}
+
+    async def generate_speech_feedback(**kwargs):
+        pass
+
+    def presynthesize(text, voice_name, **kwargs):
+        calls.append((text, voice_name, kwargs.get("response_format")))
+
+    monkeypatch.setattr(message_routes.conversation_service, "get_conversation_context", get_conversation_context)
+    monkeypatch.setattr(message_routes.ai_service, "generate_ai_response", lambda prompt, user_id=None: "Two coffees coming up.")
+    monkeypatch.setattr(message_routes.feedback_service, "generate_speech_feedback", generate_speech_feedback)
+    monkeypatch.setattr(message_routes.tts_service, "presynthesize", presynthesize)
+    monkeypatch.setattr(message_routes, "UnitOfWork", FakeUnitOfWork)
+    monkeypatch.setattr(message_routes, "async_db", FakeDatabase({
+        "_id": audio_id,
+        "transcription": "Two coffees please",
+        "file_path": "app/uploads/audio.wav"
+    }))
+    app.dependency_overrides[get_current_user] = lambda: {"_id": user_id, "email": "test@example.com"}
+    try:
+        response = client.post(f"/api/conversations/{conversation_id}/message", params={"audio_id": str(audio_id)})
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    assert response.status_code == 200
+    assert calls == presynthesized
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import mistake_service
+from app.utils.mistake_service import MistakeService, statistics_from_document, stats_document_from_facets
+
+
+def test_facet_result_becomes_a_stats_document():
+    """Test that grouped counts fill every status and type counter"""
+    user_id = ObjectId()
+    stats = stats_document_from_facets(user_id, {
+        "by_status": [{"_id": "NEW", "count": 3}, {"_id": "MASTERED", "count": 1}],
+        "by_type": [{"_id": "GRAMMAR", "count": 4}]
+    })
+    assert stats["_id"] == user_id
+    assert stats["total_count"] == 4
+    assert stats["status_counts"] == {"NEW": 3, "LEARNING": 0, "MASTERED": 1}
+    assert stats["type_counts"] == {"GRAMMAR": 4, "VOCABULARY": 0}
+    assert stats["reconciled_at"] == stats["updated_at"]
+
+
+def test_user_without_mistakes_gets_zero_counts():
+    """Test that an empty aggregation result reconciles to zeros"""
+    stats = stats_document_from_facets(ObjectId(), {})
+    statistics = statistics_from_document(stats, due_count=0)
+    assert statistics.total_count == 0
+    assert statistics.mastery_percentage == 0
+
+
+def test_statistics_combine_document_and_due_count():
+    """Test the API statistics built from a stored document"""
+    stats = {
+        "total_count": 4,
+        "status_counts": {"NEW": 1, "LEARNING": 2, "MASTERED": 1},
+        "type_counts": {"GRAMMAR": 3, "VOCABULARY": 1}
+    }
+    statistics = statistics_from_document(stats, due_count=2).to_dict()
+    assert statistics == {
+        "total_count": 4,
+        "mastered_count": 1,
+        "learning_count": 2,
+        "new_count": 1,
+        "type_distribution": {"GRAMMAR": 3, "VOCABULARY": 1},
+        "due_for_practice": 2,
+        "mastery_percentage": 25.0
+    }
+
+
+class AsyncCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self):
+        return self.documents
+
+
+class AsyncStatsCollection:
+    """Async collection fake for mistake_stats"""
+
+    def __init__(self, document=None):
+        self.document = document
+        self.replaced = []
+
+    async def find_one(self, filter):
+        return self.document
+
+    async def replace_one(self, filter, document, upsert=False):
+        self.replaced.append(document)
+
+
+class AsyncMistakesCollection:
+    """Async collection fake for mistakes"""
+
+    def __init__(self, facets, due_count):
+        self.facets = facets
+        self.due_count = due_count
+        self.aggregations = 0
+
+    async def aggregate(self, pipeline):
+        self.aggregations += 1
+        return AsyncCursor([self.facets])
+
+    async def count_documents(self, filter):
+        return self.due_count
+
+
+def test_statistics_are_read_from_the_stored_document(monkeypatch):
+    """Test that the endpoint path reads the materialized document on the async client"""
+    stats = stats_document_from_facets(ObjectId(), {"by_status": [{"_id": "NEW", "count": 2}]})
+    mistakes = AsyncMistakesCollection({}, due_count=1)
+    monkeypatch.setattr(mistake_service, "async_db", SimpleNamespace(
+        mistake_stats=AsyncStatsCollection(stats), mistakes=mistakes
+    ))
+    monkeypatch.setattr(mistake_service, "db", None)
+
+    statistics = asyncio.run(MistakeService().get_mistake_statistics(str(stats["_id"])))
+
+    assert statistics.new_count == 2
+    assert statistics.due_for_practice == 1
+    assert mistakes.aggregations == 0
+
+
+def test_missing_statistics_document_is_built_on_first_read(monkeypatch):
+    """Test that a user's first read counts the mistakes once and stores the document"""
+    user_id = ObjectId()
+    stats_collection = AsyncStatsCollection()
+    mistakes = AsyncMistakesCollection({
+        "by_status": [{"_id": "LEARNING", "count": 1}, {"_id": "MASTERED", "count": 1}],
+        "by_type": [{"_id": "VOCABULARY", "count": 2}]
+    }, due_count=0)
+    monkeypatch.setattr(mistake_service, "async_db", SimpleNamespace(mistake_stats=stats_collection, mistakes=mistakes))
+    monkeypatch.setattr(mistake_service, "db", None)
+
+    statistics = asyncio.run(MistakeService().get_mistake_statistics(str(user_id)))
+
+    assert statistics.total_count == 2
+    assert statistics.mastery_percentage == 50.0
+    assert statistics.type_distribution["VOCABULARY"] == 2
+    assert stats_collection.replaced[0]["_id"] == user_id
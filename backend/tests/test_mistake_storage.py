@@ -0,0 +1,161 @@
+import os
+import sys
+from types import SimpleNamespace
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import mistake_service
+from app.utils.mistake_service import MistakeService, normalize_mistake_text
+
+
+class RecordingCollection:
+    """Collection stand-in that records bulk writes and upserts everything."""
+
+    def __init__(self):
+        self.bulk_writes = []
+        self.updates = []
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_writes.append(operations)
+        return SimpleNamespace(
+            matched_count=0,
+            upserted_count=len(operations),
+            upserted_ids={index: ObjectId() for index in range(len(operations))}
+        )
+
+    def update_one(self, *args, **kwargs):
+        self.updates.append(args)
+
+
+def test_normalized_text_ignores_case_and_spacing():
+    """Test that trivially different spellings share one identity"""
+    assert normalize_mistake_text("  I   GO\tthere ") == "i go there"
+
+
+def test_mistakes_are_stored_in_one_bulk_upsert(monkeypatch):
+    """Test that a feedback's mistakes cost one round trip, with repeats merged"""
+    mistakes = RecordingCollection()
+    stats = RecordingCollection()
+    monkeypatch.setattr(mistake_service, "db", SimpleNamespace(mistakes=mistakes, mistake_stats=stats))
+    user_id = str(ObjectId())
+
+    stored = MistakeService().process_feedback_for_mistakes(user_id, "I go to school, i go home", {
+        "grammar_issues": [
+            {"issue": "I go", "correction": "I went", "severity": 4},
+            {"issue": "i  go", "correction": "I went", "severity": 4}
+        ],
+        "vocabulary_issues": [{"original": "big", "better_alternative": "huge"}]
+    })
+
+    assert stored == 2
+    assert len(mistakes.bulk_writes) == 1
+    operations = mistakes.bulk_writes[0]
+    grammar = operations[0]._doc
+    assert operations[0]._filter["normalized_text"] == "i go"
+    assert operations[0]._filter["active"] is True
+    assert grammar["$inc"] == {"frequency": 2}
+    assert "frequency" not in grammar["$setOnInsert"]
+    assert grammar["$setOnInsert"]["status"] == "NEW"
+
+    # Inserted mistakes are counted in the statistics in a single update
+    assert len(stats.updates) == 1
+    increments = stats.updates[0][1]["$inc"]
+    assert increments["total_count"] == 2
+    assert increments["type_counts.GRAMMAR"] == 1
+    assert increments["type_counts.VOCABULARY"] == 1
+
+
+class PartialUniqueMistakes:
+    """
+    Mistake collection stand-in enforcing user_type_normalized_text_active:
+    unique (user_id, type, normalized_text) among documents with active: True.
+    """
+
+    def __init__(self, documents):
+        self.documents = {document["_id"]: document for document in documents}
+
+    def _check_unique(self):
+        seen = set()
+        for document in self.documents.values():
+            if document.get("active") is not True:
+                continue
+            key = (document["user_id"], document["type"], document.get("normalized_text"))
+            if key in seen:
+                raise DuplicateKeyError("E11000 duplicate key error index: user_type_normalized_text_active")
+            seen.add(key)
+
+    def find_one(self, filter):
+        document = self.documents.get(filter["_id"])
+        if document and all(document.get(key) == value for key, value in filter.items()):
+            return dict(document)
+        return None
+
+    def find_one_and_update(self, filter, update, return_document=None):
+        document = self.documents.get(filter["_id"])
+        if not document or document.get("status", "NEW") != filter["status"]:
+            return None
+        previous = dict(document)
+        document.update(update["$set"])
+        try:
+            self._check_unique()
+        except DuplicateKeyError:
+            self.documents[document["_id"]] = previous
+            raise
+        return dict(document)
+
+
+MISTAKE_TEXT = {"original_text": "I go", "correction": "I went", "explanation": "Past tense"}
+
+
+def practice(service, mistake, was_successful):
+    return service.update_after_practice(
+        str(mistake["_id"]),
+        {"user_id": str(mistake["user_id"]), "was_successful": was_successful, "user_answer": "answer"}
+    )
+
+
+def test_practicing_legacy_mistakes_does_not_collide(monkeypatch):
+    """Test that mistakes stored before normalized_text existed stay outside the unique identity"""
+    user_id = ObjectId()
+    legacy = [
+        {"_id": ObjectId(), "user_id": user_id, "type": "GRAMMAR", "status": "NEW", **MISTAKE_TEXT, "original_text": text}
+        for text in ("I go", "She like")
+    ]
+    mistakes = PartialUniqueMistakes(legacy)
+    monkeypatch.setattr(mistake_service, "db", SimpleNamespace(mistakes=mistakes, mistake_stats=RecordingCollection()))
+    service = MistakeService()
+
+    for mistake in legacy:
+        for _ in range(3):
+            practice(service, mistake, was_successful=False)
+        practice(service, mistake, was_successful=True)
+
+    assert all("active" not in document for document in mistakes.documents.values())
+    assert all(document["practice_count"] == 4 for document in mistakes.documents.values())
+
+
+def test_mastered_mistake_is_not_reactivated(monkeypatch):
+    """Test that a mastered mistake falling back to learning leaves the identity to a newer one"""
+    user_id = ObjectId()
+    identity = {"user_id": user_id, "type": "GRAMMAR", "normalized_text": "i go", **MISTAKE_TEXT}
+    old = {"_id": ObjectId(), **identity, "status": "NEW", "active": True, "practice_count": 2, "success_count": 2}
+    mistakes = PartialUniqueMistakes([old])
+    monkeypatch.setattr(mistake_service, "db", SimpleNamespace(mistakes=mistakes, mistake_stats=RecordingCollection()))
+    service = MistakeService()
+
+    assert practice(service, old, was_successful=True)["status"] == "MASTERED"
+    assert mistakes.documents[old["_id"]]["active"] is False
+
+    # The same mistake is made again and stored as a new active document
+    newer = {"_id": ObjectId(), **identity, "status": "NEW", "active": True}
+    mistakes.documents[newer["_id"]] = newer
+    for _ in range(3):
+        practice(service, old, was_successful=False)
+
+    assert mistakes.documents[old["_id"]]["status"] == "LEARNING"
+    assert mistakes.documents[old["_id"]]["active"] is False
+    assert mistakes.documents[newer["_id"]]["active"] is True
@@ -0,0 +1,70 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_filter, keyset_page, keyset_sort, next_page
+
+
+def test_cursor_round_trips_timestamp_and_id():
+    """Test that a cursor decodes to the exact position it was built from"""
+    timestamp = datetime(2024, 5, 1, 12, 30, 15, 123000)
+    document_id = ObjectId()
+    cursor = encode_cursor(timestamp, document_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (timestamp, document_id)
+
+
+def test_invalid_cursor_is_a_client_error():
+    """Test that tampered cursors are rejected with 400"""
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not-a-cursor")
+    assert error.value.status_code == 400
+
+
+def test_keyset_filter_breaks_timestamp_ties_by_id():
+    """Test the condition selecting documents after the cursor"""
+    timestamp = datetime(2024, 5, 1)
+    document_id = ObjectId()
+    cursor = encode_cursor(timestamp, document_id)
+
+    assert keyset_filter("timestamp", None) == {}
+    assert keyset_filter("timestamp", cursor) == {"$or": [
+        {"timestamp": {"$lt": timestamp}},
+        {"timestamp": timestamp, "_id": {"$lt": document_id}}
+    ]}
+    assert keyset_filter("timestamp", cursor, descending=False)["$or"][0] == {"timestamp": {"$gt": timestamp}}
+    assert keyset_sort("timestamp") == [("timestamp", -1), ("_id", -1)]
+
+
+def test_next_page_uses_the_extra_document_as_look_ahead():
+    """Test that a cursor is only returned when more documents exist"""
+    documents = [{"_id": ObjectId(), "timestamp": datetime(2024, 5, 1, 0, 0, i)} for i in range(3)]
+
+    page, cursor = next_page(documents, "timestamp", limit=2)
+    assert page == documents[:2]
+    assert decode_cursor(cursor) == (documents[1]["timestamp"], documents[1]["_id"])
+
+    page, cursor = next_page(documents[:2], "timestamp", limit=2)
+    assert page == documents[:2]
+    assert cursor is None
+
+
+def test_keyset_page_walks_documents_in_memory():
+    """Test that in-memory pages match what the keyset query would return"""
+    timestamp = datetime(2024, 5, 1)
+    documents = [{"_id": ObjectId(), "timestamp": timestamp} for _ in range(3)]
+    documents.append({"_id": ObjectId(), "timestamp": datetime(2024, 5, 2)})
+
+    first, cursor = keyset_page(documents, "timestamp", None, limit=2)
+    second, last_cursor = keyset_page(documents, "timestamp", cursor, limit=2)
+
+    newest_first = sorted(documents, key=lambda d: (d["timestamp"], d["_id"]), reverse=True)
+    assert first + second == newest_first
+    assert last_cursor is None
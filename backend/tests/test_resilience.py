@@ -0,0 +1,130 @@
+import os
+import sys
+import time
+import pytest
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    ResilientCaller,
+    backoff_delay
+)
+
+
+class TransientError(Exception):
+    pass
+
+
+def make_caller(**kwargs):
+    """Helper to build a caller with fast retries for tests"""
+    options = {
+        "name": "test",
+        "timeout": 2.0,
+        "max_attempts": 3,
+        "base_delay": 0.01,
+        "max_delay": 0.02,
+        "is_retryable": lambda exc: isinstance(exc, (TransientError, TimeoutError)),
+    }
+    options.update(kwargs)
+    return ResilientCaller(**options)
+
+
+def test_backoff_delay_is_bounded():
+    """Test that jittered backoff never exceeds the capped exponential delay"""
+    for attempt in range(10):
+        delay = backoff_delay(attempt, base_delay=0.5, max_delay=4.0)
+        assert 0 <= delay <= min(4.0, 0.5 * 2 ** attempt)
+
+
+def test_retries_transient_errors_until_success():
+    """Test that retryable errors are retried and the eventual result returned"""
+    calls = []
+
+    def flaky(remaining):
+        calls.append(remaining)
+        if len(calls) < 3:
+            raise TransientError("try again")
+        return "ok"
+
+    assert make_caller().call(flaky) == "ok"
+    assert len(calls) == 3
+    assert all(remaining > 0 for remaining in calls)
+
+
+def test_non_retryable_error_is_raised_immediately():
+    """Test that non-retryable errors are not retried"""
+    calls = []
+
+    def bad_request(remaining):
+        calls.append(remaining)
+        raise ValueError("bad prompt")
+
+    with pytest.raises(ValueError):
+        make_caller().call(bad_request)
+    assert len(calls) == 1
+
+
+def test_deadline_exceeded():
+    """Test that a stalled call is abandoned once the deadline passes"""
+    def stalled(remaining):
+        time.sleep(0.5)
+        return "late"
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        make_caller(max_attempts=1).call(stalled, timeout=0.1)
+    assert time.monotonic() - start < 0.4
+
+
+def test_circuit_opens_after_repeated_failures():
+    """Test that the breaker rejects calls after the failure threshold"""
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+    caller = make_caller(max_attempts=1, breaker=breaker)
+
+    def failing(remaining):
+        raise TransientError("down")
+
+    for _ in range(2):
+        with pytest.raises(TransientError):
+            caller.call(failing)
+
+    with pytest.raises(CircuitOpenError):
+        caller.call(lambda remaining: "ok")
+
+
+def test_circuit_half_open_recovers():
+    """Test that a successful trial call closes an open circuit"""
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one trial at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_hedged_request_wins_over_slow_primary():
+    """Test that a slow first request is hedged once the p95 latency is known"""
+    caller = make_caller(hedge=True, max_attempts=1)
+    for _ in range(caller.latency.min_samples):
+        caller.latency.record(0.01)
+
+    calls = []
+
+    def sometimes_slow(remaining):
+        calls.append(remaining)
+        if len(calls) == 1:
+            time.sleep(1.0)
+            return "slow"
+        return "fast"
+
+    start = time.monotonic()
+    assert caller.call(sometimes_slow) == "fast"
+    assert time.monotonic() - start < 0.5
+    assert len(calls) == 2
@@ -0,0 +1,205 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import scenario_service as scenario_module
+from app.services.scenario_service import ScenarioService, build_scenario_key, normalize_scenario_text
+from app.utils import build_scenario_library
+from app.utils.build_scenario_library import DEFAULT_SEEDS_FILE, build_library, load_seeds
+
+SEED = {"topic": "Restaurant", "level": "Beginner", "user_role": "customer", "ai_role": "waiter", "situation": "ordering food"}
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self):
+        return self.documents
+
+
+class FakeScenarios:
+    """Async scenarios collection fake supporting the library's queries"""
+
+    def __init__(self):
+        self.documents = []
+
+    def _matches(self, query):
+        return [d for d in self.documents if all(d.get(key) == value for key, value in query.items())]
+
+    async def insert_one(self, document):
+        document["_id"] = ObjectId()
+        self.documents.append(document)
+        return SimpleNamespace(inserted_id=document["_id"])
+
+    async def count_documents(self, query):
+        return len(self._matches(query))
+
+    async def aggregate(self, pipeline):
+        matches = self._matches(pipeline[0]["$match"])
+        return FakeCursor(matches[:pipeline[1]["$sample"]["size"]])
+
+
+def refined_context(response="Welcome! What would you like to order?"):
+    return {
+        "refined_user_role": "A hungry customer",
+        "refined_ai_role": "A friendly waiter",
+        "refined_situation": "Ordering dinner at a small restaurant",
+        "response": response,
+        "ai_gender": "male",
+        "voice_type": "echo"
+    }
+
+
+def use_fake_library(monkeypatch):
+    scenarios = FakeScenarios()
+    monkeypatch.setattr(scenario_module, "async_db", SimpleNamespace(scenarios=scenarios))
+    return scenarios
+
+
+def test_scenario_key_ignores_case_punctuation_and_spacing():
+    """Test that trivially different requests share one library key"""
+    assert normalize_scenario_text("  Ordering   FOOD!! ") == "ordering food"
+    assert build_scenario_key("Customer", "waiter.", "ordering  food") == build_scenario_key("customer", "Waiter", "Ordering food?")
+    assert build_scenario_key("customer", "waiter", "ordering food") != build_scenario_key("waiter", "customer", "ordering food")
+
+
+def test_saved_scenario_is_found_for_a_matching_request(monkeypatch):
+    """Test that a stored scenario is returned in refined context format"""
+    use_fake_library(monkeypatch)
+    service = ScenarioService()
+
+    async def scenario():
+        scenario_id = await service.save_scenario(SEED, refined_context())
+        found = await service.find_scenario("Customer", "Waiter", "Ordering food.", level="BEGINNER")
+        return scenario_id, found
+
+    scenario_id, found = asyncio.run(scenario())
+
+    assert found == {**refined_context(), "speech_path": None, "scenario_id": scenario_id}
+
+
+def test_request_without_a_library_match_returns_none(monkeypatch):
+    """Test that other roles, situations or levels fall back to live refinement"""
+    use_fake_library(monkeypatch)
+    service = ScenarioService()
+
+    async def scenario():
+        await service.save_scenario(SEED, refined_context())
+        return (
+            await service.find_scenario("customer", "chef", "ordering food"),
+            await service.find_scenario("customer", "waiter", "ordering food", level="advanced")
+        )
+
+    assert asyncio.run(scenario()) == (None, None)
+
+
+def test_missing_audio_file_is_not_served(monkeypatch, tmp_path):
+    """Test that a scenario whose audio was removed is served without it"""
+    use_fake_library(monkeypatch)
+    service = ScenarioService()
+    audio = tmp_path / "opening.mp3"
+    audio.write_bytes(b"audio")
+
+    async def scenario():
+        await service.save_scenario(SEED, refined_context(), str(audio))
+        kept = await service.find_scenario("customer", "waiter", "ordering food")
+        audio.unlink()
+        dropped = await service.find_scenario("customer", "waiter", "ordering food")
+        return kept, dropped
+
+    kept, dropped = asyncio.run(scenario())
+
+    assert kept["speech_path"] == str(audio)
+    assert dropped["speech_path"] is None
+
+
+def test_lookup_failure_does_not_fail_conversation_creation(monkeypatch):
+    """Test that a database error during lookup is treated as a miss"""
+    class BrokenScenarios:
+        async def aggregate(self, pipeline):
+            raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(scenario_module, "async_db", SimpleNamespace(scenarios=BrokenScenarios()))
+
+    assert asyncio.run(ScenarioService().find_scenario("customer", "waiter", "ordering food")) is None
+
+
+def test_saved_scenario_is_tagged_by_level_and_topic(monkeypatch):
+    """Test that seeding stores the lookup key and lowercased tags"""
+    scenarios = use_fake_library(monkeypatch)
+
+    asyncio.run(ScenarioService().save_scenario(SEED, refined_context()))
+
+    document = scenarios.documents[0]
+    assert document["scenario_key"] == "customer|waiter|ordering food"
+    assert document["level"] == "beginner"
+    assert document["topic"] == "restaurant"
+    assert document["source"] == {"user_role": "customer", "ai_role": "waiter", "situation": "ordering food"}
+
+
+def test_default_seeds_are_complete():
+    """Test that every bundled seed has the fields the builder needs"""
+    seeds = load_seeds(DEFAULT_SEEDS_FILE)
+
+    assert seeds
+    for seed in seeds:
+        assert {"user_role", "ai_role", "situation", "level", "topic"} <= set(seed)
+
+
+def test_build_library_tops_up_each_seed_with_audio(monkeypatch, tmp_path):
+    """Test that the builder only creates missing variants and stores their audio"""
+    scenarios = use_fake_library(monkeypatch)
+    refinements = []
+
+    class FakeAIService:
+        def refine_conversation_context(self, user_role, ai_role, situation):
+            refinements.append(situation)
+            return refined_context(f"Hello number {len(refinements)}")
+
+    async def fake_synthesize(text_to_speak, voice_name):
+        return text_to_speak.encode()
+
+    monkeypatch.setattr(build_scenario_library, "AIService", FakeAIService)
+    monkeypatch.setattr(build_scenario_library, "synthesize_speech_bytes", fake_synthesize)
+    monkeypatch.setattr(build_scenario_library, "SCENARIO_AUDIO_DIR", tmp_path / "scenarios")
+    other_seed = {**SEED, "situation": "paying the bill"}
+
+    async def scenario():
+        await ScenarioService().save_scenario(SEED, refined_context())
+        return await build_library([SEED, other_seed], variants=2)
+
+    created = asyncio.run(scenario())
+
+    assert created == 3
+    assert refinements == ["ordering food", "paying the bill", "paying the bill"]
+    rendered = [document["speech_path"] for document in scenarios.documents[1:]]
+    assert all(path.startswith(str(tmp_path / "scenarios")) for path in rendered)
+    assert open(rendered[0], "rb").read() == b"Hello number 1"
+
+
+def test_build_library_skips_failed_refinements_and_audio(monkeypatch):
+    """Test that a failed refinement stores nothing and skip_audio stores no path"""
+    scenarios = use_fake_library(monkeypatch)
+    attempts = []
+
+    class FlakyAIService:
+        def refine_conversation_context(self, user_role, ai_role, situation):
+            attempts.append(situation)
+            if len(attempts) == 1:
+                raise RuntimeError("Gemini unavailable")
+            return refined_context()
+
+    monkeypatch.setattr(build_scenario_library, "AIService", FlakyAIService)
+
+    created = asyncio.run(build_library([SEED], variants=2, skip_audio=True))
+
+    assert created == 1
+    assert len(attempts) == 2
+    assert scenarios.documents[0]["speech_path"] is None
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import speech_synthesis as synthesis_module
+from app.utils.speech_synthesis import SpeechSynthesisRegistry
+from app.utils.tts_cache import TTSCache
+
+
+class FakeResponse:
+    def __init__(self, body_iterator):
+        self.media_type = "audio/mpeg"
+        self.body_iterator = body_iterator
+
+
+@pytest.fixture
+def fake_tts(monkeypatch, tmp_path):
+    """Replace the TTS backend with a gated stream and the cache with a temp one"""
+    state = {"calls": 0, "gate": None, "fail": False}
+
+    async def chunks():
+        yield b"ab"
+        await state["gate"].wait()
+        if state["fail"]:
+            raise RuntimeError("upstream closed")
+        yield b"cd"
+
+    async def get_speech_from_tts_service(**kwargs):
+        state["calls"] += 1
+        return FakeResponse(chunks())
+
+    monkeypatch.setattr(synthesis_module, "get_speech_from_tts_service", get_speech_from_tts_service)
+    monkeypatch.setattr(synthesis_module, "tts_cache", TTSCache(tmp_path, max_bytes=1000))
+    return state
+
+
+async def consume(iterator):
+    return b"".join([chunk async for chunk in iterator])
+
+
+def test_listeners_share_one_synthesis(fake_tts):
+    """Test that a late listener replays the buffer and follows the live stream"""
+    async def scenario():
+        fake_tts["gate"] = asyncio.Event()
+        registry = SpeechSynthesisRegistry()
+        job = registry.get_or_start("a" * 64, "mp3", text_to_speak="Hello")
+        await job.wait_started()
+        early = asyncio.create_task(consume(job.listen()))
+        await asyncio.sleep(0.01)
+
+        assert registry.get_or_start("a" * 64, "mp3", text_to_speak="Hello") is job
+        late = asyncio.create_task(consume(job.listen()))
+        fake_tts["gate"].set()
+
+        assert await early == b"abcd"
+        assert await late == b"abcd"
+        await job.task
+        assert registry.get("a" * 64) is None
+        return synthesis_module.tts_cache.get("a" * 64).read_bytes()
+
+    assert asyncio.run(scenario()) == b"abcd"
+    assert fake_tts["calls"] == 1
+
+
+def test_failed_synthesis_reaches_listeners(fake_tts):
+    """Test that listeners see the upstream error and nothing is cached"""
+    async def scenario():
+        fake_tts["gate"] = asyncio.Event()
+        fake_tts["fail"] = True
+        registry = SpeechSynthesisRegistry()
+        job = registry.get_or_start("b" * 64, "mp3", text_to_speak="Hello")
+        await job.wait_started()
+        fake_tts["gate"].set()
+        with pytest.raises(RuntimeError):
+            await consume(job.listen())
+        await job.task
+        assert job.done
+        return synthesis_module.tts_cache.get("b" * 64)
+
+    assert asyncio.run(scenario()) is None
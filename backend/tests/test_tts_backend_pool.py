@@ -0,0 +1,183 @@
+import asyncio
+import os
+import sys
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import tts_client_service
+from app.utils.resilience import CircuitBreaker
+from app.utils.tts_backend_pool import NoTTSBackendAvailableError, TTSBackendPool
+
+
+def make_pool(handlers):
+    """Build a pool whose backends answer with the given request handlers"""
+    pool = TTSBackendPool([f"http://tts-{index}" for index in range(len(handlers))])
+    for backend, handler in zip(pool.backends, handlers):
+        backend._client = httpx.AsyncClient(base_url=backend.base_url, transport=httpx.MockTransport(handler))
+    return pool
+
+
+def ok(request):
+    return httpx.Response(200, content=b"audio", headers={"content-type": "audio/mpeg"})
+
+
+def down(request):
+    return httpx.Response(503, content=b"overloaded")
+
+
+def test_least_outstanding_backend_is_picked():
+    """Test that requests go to the backend with the fewest outstanding requests"""
+    pool = make_pool([ok, ok])
+    first = pool.acquire()
+    second = pool.acquire()
+    assert first.backend is not second.backend
+
+    first.release()
+    assert pool.acquire().backend is first.backend
+
+
+def test_unhealthy_and_open_backends_are_skipped():
+    """Test that failed health probes and open circuits take a backend out of rotation"""
+    pool = make_pool([ok, ok])
+    pool.backends[0].healthy = False
+    assert pool.pick() is pool.backends[1]
+
+    for _ in range(pool.backends[1].breaker.failure_threshold):
+        pool.backends[1].breaker.record_failure()
+    assert pool.backends[1].breaker.state == CircuitBreaker.OPEN
+    # With no healthy backend left, the unhealthy one is still tried
+    assert pool.pick() is pool.backends[0]
+
+    for _ in range(pool.backends[0].breaker.failure_threshold):
+        pool.backends[0].breaker.record_failure()
+    with pytest.raises(NoTTSBackendAvailableError):
+        pool.pick()
+
+
+def test_request_fails_over_to_next_backend(monkeypatch):
+    """Test that a 5xx answer is retried on another backend and counted against the first"""
+    pool = make_pool([down, ok])
+    pool.backends[1].requests = 1  # make the failing backend the first choice
+    monkeypatch.setattr(tts_client_service, "tts_backend_pool", pool)
+
+    audio = asyncio.run(tts_client_service.synthesize_speech_bytes("Hello", "af_heart"))
+
+    assert audio == b"audio"
+    assert pool.backends[0].errors == 1
+    assert pool.backends[1].errors == 0
+    assert all(backend.outstanding == 0 for backend in pool.backends)
+
+
+def test_streaming_holds_backend_until_stream_closes(monkeypatch):
+    """Test that a streamed response counts as outstanding until fully read"""
+    pool = make_pool([ok])
+    monkeypatch.setattr(tts_client_service, "tts_backend_pool", pool)
+
+    async def scenario():
+        response = await tts_client_service.get_speech_from_tts_service("Hello", "af_heart")
+        assert pool.backends[0].outstanding == 1
+        audio = b"".join([chunk async for chunk in response.body_iterator])
+        return audio
+
+    assert asyncio.run(scenario()) == b"audio"
+    assert pool.backends[0].outstanding == 0
+    assert pool.snapshot()[0]["latency_seconds"]["p50"] is not None
+
+
+def test_client_errors_are_not_retried(monkeypatch):
+    """Test that a rejected request is surfaced without penalizing the backend"""
+    calls = []
+
+    def bad_request(request):
+        calls.append(request)
+        return httpx.Response(422, content=b"invalid voice")
+
+    pool = make_pool([bad_request, bad_request])
+    monkeypatch.setattr(tts_client_service, "tts_backend_pool", pool)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(tts_client_service.synthesize_speech_bytes("Hello", "nope"))
+    assert error.value.status_code == 422
+    assert len(calls) == 1
+    assert pool.backends[0].breaker.state == CircuitBreaker.CLOSED
+
+
+def test_shared_client_is_reused_and_closed_on_shutdown(monkeypatch):
+    """Test that calls share one keep-alive client per backend until shutdown closes it"""
+    from app.utils import tts_backend_pool as pool_module
+
+    created = []
+    used = []
+
+    def handler(request):
+        return httpx.Response(200, content=b"audio", headers={"content-type": "audio/mpeg"})
+
+    class RecordingClient(httpx.AsyncClient):
+        def __init__(self, **kwargs):
+            super().__init__(transport=httpx.MockTransport(handler), **kwargs)
+            created.append(self)
+
+        async def send(self, request, **kwargs):
+            if request.url.path == tts_client_service.TTS_ENDPOINT_PATH:
+                used.append(self)
+            return await super().send(request, **kwargs)
+
+    monkeypatch.setattr(pool_module.httpx, "AsyncClient", RecordingClient)
+    pool = TTSBackendPool(["http://tts-0"])
+    monkeypatch.setattr(tts_client_service, "tts_backend_pool", pool)
+
+    async def scenario():
+        await tts_client_service.start_tts_client()
+        await tts_client_service.synthesize_speech_bytes("Hello", "af_heart")
+        await tts_client_service.synthesize_speech_bytes("Hello again", "af_heart")
+        response = await tts_client_service.get_speech_from_tts_service("Hello", "af_heart")
+        b"".join([chunk async for chunk in response.body_iterator])
+        await tts_client_service.close_tts_client()
+
+    asyncio.run(scenario())
+
+    assert len(created) == 1
+    assert len(used) == 3
+    assert all(client is created[0] for client in used)
+    assert created[0].is_closed
+    assert pool.backends[0]._client is None
+
+
+def test_unread_stream_releases_backend_after_response(monkeypatch):
+    """Test that a streamed response whose body is never iterated still frees its backend"""
+    pool = make_pool([ok])
+    monkeypatch.setattr(tts_client_service, "tts_backend_pool", pool)
+
+    async def scenario():
+        response = await tts_client_service.get_speech_from_tts_service("Hello", "af_heart")
+        assert pool.backends[0].outstanding == 1
+        # Starlette runs the background task once the response is over, even
+        # when the client went away before the body was sent
+        await response.background()
+        await response.background()
+
+    asyncio.run(scenario())
+
+    assert pool.backends[0].outstanding == 0
+
+
+def test_closing_the_body_iterator_releases_backend(monkeypatch):
+    """Test that consumers reading body_iterator directly release the backend by closing it"""
+    from contextlib import aclosing
+
+    pool = make_pool([ok])
+    monkeypatch.setattr(tts_client_service, "tts_backend_pool", pool)
+
+    async def scenario():
+        response = await tts_client_service.get_speech_from_tts_service("Hello", "af_heart")
+        async with aclosing(response.body_iterator):
+            pass
+
+    asyncio.run(scenario())
+
+    assert pool.backends[0].outstanding == 0
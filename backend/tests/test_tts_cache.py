@@ -0,0 +1,109 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.tts_cache import TTSCache, build_tts_cache_key
+
+
+async def stream(chunks, fail=False):
+    for chunk in chunks:
+        yield chunk
+    if fail:
+        raise RuntimeError("upstream closed")
+
+
+async def consume(iterator):
+    return b"".join([chunk async for chunk in iterator])
+
+
+def test_cache_key_depends_on_every_parameter():
+    """Test that changing any synthesis parameter changes the key"""
+    base = build_tts_cache_key("Hello", "af_heart", 1.3, "mp3")
+    assert base == build_tts_cache_key("Hello", "af_heart", 1.3, "mp3")
+    assert base != build_tts_cache_key("Hello", "af_heart", 1.3, "opus")
+    assert base != build_tts_cache_key("Hello", "am_echo", 1.3, "mp3")
+    assert base != build_tts_cache_key("Hello", "af_heart", 1.0, "mp3")
+
+
+def test_tee_commits_only_complete_streams(tmp_path):
+    """Test that a finished stream is cached and an interrupted one is not"""
+    cache = TTSCache(tmp_path, max_bytes=1000)
+
+    assert asyncio.run(consume(cache.tee("a" * 64, "mp3", stream([b"ab", b"cd"])))) == b"abcd"
+    assert cache.get("a" * 64).read_bytes() == b"abcd"
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(consume(cache.tee("b" * 64, "mp3", stream([b"ab"], fail=True))))
+    assert cache.get("b" * 64) is None
+    assert not list(tmp_path.glob("*/.*.part"))
+
+
+def test_lru_eviction_keeps_recently_played(tmp_path):
+    """Test that the least recently used entry is evicted first"""
+    cache = TTSCache(tmp_path, max_bytes=10)
+    cache.put("a" * 64, "mp3", b"x" * 4)
+    cache.put("b" * 64, "mp3", b"x" * 4)
+    assert cache.get("a" * 64) is not None
+
+    cache.put("c" * 64, "mp3", b"x" * 4)
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) is not None
+    assert cache.total_bytes == 8
+
+    # A fresh instance rebuilds the index from disk
+    assert TTSCache(tmp_path, max_bytes=10).total_bytes == 8
+
+
+def test_disk_work_stays_off_the_event_loop(tmp_path, monkeypatch):
+    """Test that indexing and streamed writes never run on the event loop thread"""
+    (tmp_path / "aa").mkdir()
+    (tmp_path / "aa" / f"{'a' * 64}.mp3").write_bytes(b"abcd")
+    cache = TTSCache(tmp_path, max_bytes=1000)
+    threads = []
+
+    class RecordingFile:
+        def __init__(self, f):
+            self.f = f
+
+        def write(self, chunk):
+            threads.append(threading.get_ident())
+            return self.f.write(chunk)
+
+        def close(self):
+            threads.append(threading.get_ident())
+            self.f.close()
+
+    load, open_temp = cache._load, cache._open_temp
+
+    def recording_load():
+        threads.append(threading.get_ident())
+        load()
+
+    def recording_open_temp(key):
+        threads.append(threading.get_ident())
+        f, temp_path = open_temp(key)
+        return RecordingFile(f), temp_path
+
+    monkeypatch.setattr(cache, "_load", recording_load)
+    monkeypatch.setattr(cache, "_open_temp", recording_open_temp)
+
+    async def scenario():
+        assert not cache.contains("a" * 64)
+        await cache.load()
+        assert cache.contains("a" * 64)
+        assert await consume(cache.tee("b" * 64, "mp3", stream([b"ab", b"cd"]))) == b"abcd"
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+
+    # load, open, two writes, close and the commit's index update
+    assert len(threads) == 6
+    assert loop_thread not in threads
+    assert cache.contains("b" * 64)
+    assert cache.get("b" * 64).read_bytes() == b"abcd"
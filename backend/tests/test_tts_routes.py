@@ -0,0 +1,88 @@
+import os
+import sys
+from pathlib import Path
+
+from bson import ObjectId
+from fastapi.responses import StreamingResponse
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.routes import tts_routes
+from app.utils.auth import get_current_user
+from app.utils.tts_cache import TTS_CACHE_DIR
+
+
+def test_demo_speech_bypasses_the_tts_cache(client, monkeypatch):
+    """Test that unauthenticated demo text is streamed without entering the cache"""
+    requests = []
+
+    async def get_speech_from_tts_service(text_to_speak, **kwargs):
+        requests.append((text_to_speak, kwargs["response_format"]))
+
+        async def chunks():
+            yield b"audio"
+
+        return StreamingResponse(chunks(), media_type="audio/mpeg")
+
+    async def get_speech(*args, **kwargs):
+        raise AssertionError("demo speech must not use the TTS cache")
+
+    monkeypatch.setattr(tts_routes, "get_speech_from_tts_service", get_speech_from_tts_service)
+    monkeypatch.setattr(tts_routes.tts_service, "get_speech", get_speech)
+
+    response = client.get("/api/messages/demospeech", params={"message": "Anything at all"})
+
+    assert response.status_code == 200
+    assert response.content == b"audio"
+    assert requests == [("Anything at all", "mp3")]
+    assert response.headers["cache-control"] == tts_routes.PUBLIC_AUDIO_CACHE_CONTROL
+
+
+def test_tts_cache_is_not_publicly_served():
+    """Test that cached audio is stored outside the public /uploads mount"""
+    uploads = (Path(__file__).parent.parent / "app" / "uploads").resolve()
+
+    assert uploads not in TTS_CACHE_DIR.resolve().parents
+
+
+def test_speech_request_records_the_negotiated_format(client, monkeypatch):
+    """Test that the format from Accept is stored for presynthesis and used for the audio"""
+    message_id, conversation_id = ObjectId(), ObjectId()
+    conversation = {"_id": conversation_id, "voice_type": "af_heart"}
+    stored, requested = [], []
+
+    async def get_message(message_id):
+        return {"_id": message_id, "conversation_id": conversation_id, "sender": "ai", "content": "Hello there."}
+
+    async def get_document(collection, document_id, fields=None):
+        return dict(conversation)
+
+    async def set_speech_format(conversation_id, response_format):
+        stored.append((conversation_id, response_format))
+        conversation["speech_format"] = response_format
+
+    async def get_speech(text, voice_name, **kwargs):
+        requested.append(kwargs["response_format"])
+
+        async def chunks():
+            yield b"audio"
+
+        return StreamingResponse(chunks(), media_type="audio/ogg")
+
+    monkeypatch.setattr(tts_routes, "get_message", get_message)
+    monkeypatch.setattr(tts_routes, "get_document", get_document)
+    monkeypatch.setattr(tts_routes.conversation_service, "set_speech_format", set_speech_format)
+    monkeypatch.setattr(tts_routes.tts_service, "get_speech", get_speech)
+    app.dependency_overrides[get_current_user] = lambda: {"_id": ObjectId(), "email": "test@example.com"}
+    try:
+        for _ in range(2):
+            response = client.get(f"/api/messages/{message_id}/speech", headers={"Accept": "audio/ogg"})
+            assert response.status_code == 200
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    assert requested == ["opus", "opus"]
+    # Written once; the second request already finds the format stored
+    assert stored == [(conversation_id, "opus")]
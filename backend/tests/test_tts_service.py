@@ -0,0 +1,129 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import tts_service as tts_service_module
+from app.services.tts_service import TTSService, split_into_sentences
+from app.utils import speech_synthesis as synthesis_module
+from app.utils.speech_synthesis import SpeechSynthesisRegistry
+from app.utils.tts_cache import TTSCache
+
+
+def test_split_into_sentences_merges_short_sentences():
+    """Test that sentences are split on end punctuation and short ones merged"""
+    text = "Hi! How are you today? I am fine, thanks for asking. What would you like to order tonight?"
+    assert split_into_sentences(text, min_chars=20) == [
+        "Hi! How are you today?",
+        "I am fine, thanks for asking.",
+        "What would you like to order tonight?"
+    ]
+    assert split_into_sentences('He said "stop." Then he left. Ok', min_chars=5) == [
+        'He said "stop."',
+        "Then he left. Ok"
+    ]
+    assert split_into_sentences("Hello.", min_chars=20) == ["Hello."]
+
+
+@pytest.fixture
+def fake_tts(monkeypatch):
+    """Replace the TTS backend with one whose latency shrinks with each call"""
+    class Calls(list):
+        active = 0
+        max_active = 0
+
+    calls = Calls()
+
+    async def get_speech_from_tts_service(text_to_speak, **kwargs):
+        calls.append(text_to_speak)
+        if text_to_speak.startswith("Broken"):
+            raise HTTPException(status_code=503, detail="TTS down")
+        delay = 0.05 / len(calls)
+        calls.active += 1
+        calls.max_active = max(calls.max_active, calls.active)
+
+        async def chunks():
+            try:
+                await asyncio.sleep(delay)
+                yield f"<{text_to_speak}>".encode()
+            finally:
+                calls.active -= 1
+
+        return StreamingResponse(chunks(), media_type="audio/mpeg")
+
+    monkeypatch.setattr(tts_service_module, "get_speech_from_tts_service", get_speech_from_tts_service)
+    monkeypatch.setattr(tts_service_module, "TTS_SENTENCE_MIN_CHARS", 1)
+    return calls
+
+
+async def consume(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+async def consume_speech(service, text, **kwargs):
+    return await consume(await service.synthesize_speech(text, "af_heart", **kwargs))
+
+
+def test_fan_out_is_bounded(fake_tts, monkeypatch):
+    """Test that at most TTS_SENTENCE_CONCURRENCY sentences are in flight"""
+    monkeypatch.setattr(tts_service_module, "TTS_SENTENCE_CONCURRENCY", 2)
+    text = "One. Two. Three. Four. Five."
+
+    audio = asyncio.run(consume_speech(TTSService(), text))
+
+    assert audio == b"<One.><Two.><Three.><Four.><Five.>"
+    assert fake_tts.max_active == 2
+
+
+def test_sentence_order_and_fallbacks(fake_tts, monkeypatch):
+    """Test ordered assembly, single-request fallbacks and error propagation"""
+    service = TTSService()
+
+    async def scenario():
+        # Later sentences answer faster but must still play in text order
+        ordered = await consume_speech(service, "One. Two. Three.")
+        whole = await consume_speech(service, "One. Two.", response_format="wav")
+        with pytest.raises(HTTPException):
+            await service.synthesize_speech("Broken. Two.", "af_heart")
+        with pytest.raises(HTTPException):
+            await consume_speech(service, "One. Broken.")
+        return ordered, whole
+
+    ordered, whole = asyncio.run(scenario())
+    assert ordered == b"<One.><Two.><Three.>"
+    assert whole == b"<One. Two.>"
+
+
+def test_presynthesis_in_the_clients_format_serves_its_request(fake_tts, monkeypatch, tmp_path):
+    """Test that an opus client's speech request reuses the opus presynthesis"""
+    cache = TTSCache(tmp_path, max_bytes=10000)
+    monkeypatch.setattr(tts_service_module, "tts_cache", cache)
+    monkeypatch.setattr(synthesis_module, "tts_cache", cache)
+    monkeypatch.setattr(tts_service_module, "speech_synthesis", SpeechSynthesisRegistry())
+    service = TTSService()
+
+    async def play(response_format):
+        response = await service.get_speech("Hello there.", "af_heart", response_format=response_format)
+        if isinstance(response, StreamingResponse):
+            return await consume(response)
+        return open(response.path, "rb").read()
+
+    async def scenario():
+        service.presynthesize("Hello there.", "af_heart", response_format="opus")
+        opus = await play("opus")
+        calls_after_opus = len(fake_tts)
+        # Another format is other audio: it cannot reuse the opus synthesis
+        await play("mp3")
+        return opus, calls_after_opus
+
+    opus, calls_after_opus = asyncio.run(scenario())
+
+    assert opus == b"<Hello there.>"
+    assert calls_after_opus == 1
+    assert len(fake_tts) == 2
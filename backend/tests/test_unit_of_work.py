@@ -0,0 +1,66 @@
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import InsertOne, UpdateOne
+
+from app.utils import unit_of_work
+from app.utils.unit_of_work import UnitOfWork
+
+
+class RecordingCollection:
+    """Collection fake that records bulk writes"""
+
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    def bulk_write(self, requests, ordered=True, session=None):
+        self.calls.append((self.name, list(requests), ordered))
+
+
+class RecordingDatabase:
+    def __init__(self):
+        self.calls = []
+
+    def __getitem__(self, name):
+        return RecordingCollection(name, self.calls)
+
+
+def test_commit_sends_one_ordered_bulk_write_per_collection(monkeypatch):
+    """Test that queued writes are grouped by collection and keep their order"""
+    database = RecordingDatabase()
+    monkeypatch.setattr(unit_of_work, "db", database)
+
+    uow = UnitOfWork(transactional=False)
+    uow.insert("messages", {"_id": 1})
+    uow.update("conversations", {"_id": 10}, {"$inc": {"message_count": 2}})
+    uow.insert("messages", {"_id": 2})
+    uow.update("conversations", {"_id": 10}, {"$set": {"last_message_preview": "hi"}})
+    assert len(uow) == 4
+
+    uow.commit_blocking()
+
+    assert [(name, ordered) for name, _, ordered in database.calls] == [("messages", True), ("conversations", True)]
+    messages, conversations = database.calls[0][1], database.calls[1][1]
+    assert messages == [InsertOne({"_id": 1}), InsertOne({"_id": 2})]
+    assert conversations == [
+        UpdateOne({"_id": 10}, {"$inc": {"message_count": 2}}, upsert=False),
+        UpdateOne({"_id": 10}, {"$set": {"last_message_preview": "hi"}}, upsert=False)
+    ]
+
+
+def test_commit_empties_the_unit_of_work(monkeypatch):
+    """Test that committing twice does not repeat the writes"""
+    database = RecordingDatabase()
+    monkeypatch.setattr(unit_of_work, "db", database)
+
+    uow = UnitOfWork(transactional=False)
+    uow.insert("feedback", {"_id": 1})
+    uow.commit_blocking()
+    uow.commit_blocking()
+
+    assert len(database.calls) == 1
+    assert len(uow) == 0
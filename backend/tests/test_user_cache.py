@@ -0,0 +1,59 @@
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import user_cache as user_cache_module
+from app.utils.user_cache import UserCache
+
+
+def test_cached_user_is_a_copy():
+    """Test that handlers modifying current_user do not change the cache"""
+    cache = UserCache(ttl_seconds=60, max_entries=10)
+    cache.put("ada@example.com", {"_id": 1, "name": "Ada"})
+
+    user = cache.get("ada@example.com")
+    user["name"] = "Changed"
+
+    assert cache.get("ada@example.com")["name"] == "Ada"
+    assert cache.get("bob@example.com") is None
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    """Test that a user is loaded again once its entry expired"""
+    now = [1000.0]
+    monkeypatch.setattr(user_cache_module.time, "monotonic", lambda: now[0])
+    cache = UserCache(ttl_seconds=30, max_entries=10)
+    cache.put("ada@example.com", {"_id": 1})
+
+    now[0] += 29
+    assert cache.get("ada@example.com") is not None
+    now[0] += 1
+    assert cache.get("ada@example.com") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the cache stays within max_entries"""
+    cache = UserCache(ttl_seconds=60, max_entries=2)
+    cache.put("a@example.com", {"_id": 1})
+    cache.put("b@example.com", {"_id": 2})
+    cache.get("a@example.com")
+    cache.put("c@example.com", {"_id": 3})
+
+    assert cache.get("b@example.com") is None
+    assert cache.get("a@example.com") is not None
+    assert cache.get("c@example.com") is not None
+
+
+def test_invalidate_and_disabled_cache():
+    """Test explicit invalidation and that a zero TTL caches nothing"""
+    cache = UserCache(ttl_seconds=60, max_entries=10)
+    cache.put("ada@example.com", {"_id": 1})
+    cache.invalidate("ada@example.com")
+    assert cache.get("ada@example.com") is None
+
+    disabled = UserCache(ttl_seconds=0, max_entries=10)
+    disabled.put("ada@example.com", {"_id": 1})
+    assert len(disabled) == 0